@@ -1,12 +1,22 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
 import json
+import mimetypes
 import os
 from pathlib import Path
 from datetime import datetime
 from crew_app.expert_profiles import create_perfect_one_page_document, get_expert_profile, create_role_establishment
+from crew_app.llm_metrics import get_metrics_store
+from pipeline_status_store import get_status_store
+from http_caching import CachingCompressionMiddleware
+from job_executor import JobExecutor
+from project_catalog import get_project_catalog
+from saved_documents_index import SavedDocumentIndex
+from report_files import add_hashes, build_manifest, content_hash, iter_file, iter_zip, paginate, resolve_file, source_root
+from status_events import StatusEventHub
 
 app = FastAPI(title="Pipeline Status API")
 
@@ -19,8 +29,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Pipeline status storage
-PIPELINE_STATUS_FILE = Path("pipeline_status.json")
+# Strong ETags, 304 revalidation and gzip/brotli for JSON responses
+app.add_middleware(CachingCompressionMiddleware, minimum_size=1024)
+
+# Pipeline status storage (per-project rows, SQLite-WAL by default)
+status_store = get_status_store()
+
+# Push channel for status deltas (SSE + WebSocket), fed from the store's event log
+status_events = StatusEventHub(status_store)
+
+# projects.json parsed once and indexed by slug; re-read when the file changes
+project_catalog = get_project_catalog()
+
+# Files per page in pipeline-complete report manifests
+REPORT_PAGE_SIZE = 100
+
+# Saved 1-page documents: files in saved_documents/, metadata in saved_documents/index.db
+saved_documents = SavedDocumentIndex()
+SAVED_DOCUMENTS_PAGE_SIZE = 100
+
+# CrewAI runs execute out of the event loop in a bounded process pool (CREWAI_JOB_WORKERS)
+job_executor = JobExecutor()
+
+# Per-call LLM / search / crew stage latency, tokens and cost (llm_metrics.db)
+metrics_store = get_metrics_store()
+METRICS_PAGE_SIZE = 100
 
 class PipelineUpdate(BaseModel):
     projectId: str
@@ -31,32 +64,6 @@ class PipelineUpdate(BaseModel):
     status: str = "running"  # running, completed, failed, stopped
     error: Optional[str] = None
 
-def load_pipeline_status() -> Dict:
-    """Load pipeline status from file"""
-    if PIPELINE_STATUS_FILE.exists():
-        try:
-            with open(PIPELINE_STATUS_FILE, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"⚠️ Warning: Corrupted pipeline_status.json: {e}")
-            print("🔄 Resetting to empty status")
-            # Backup the corrupted file
-            try:
-                import shutil
-                from datetime import datetime
-                backup_name = f"pipeline_status_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                shutil.copy(PIPELINE_STATUS_FILE, backup_name)
-                print(f"📁 Corrupted file backed up as: {backup_name}")
-            except:
-                pass
-            return {}
-    return {}
-
-def save_pipeline_status(status: Dict):
-    """Save pipeline status to file"""
-    with open(PIPELINE_STATUS_FILE, 'w') as f:
-        json.dump(status, f, indent=2, default=str)
-
 async def get_detailed_research_data(project_id: str) -> Dict[str, Any]:
     """WORKAROUND: Get detailed research data directly from CrewAI agents"""
     try:
@@ -65,14 +72,8 @@ async def get_detailed_research_data(project_id: str) -> Dict[str, Any]:
         # Convert project ID to readable name
         project_name = project_id.replace("-", " ").title()
         
-        # Get project details from projects.json
-        projects_file = Path("../projects.json")
-        if projects_file.exists():
-            with open(projects_file, 'r', encoding='utf-8') as f:
-                projects = json.load(f)
-                project_data = next((p for p in projects if p.get("project_name", "").lower().replace(" ", "-") == project_id), None)
-        else:
-            project_data = None
+        # Get project details from the projects.json catalog (slug index, reloaded on change)
+        project_data = project_catalog.get(project_id) if project_catalog.exists() else None
         
         if not project_data:
             print(f"⚠️ Project data not found for: {project_id}")
@@ -82,7 +83,8 @@ async def get_detailed_research_data(project_id: str) -> Dict[str, Any]:
         detailed_research = {
             "project_id": project_id,
             "project_name": project_name,
-            "timestamp": datetime.now().isoformat(),
+            # Derived from projects.json, so it only changes when the catalog does (keeps the report ETag stable)
+            "timestamp": datetime.fromtimestamp(project_catalog.path.stat().st_mtime).isoformat(),
             "research_summary": f"""
 # {project_name}
 
@@ -145,27 +147,93 @@ Based on market analysis, this application competes in the {project_data.get('ap
 @app.get("/api/pipeline-status")
 async def get_pipeline_status():
     """Get current pipeline status for all projects"""
-    return load_pipeline_status()
+    return status_store.get_all()
 
 @app.post("/api/pipeline-update")
 async def update_pipeline_status(update: PipelineUpdate):
     """Update pipeline status for a specific project"""
-    status = load_pipeline_status()
-    
-    status[update.projectId] = {
-        "projectId": update.projectId,
-        "projectName": update.projectName,
-        "progress": update.progress,
-        "activeAgents": update.activeAgents,
-        "currentTask": update.currentTask,
-        "status": update.status,
-        "error": update.error,
-        "lastUpdated": datetime.now().isoformat()
-    }
-    
-    save_pipeline_status(status)
+    # Single-row merge: fields the runner set (result, interrupt_requested) survive progress updates
+    status_store.update(
+        update.projectId,
+        create_if_missing=True,
+        projectId=update.projectId,
+        projectName=update.projectName,
+        progress=update.progress,
+        activeAgents=update.activeAgents,
+        currentTask=update.currentTask,
+        status=update.status,
+        error=update.error
+    )
     return {"success": True, "message": "Pipeline status updated"}
 
+def _format_sse(event_type: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Serialize one Server-Sent Events frame"""
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return frame + f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _resume_event_id(request: Request, last_event_id: Optional[int]) -> Optional[int]:
+    """Resume point from the query string or the EventSource Last-Event-ID header"""
+    if last_event_id is not None:
+        return last_event_id
+    header = request.headers.get("last-event-id")
+    return int(header) if header and header.isdigit() else None
+
+def _snapshot_projects(projects: Dict[str, Any], project_id: Optional[str]) -> Dict[str, Any]:
+    return {pid: data for pid, data in projects.items() if pid == project_id} if project_id else projects
+
+@app.get("/api/pipeline-events")
+async def stream_pipeline_events(request: Request, project_id: Optional[str] = None, last_event_id: Optional[int] = None):
+    """Server-Sent Events stream of per-project status deltas.
+
+    New clients get a snapshot event first; reconnecting clients (Last-Event-ID)
+    get every delta they missed, or a fresh snapshot if those were already
+    trimmed. With the json status backend (no event log) a snapshot is sent
+    whenever the status changes.
+    """
+    resume_from = _resume_event_id(request, last_event_id)
+
+    async def event_generator():
+        async for event in status_events.stream(resume_from):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if event["type"] == "snapshot":
+                yield _format_sse("snapshot", _snapshot_projects(event["projects"], project_id), event["id"])
+                continue
+            if project_id and event["projectId"] != project_id:
+                continue
+            yield _format_sse(event["type"], {"projectId": event["projectId"], **event["delta"]}, event["id"])
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/ws/pipeline-events")
+async def websocket_pipeline_events(websocket: WebSocket, project_id: Optional[str] = None, last_event_id: Optional[int] = None):
+    """WebSocket variant of /api/pipeline-events (same event payloads as JSON messages)"""
+    await websocket.accept()
+    try:
+        async for event in status_events.stream(last_event_id):
+            if event is None:
+                await websocket.send_json({"type": "keep-alive"})
+                continue
+            if event["type"] == "snapshot":
+                await websocket.send_json({"id": event["id"], "type": "snapshot", "data": _snapshot_projects(event["projects"], project_id)})
+                continue
+            if project_id and event["projectId"] != project_id:
+                continue
+            await websocket.send_json({
+                "id": event["id"],
+                "type": event["type"],
+                "data": {"projectId": event["projectId"], **event["delta"]}
+            })
+    except WebSocketDisconnect:
+        pass
+
 @app.post("/api/run-pipeline")
 async def run_pipeline():
     """Start pipeline execution"""
@@ -183,91 +251,29 @@ async def run_pipeline():
 
 @app.post("/api/stop-pipeline")
 async def stop_pipeline():
-    """Stop pipeline execution and kill CrewAI processes"""
+    """Stop every CrewAI run: queued jobs are dropped, running ones cancel at their next step"""
     try:
-        import subprocess
-        import os
-        import signal
-        
-        print("🛑 Stopping CrewAI pipeline and killing processes...")
-        
-        # Kill Python processes that might be running CrewAI
-        try:
-            # On Windows, use taskkill to terminate Python processes
-            if os.name == 'nt':  # Windows
-                print("🛑 Scanning for Python processes to kill...")
-                
-                # First, try to kill any processes with "crew" in the command line
-                try:
-                    subprocess.run(['taskkill', '/F', '/IM', 'python.exe', '/FI', 'WINDOWTITLE eq *crew*'], 
-                                 capture_output=True, check=False)
-                    print("🛑 Killed processes with 'crew' in window title")
-                except:
-                    pass
-                
-                # Get list of all Python processes
-                result = subprocess.run(
-                    ['tasklist', '/FI', 'IMAGENAME eq python.exe', '/FO', 'CSV'],
-                    capture_output=True, text=True
-                )
-                
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                    current_pid = os.getpid()
-                    print(f"🛑 Current server PID: {current_pid}")
-                    
-                    for line in lines:
-                        if line.strip():
-                            parts = line.split(',')
-                            if len(parts) >= 2:
-                                pid = parts[1].strip('"')
-                                try:
-                                    pid_int = int(pid)
-                                    # Don't kill the main uvicorn server
-                                    if pid_int != current_pid:
-                                        print(f"🛑 Killing Python process PID: {pid}")
-                                        subprocess.run(['taskkill', '/F', '/PID', pid], 
-                                                     capture_output=True, check=False)
-                                except (ValueError, subprocess.CalledProcessError):
-                                    pass
-                
-                # Also try to kill any hanging uvicorn processes
-                try:
-                    subprocess.run(['taskkill', '/F', '/IM', 'uvicorn.exe'], 
-                                 capture_output=True, check=False)
-                    print("🛑 Killed any hanging uvicorn processes")
-                except:
-                    pass
-                    
-            else:  # Unix/Linux
-                # Kill Python processes except the main server
-                subprocess.run(['pkill', '-f', 'python.*crew'], check=False)
-                subprocess.run(['pkill', '-f', 'uvicorn'], check=False)
-                
-        except Exception as e:
-            print(f"⚠️ Warning: Could not kill all processes: {e}")
-        
-        # Clear all active agents status
-        status = load_pipeline_status()
-        for project_id in status:
-            if status[project_id]:
-                status[project_id]["activeAgents"] = []
-                status[project_id]["status"] = "stopped"
-                status[project_id]["progress"] = 0
-                status[project_id]["currentTask"] = "Stopped by user"
-                status[project_id]["lastUpdated"] = datetime.now().isoformat()
-        
-        save_pipeline_status(status)
-        
-        print("✅ Pipeline stopped and processes killed")
-        return {"success": True, "message": "Pipeline stopped and processes killed"}
+        print("🛑 Stopping CrewAI pipeline...")
+        
+        # Running workers poll interrupt_requested through their cancellation token
+        status_store.update_all(
+            activeAgents=[],
+            status="stopped",
+            progress=0,
+            currentTask="Stopped by user",
+            interrupt_requested=True
+        )
+        dropped = job_executor.cancel_project()
+        
+        print(f"✅ Pipeline stop requested ({dropped} queued job(s) dropped)")
+        return {"success": True, "message": "Pipeline stop requested", "droppedJobs": dropped}
     except Exception as e:
         print(f"❌ Error stopping pipeline: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/stop-project")
 async def stop_specific_project(request: Request):
-    """Stop a specific project's CrewAI execution"""
+    """Stop a specific project's CrewAI execution without touching other runs"""
     try:
         data = await request.json()
         project_id = data.get("projectId")
@@ -278,220 +284,104 @@ async def stop_specific_project(request: Request):
         
         print(f"🛑 Stopping specific project: {project_name} ({project_id})")
         
-        # Update the specific project status to stopped
-        status = load_pipeline_status()
-        if project_id in status:
-            status[project_id]["activeAgents"] = []
-            status[project_id]["status"] = "stopped"
-            status[project_id]["progress"] = 0
-            status[project_id]["currentTask"] = "Stopped by user"
-            status[project_id]["interrupt_requested"] = True  # Set interruption flag
-            status[project_id]["lastUpdated"] = datetime.now().isoformat()
-            save_pipeline_status(status)
-        
-        # Actually kill the CrewAI processes - Enhanced for mid-execution interruption
-        try:
-            import subprocess
-            import os
-            import signal
-            
-            print(f"🛑 Killing CrewAI processes for project: {project_name}")
-            
-            # On Windows, use taskkill to terminate Python processes
-            if os.name == 'nt':  # Windows
-                print("🛑 Scanning for Python processes to kill...")
-                
-                # First, try to kill any processes with "crew" in the command line
-                try:
-                    subprocess.run(['taskkill', '/F', '/IM', 'python.exe', '/FI', 'WINDOWTITLE eq *crew*'], 
-                                 capture_output=True, check=False)
-                    print("🛑 Killed processes with 'crew' in window title")
-                except:
-                    pass
-                
-                # Get list of all Python processes
-                result = subprocess.run(
-                    ['tasklist', '/FI', 'IMAGENAME eq python.exe', '/FO', 'CSV'],
-                    capture_output=True, text=True
-                )
-                
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                    current_pid = os.getpid()
-                    print(f"🛑 Current server PID: {current_pid}")
-                    
-                    for line in lines:
-                        if line.strip():
-                            parts = line.split(',')
-                            if len(parts) >= 2:
-                                pid = parts[1].strip('"')
-                                try:
-                                    pid_int = int(pid)
-                                    # Don't kill the main uvicorn server
-                                    if pid_int != current_pid:
-                                        print(f"🛑 Killing Python process PID: {pid}")
-                                        subprocess.run(['taskkill', '/F', '/PID', pid], 
-                                                     capture_output=True, check=False)
-                                except (ValueError, subprocess.CalledProcessError):
-                                    pass
-                
-                # Also try to kill any hanging uvicorn processes
-                try:
-                    subprocess.run(['taskkill', '/F', '/IM', 'uvicorn.exe'], 
-                                 capture_output=True, check=False)
-                    print("🛑 Killed any hanging uvicorn processes")
-                except:
-                    pass
-                    
-            else:  # Unix/Linux
-                # Kill Python processes except the main server
-                subprocess.run(['pkill', '-f', 'python.*crew'], check=False)
-                subprocess.run(['pkill', '-f', 'uvicorn'], check=False)
-                
-        except Exception as e:
-            print(f"⚠️ Warning: Could not kill all processes: {e}")
-        
-        print(f"✅ Project {project_name} stopped and processes killed")
-        return {"success": True, "message": f"Project {project_name} stopped and processes killed"}
+        # The worker's cancellation token sees this at its next task / LLM-call boundary
+        status_store.update(
+            project_id,
+            activeAgents=[],
+            status="stopped",
+            progress=0,
+            currentTask="Stopped by user",
+            interrupt_requested=True  # Set interruption flag
+        )
+        dropped = job_executor.cancel_project(project_id)
+        
+        print(f"✅ Project {project_name} stop requested")
+        return {"success": True, "message": f"Project {project_name} stop requested", "droppedJobs": dropped}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error stopping project: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/run-crewai-project")
 async def run_crewai_project(request: Request):
-    """Run real CrewAI pipeline for a single project"""
+    """Queue a real CrewAI pipeline run for a single project and return its job id"""
     try:
         data = await request.json()
         project_name = data.get("projectName")
-        project_id = data.get("projectId", project_name.lower().replace(" ", "-").replace("&", "and"))
         
         if not project_name:
             raise HTTPException(status_code=400, detail="Project name is required")
         
-        print(f"🚀 Starting real CrewAI pipeline for: {project_name}")
+        project_id = data.get("projectId", project_name.lower().replace(" ", "-").replace("&", "and"))
+        
+        print(f"🚀 Queuing real CrewAI pipeline for: {project_name}")
         
         # Initialize project status - clear any previous state
-        status = load_pipeline_status()
         print(f"🧹 Clearing previous state for project: {project_name}")
-        status[project_id] = {
+        status_store.upsert(project_id, {
             "projectId": project_id,
             "projectName": project_name,
             "progress": 0,
             "activeAgents": ["Initializing..."],
-            "currentTask": "Starting pipeline",
-            "status": "running",
-            "error": None,
-            "lastUpdated": datetime.now().isoformat()
-        }
-        save_pipeline_status(status)
+            "currentTask": "Queued",
+            "status": "queued",
+            "error": None
+        })
         
-        # Import and run the real CrewAI pipeline with retry enforcement
-        try:
-            from crew_app.crew import kickoff_with_retries
-            
-            # Use the retry system that enforces Delivery Coordinator compliance
-            print(f"🔄 Using retry-enforced CrewAI system for: {project_name}")
-            
-            # Update status to show agents are working
-            status[project_id]["activeAgents"] = ["Market Research Analyst"]
-            status[project_id]["progress"] = 20
-            status[project_id]["currentTask"] = "Market Research"
-            save_pipeline_status(status)
-            
-            print(f"🚀 Starting fresh CrewAI execution for: {project_name}")
-            
-            # Run CrewAI with proper interruption handling
-            print(f"🚀 Starting CrewAI execution (will run to completion)")
-            
-            # Set up interruption flag
-            status[project_id]["interrupt_requested"] = False
-            save_pipeline_status(status)
-            
-            # Run CrewAI with retry enforcement (this will retry until compliance)
-            print(f"🚀 Starting CrewAI with retry enforcement for: {project_name}")
-            result = kickoff_with_retries(max_retries=3, project_name=project_name)
-            print(f"✅ CrewAI retry-enforced execution completed for: {project_name}")
-            
-            # Check if interruption was requested during execution
-            if status.get(project_id, {}).get("interrupt_requested", False):
-                print(f"⚠️ Interruption was requested during execution for: {project_name}")
-                result = f"Execution completed but interruption was requested for {project_name}"
-            
-            # Update status to completed with result
-            status[project_id]["progress"] = 100
-            status[project_id]["activeAgents"] = []
-            status[project_id]["currentTask"] = "Completed"
-            status[project_id]["status"] = "completed"
-            
-            # Handle different result formats
-            if isinstance(result, dict) and 'raw' in result:
-                result_to_save = result['raw']
-            else:
-                result_to_save = str(result)
-            
-            print(f"🔍 CrewAI result type: {type(result)}")
-            print(f"🔍 CrewAI result preview: {result_to_save[:500] if result_to_save else 'None'}...")
-            print(f"🔍 CrewAI result length: {len(result_to_save) if result_to_save else 0}")
-            
-            # Save to both pipeline status (broken) and direct pipeline (working)
-            status[project_id]["result"] = result_to_save
-            
-            # Save to direct pipeline (our workaround)
-            try:
-                direct_results_dir = Path("direct_results")
-                direct_results_dir.mkdir(exist_ok=True)
-                
-                direct_result_file = direct_results_dir / f"{project_id}_result.json"
-                direct_data = {
-                    "project_id": project_id,
-                    "result": result_to_save,
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "completed"
-                }
-                with open(direct_result_file, 'w', encoding='utf-8') as f:
-                    json.dump(direct_data, f, indent=2)
-                
-                print(f"✅ Direct pipeline result saved to: {direct_result_file}")
-                
-            except Exception as direct_save_error:
-                print(f"❌ Error saving to direct pipeline: {direct_save_error}")
-            
-            # Try to save to pipeline status (broken mechanism)
-            try:
-                save_pipeline_status(status)
-                print(f"✅ Pipeline status saved (may be broken)")
-            except Exception as save_error:
-                print(f"❌ Pipeline status save failed: {save_error}")
-            
-        except ImportError as e:
-            print(f"Import error: {e}")
-            # Fallback to mock result for now
-            result = f"Mock result for {project_name} - CrewAI import failed"
-            status[project_id]["status"] = "failed"
-            status[project_id]["error"] = str(e)
-            save_pipeline_status(status)
-        except Exception as e:
-            print(f"CrewAI execution error: {e}")
-            result = f"Error result for {project_name} - {str(e)}"
-            status[project_id]["status"] = "failed"
-            status[project_id]["error"] = str(e)
-            save_pipeline_status(status)
-        
-        print(f"✅ CrewAI pipeline completed for: {project_name}")
+        # The run executes in the job pool; this handler returns immediately
+        job = job_executor.submit(project_id, project_name, max_retries=3)
+        print(f"✅ CrewAI job {job.job_id} queued for: {project_name}")
         
         return {
             "success": True,
             "project_name": project_name,
-            "result": result
+            "projectId": project_id,
+            "jobId": job.job_id,
+            "state": job.state
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ CrewAI pipeline failed: {e}")
+        print(f"❌ CrewAI pipeline failed to start: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/jobs")
+async def list_jobs(project_id: Optional[str] = None):
+    """List CrewAI jobs, newest first, optionally filtered by project"""
+    return {"jobs": [job.to_dict() for job in job_executor.list(project_id)]}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get state, result and error for a CrewAI job"""
+    job = job_executor.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+@app.get("/api/metrics")
+async def get_llm_metrics(project_id: Optional[str] = None, limit: int = METRICS_PAGE_SIZE):
+    """LLM/search call summary plus the most recent call records, optionally for one project"""
+    limit = max(1, min(limit, 1000))
+    return {
+        "summary": metrics_store.summary(project_id),
+        "calls": metrics_store.recent(project_id, limit=limit)
+    }
+
+@app.on_event("shutdown")
+async def shutdown_job_executor():
+    job_executor.shutdown()
+
 @app.get("/api/pipeline-complete/{project_id}")
-async def get_pipeline_complete_report(project_id: str):
-    """Get completion report for a project"""
+async def get_pipeline_complete_report(project_id: str, code_offset: int = 0, boilerplate_offset: int = 0, limit: int = REPORT_PAGE_SIZE):
+    """Get completion report for a project.
+
+    Generated code and boilerplate files are listed as two paged manifests,
+    each with its own cursor (code_offset / boilerplate_offset, fed from that
+    manifest's nextOffset) and content hashes for the returned page only;
+    contents are served by /api/pipeline-complete/{project_id}/files.
+    """
     print(f"🔍 Starting report generation for: {project_id}")
     try:
         # WORKAROUND: Get detailed research data directly from CrewAI agents
@@ -528,8 +418,7 @@ async def get_pipeline_complete_report(project_id: str):
                     print(f"Project deliverables not found: {deliverables_path} - will show available data")
                 
                 # Get the actual CrewAI result and status from the pipeline status
-                status = load_pipeline_status()
-                project_status = status.get(project_id, {})
+                project_status = status_store.get(project_id) or {}
                 crewai_result = project_status.get("result", "No result available")
                 actual_status = project_status.get("status", "unknown")
                 last_updated = project_status.get("lastUpdated", datetime.now().isoformat())
@@ -771,38 +660,22 @@ async def get_pipeline_complete_report(project_id: str):
         except Exception as e:
             print(f"Could not load validation report: {e}")
         
-        # Load generated code files
-        generated_code_path = deliverables_path / "generated_code"
+        # Index generated code files (manifest only; contents are fetched per file)
+        generated_code_path = source_root("generated", project_id)
         if generated_code_path.exists():
             try:
-                all_files = list(generated_code_path.rglob("*"))
-                backend_files = [f for f in all_files if f.is_file() and f.suffix in ['.py', '.pyc']]
-                frontend_files = [f for f in all_files if f.is_file() and f.suffix in ['.js', '.jsx', '.ts', '.tsx', '.css', '.html']]
-                config_files = [f for f in all_files if f.is_file() and f.name in ['requirements.txt', 'package.json', 'tailwind.config.js', 'next.config.js']]
-                
-                # Convert to file objects for frontend
-                def file_to_dict(file_path):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        return {
-                            "name": file_path.name,
-                            "path": str(file_path.relative_to(generated_code_path)),
-                            "content": content,
-                            "size": len(content),
-                            "type": file_path.suffix
-                        }
-                    except Exception:
-                        return {
-                            "name": file_path.name,
-                            "path": str(file_path.relative_to(generated_code_path)),
-                            "content": "# File content could not be loaded",
-                            "size": 0,
-                            "type": file_path.suffix
-                        }
-                
-                report["deliverables"]["generated_code"]["backend"] = [file_to_dict(f) for f in backend_files[:10]]
-                report["deliverables"]["generated_code"]["frontend"] = [file_to_dict(f) for f in frontend_files[:10]]
+                manifest = build_manifest(generated_code_path)
+                page = paginate(manifest, code_offset, limit)
+                files = add_hashes(generated_code_path, page.pop("files"))
+                for entry in files:
+                    entry["url"] = f"/api/pipeline-complete/{project_id}/files/generated/{entry['path']}"
+                report["deliverables"]["generated_code"] = {
+                    "backend": [f for f in files if f["type"] in ['.py', '.pyc']],
+                    "frontend": [f for f in files if f["type"] in ['.js', '.jsx', '.ts', '.tsx', '.css', '.html']],
+                    "config": [f for f in files if f["name"] in ['requirements.txt', 'package.json', 'tailwind.config.js', 'next.config.js']],
+                    "page": page,
+                    "archiveUrl": f"/api/pipeline-complete/{project_id}/archive"
+                }
             except Exception as e:
                 print(f"Could not load generated code: {e}")
         
@@ -896,35 +769,32 @@ async def get_pipeline_complete_report(project_id: str):
                     print(f"⚠️ No frontend boilerplate mapping for project: {project_id}")
                 
                 # Load backend boilerplate
-                backend_boilerplate_dir = boilerplate_path / "backend" / project_id
+                backend_boilerplate_dir = source_root("boilerplate", project_id)
                 if backend_boilerplate_dir.exists():
-                    backend_files = []
-                    for file_path in backend_boilerplate_dir.rglob("*"):
-                        if file_path.is_file() and file_path.suffix in ['.py', '.md', '.txt']:
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    content = f.read()
-                                backend_files.append({
-                                    "name": file_path.name,
-                                    "path": str(file_path.relative_to(backend_boilerplate_dir)),
-                                    "content": content,
-                                    "size": len(content),
-                                    "type": file_path.suffix
-                                })
-                            except Exception:
-                                pass
+                    manifest = build_manifest(backend_boilerplate_dir, suffixes=['.py', '.md', '.txt'])
+                    page = paginate(manifest, boilerplate_offset, limit)
+                    backend_files = add_hashes(backend_boilerplate_dir, page.pop("files"))
+                    for entry in backend_files:
+                        entry["url"] = f"/api/pipeline-complete/{project_id}/files/boilerplate/{entry['path']}"
                     
                     report["deliverables"]["backend_boilerplate"] = {
                         "name": f"{project_id.replace('-', ' ').title()} Backend",
                         "files": backend_files,
+                        "page": page,
                         "description": f"Custom FastAPI backend boilerplate optimized for {project_id.replace('-', ' ').title()}"
                     }
-                    print(f"✅ Loaded backend boilerplate with {len(backend_files)} files")
+                    print(f"✅ Indexed backend boilerplate: {page['total']} files")
                 else:
                     print(f"⚠️ Backend boilerplate directory not found: {backend_boilerplate_dir}")
         except Exception as e:
             print(f"❌ Could not load boilerplates: {e}")
         
+        # Where the time and money went: per-section / per-provider LLM call metrics
+        try:
+            report["llmMetrics"] = metrics_store.summary(project_id)
+        except Exception as e:
+            print(f"⚠️ Could not load LLM metrics: {e}")
+
         # Generate mock code files for projects without real deliverables
         if "generated_code" not in report["deliverables"]:
             mock_backend_files = [
@@ -953,6 +823,39 @@ async def get_pipeline_complete_report(project_id: str):
         print(f"Error in get_pipeline_complete_report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/pipeline-complete/{project_id}/files/{source}/{file_path:path}")
+async def get_report_file(project_id: str, source: str, file_path: str, request: Request):
+    """Stream one report file; honours If-None-Match with the manifest content hash"""
+    root = source_root(source, project_id)
+    if root is None:
+        raise HTTPException(status_code=404, detail=f"Unknown file source: {source}")
+    
+    resolved = resolve_file(root, file_path)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    etag = f'"{content_hash(resolved)}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    media_type = mimetypes.guess_type(resolved.name)[0] or "text/plain"
+    return StreamingResponse(iter_file(resolved), media_type=media_type, headers={
+        **headers,
+        "Content-Length": str(resolved.stat().st_size)
+    })
+
+@app.get("/api/pipeline-complete/{project_id}/archive")
+async def get_report_archive(project_id: str):
+    """Stream the generated code tree as a zip without buffering it"""
+    root = source_root("generated", project_id)
+    if not root.exists():
+        raise HTTPException(status_code=404, detail="No generated code for this project")
+    
+    return StreamingResponse(iter_zip(root, arc_prefix=f"{project_id}/"), media_type="application/zip", headers={
+        "Content-Disposition": f'attachment; filename="{project_id}.zip"'
+    })
+
 # Document saving functionality
 class DocumentSaveRequest(BaseModel):
     projectName: str
@@ -967,8 +870,7 @@ async def save_document(request: DocumentSaveRequest):
     """Save the generated 1-page document to a local folder"""
     try:
         # Create documents directory if it doesn't exist
-        documents_dir = Path("saved_documents")
-        documents_dir.mkdir(exist_ok=True)
+        documents_dir = saved_documents.documents_dir
         
         # Create a clean filename
         import re
@@ -990,6 +892,7 @@ async def save_document(request: DocumentSaveRequest):
         # Save to JSON file
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(document_data, f, indent=2, ensure_ascii=False)
+        saved_documents.record(filepath, document_data)
         
         print(f"✅ Document saved: {filepath}")
         
@@ -1014,34 +917,12 @@ async def save_document(request: DocumentSaveRequest):
         raise HTTPException(status_code=500, detail=f"Failed to save document: {str(e)}")
 
 @app.get("/api/saved-documents")
-async def get_saved_documents():
-    """Get list of all saved documents"""
+async def get_saved_documents(cursor: Optional[str] = None, limit: int = SAVED_DOCUMENTS_PAGE_SIZE):
+    """Get saved documents, newest first (pass nextCursor back as cursor for the next page)"""
     try:
-        documents_dir = Path("saved_documents")
-        if not documents_dir.exists():
-            return {"documents": []}
-        
-        documents = []
-        for filepath in documents_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    doc_data = json.load(f)
-                    documents.append({
-                        "filename": filepath.name,
-                        "projectName": doc_data.get("projectName", "Unknown"),
-                        "projectId": doc_data.get("projectId", "unknown"),
-                        "generatedAt": doc_data.get("generatedAt", ""),
-                        "savedAt": doc_data.get("savedAt", ""),
-                        "filepath": str(filepath)
-                    })
-            except Exception as e:
-                print(f"⚠️ Error reading document {filepath}: {e}")
-        
-        # Sort by saved date (newest first)
-        documents.sort(key=lambda x: x.get("savedAt", ""), reverse=True)
-        
-        return {"documents": documents}
-        
+        return saved_documents.list(cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ Error getting saved documents: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get saved documents: {str(e)}")
@@ -1050,19 +931,17 @@ async def get_saved_documents():
 async def get_saved_document(project_id: str):
     """Get a specific saved document by project ID"""
     try:
-        documents_dir = Path("saved_documents")
-        if not documents_dir.exists():
-            raise HTTPException(status_code=404, detail="No saved documents found")
-        
-        # Find the document file
-        for filepath in documents_dir.glob(f"{project_id}_*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️ Error reading document {filepath}: {e}")
+        filepath = saved_documents.find(project_id)
+        if filepath is None:
+            raise HTTPException(status_code=404, detail=f"Document not found for project: {project_id}")
         
-        raise HTTPException(status_code=404, detail=f"Document not found for project: {project_id}")
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Deleted behind the index's back
+            saved_documents.remove(filepath)
+            raise HTTPException(status_code=404, detail=f"Document not found for project: {project_id}")
         
     except HTTPException:
         raise
@@ -1070,6 +949,12 @@ async def get_saved_document(project_id: str):
         print(f"❌ Error getting saved document: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get saved document: {str(e)}")
 
+@app.post("/api/saved-documents/rebuild-index")
+async def rebuild_saved_documents_index():
+    """Rebuild the saved documents index from the files on disk"""
+    indexed = saved_documents.rebuild()
+    return {"success": True, "indexed": indexed}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
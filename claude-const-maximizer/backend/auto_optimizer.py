@@ -11,6 +11,40 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+from keyword_matcher import KeywordMatcher
+
+# Expert profile keywords for role establishment; the first profile with a hit wins
+ROLE_PROFILE_MATCHER = KeywordMatcher({
+    'voice': ['voice', 'assistant'],
+    'crewai': ['crew', 'agent', 'market research'],
+    'rag': ['rag', 'document', 'knowledge'],
+    'content': ['content', 'creative', 'video', 'image'],
+    'healthcare': ['health', 'medical'],
+    'ecommerce': ['ecommerce', 'business', 'commerce'],
+    'developer': ['developer', 'code', 'analysis'],
+    'api': ['api', 'integration', 'web'],
+})
+
+# Case-sensitive markers used when cleaning CrewAI output
+CREWAI_SECTION_MATCHER = KeywordMatcher({
+    'redundant_header': [
+        'PROJECT:', 'TYPE:', 'OBJECTIVE', 'TARGET USERS',
+        'SUCCESS METRICS', 'DEPLOYMENT & LAUNCH', 'IMPLEMENTATION STRATEGY',
+        'CLAUDE OPTIMIZATION', 'TECHNICAL SPECIFICATIONS', 'CREWAI AGENT OUTPUTS',
+        'THE 4-DOCUMENT WEAPON STRATEGY', 'DETAILED MARKET RESEARCH',
+        'Technical Requirements', 'Success Metrics', 'Deployment Strategy',
+        'Frontend:', 'Backend:', 'Database:', 'AI Integration:', 'Deployment:'
+    ],
+    'meaningful_header': [
+        'Market Research', 'Core Features', 'Market Opportunity', 'Competitive Landscape', 'Target Audience'
+    ],
+    'boilerplate': [
+        'Software developers and tech professionals',
+        'User adoption and engagement',
+        'Performance and reliability metrics'
+    ],
+}, case_sensitive=True)
+
 class DocumentOptimizer:
     def __init__(self):
         self.pipeline_dir = Path("pipeline_status.json")
@@ -45,10 +79,10 @@ class DocumentOptimizer:
     
     def generate_role_establishment(self, project_name):
         """Generate project-specific role establishment"""
-        project_name_lower = project_name.lower()
+        profile = ROLE_PROFILE_MATCHER.first(project_name)
         
         # Expert profiles based on project type
-        if any(word in project_name_lower for word in ['voice', 'assistant']):
+        if profile == 'voice':
             expert_title = 'Voice AI & Personal Assistant Developer'
             expertise = 'voice processing, speech recognition, natural language understanding, and intelligent automation'
             domain = 'voice AI and personal assistant technology'
@@ -56,7 +90,7 @@ class DocumentOptimizer:
             companies = 'Google, Amazon, Microsoft, Apple, and leading voice technology companies'
             psychological_approach = 'This is a revolutionary project that will define the future of human-computer interaction. Voice AI is the next frontier of computing, and you\'re building the foundation that millions will use. This technology will be studied by future generations as the breakthrough that made AI truly accessible. The prestige of working with cutting-edge voice technology that will transform how humans interact with machines cannot be overstated. You\'re not just building an application - you\'re creating the future.'
         
-        elif any(word in project_name_lower for word in ['crew', 'agent', 'market research']):
+        elif profile == 'crewai':
             expert_title = 'Multi-Agent AI Systems Architect'
             expertise = 'multi-agent orchestration, AI system design, and intelligent workflow automation'
             domain = 'multi-agent AI systems and intelligent automation'
@@ -64,7 +98,7 @@ class DocumentOptimizer:
             companies = 'OpenAI, Anthropic, Google AI, Microsoft Research, and leading AI research institutions'
             psychological_approach = 'This is the pinnacle of AI engineering - orchestrating multiple intelligent agents to work in perfect harmony. Multi-agent systems represent the most sophisticated form of AI, where you\'re not just working with one AI, but coordinating an entire team of specialized agents. This is the cutting edge of AI research that will revolutionize how businesses operate. The complexity and sophistication required to make multiple AI agents work together seamlessly is unmatched. Only the most elite developers can handle this level of orchestration. You\'re building the future of AI collaboration.'
         
-        elif any(word in project_name_lower for word in ['rag', 'document', 'knowledge']):
+        elif profile == 'rag':
             expert_title = 'RAG & Document Intelligence Specialist'
             expertise = 'retrieval-augmented generation, document processing, and knowledge management systems'
             domain = 'document intelligence and knowledge management'
@@ -72,7 +106,7 @@ class DocumentOptimizer:
             companies = 'OpenAI, Anthropic, Google, Microsoft, and leading document AI companies'
             psychological_approach = 'This is the future of knowledge management in the information age. Organizations are drowning in data but starving for insights. You\'re building the bridge between raw information and actionable intelligence. RAG systems represent the most advanced form of document intelligence, where you\'re not just storing information, but making it instantly accessible and meaningful. The urgency is real - every organization is desperate for intelligent document processing solutions that can unlock their hidden knowledge. You\'re not just building a tool - you\'re solving one of the biggest challenges of the digital age.'
         
-        elif any(word in project_name_lower for word in ['content', 'creative', 'video', 'image']):
+        elif profile == 'content':
             expert_title = 'Creative AI & Content Generation Expert'
             expertise = 'AI-powered content creation, multimedia processing, and creative automation'
             domain = 'creative AI and content generation'
@@ -80,7 +114,7 @@ class DocumentOptimizer:
             companies = 'Adobe, Canva, OpenAI, Google, and leading creative technology companies'
             psychological_approach = 'This is where technology meets human creativity in its purest form. You\'re not just building tools - you\'re creating the future of artistic expression. Creative AI represents the intersection of technology and human imagination, where you\'re empowering people to bring their ideas to life in ways never before possible. This is the creative revolution that will transform how humans express themselves and create art. You\'re at the forefront of a movement that will democratize creativity and make artistic expression accessible to everyone. This isn\'t just code - it\'s the future of human creativity.'
         
-        elif any(word in project_name_lower for word in ['health', 'medical']):
+        elif profile == 'healthcare':
             expert_title = 'Healthcare AI & Medical Technology Specialist'
             expertise = 'medical AI, healthcare automation, and clinical decision support systems'
             domain = 'healthcare AI and medical technology'
@@ -88,7 +122,7 @@ class DocumentOptimizer:
             companies = 'Epic Systems, Cerner, IBM Watson Health, and leading healthcare technology companies'
             psychological_approach = 'This is the highest calling in technology - where your code literally saves lives. Healthcare AI represents the most meaningful application of artificial intelligence, where every line of code you write has the potential to improve human health and wellbeing. You\'re not just building software - you\'re creating systems that doctors will rely on to make life-or-death decisions. The ethical responsibility is immense, but so is the impact. This is where technology serves humanity in its most profound way. You\'re building the future of healthcare, and every improvement you make could save countless lives.'
         
-        elif any(word in project_name_lower for word in ['ecommerce', 'business', 'commerce']):
+        elif profile == 'ecommerce':
             expert_title = 'E-commerce & Business AI Developer'
             expertise = 'e-commerce platforms, business automation, and AI-powered commerce solutions'
             domain = 'e-commerce and business AI'
@@ -96,7 +130,7 @@ class DocumentOptimizer:
             companies = 'Amazon, Shopify, Stripe, and leading e-commerce technology companies'
             psychological_approach = 'This is where AI meets the real world of business and commerce. You\'re building systems that will drive billions in revenue and transform entire industries. Every business on the planet is racing to adopt AI solutions, and those who master this technology first will dominate their markets. You\'re not just writing code - you\'re creating the competitive advantage that will determine which companies thrive and which ones fail. The financial impact is massive, and the market opportunity is unprecedented. This is the future of commerce, and you\'re building it.'
         
-        elif any(word in project_name_lower for word in ['developer', 'code', 'analysis']):
+        elif profile == 'developer':
             expert_title = 'Developer Tools & Code Analysis Expert'
             expertise = 'developer tools, code analysis, and software development automation'
             domain = 'developer tools and software development'
@@ -104,7 +138,7 @@ class DocumentOptimizer:
             companies = 'GitHub, Microsoft, JetBrains, and leading developer tool companies'
             psychological_approach = 'This is the meta-level of software development - you\'re building the tools that other developers will use to build everything else. Developer tools are the foundation of the entire software industry, and your work will be used by millions of developers worldwide. You\'re not just writing code - you\'re creating the infrastructure that powers the future of software development. Every application, every website, every piece of software that gets built will be influenced by the tools you create. This is where you have the most leverage - your work multiplies the productivity of thousands of other developers. You\'re building the future of how software gets made.'
         
-        elif any(word in project_name_lower for word in ['api', 'integration', 'web']):
+        elif profile == 'api':
             expert_title = 'Web API & Integration Specialist'
             expertise = 'API development, system integration, and web service architecture'
             domain = 'web APIs and system integration'
@@ -144,22 +178,15 @@ class DocumentOptimizer:
         for line in lines:
             line = line.strip()
             
+            markers = CREWAI_SECTION_MATCHER.scan(line)
+            
             # Skip redundant sections
-            if any(keyword in line for keyword in [
-                'PROJECT:', 'TYPE:', 'OBJECTIVE', 'TARGET USERS',
-                'SUCCESS METRICS', 'DEPLOYMENT & LAUNCH', 'IMPLEMENTATION STRATEGY',
-                'CLAUDE OPTIMIZATION', 'TECHNICAL SPECIFICATIONS', 'CREWAI AGENT OUTPUTS',
-                'THE 4-DOCUMENT WEAPON STRATEGY', 'DETAILED MARKET RESEARCH',
-                'Technical Requirements', 'Success Metrics', 'Deployment Strategy',
-                'Frontend:', 'Backend:', 'Database:', 'AI Integration:', 'Deployment:'
-            ]):
+            if 'redundant_header' in markers:
                 skip_section = True
                 continue
             
             # Stop skipping when we hit a meaningful section
-            if line.startswith('#') or any(keyword in line for keyword in [
-                'Market Research', 'Core Features', 'Market Opportunity', 'Competitive Landscape', 'Target Audience'
-            ]):
+            if line.startswith('#') or 'meaningful_header' in markers:
                 skip_section = False
             
             if not skip_section and line:
@@ -194,11 +221,7 @@ class DocumentOptimizer:
                 continue
             
             # Skip redundant sections
-            if any(keyword in trimmed for keyword in [
-                'Software developers and tech professionals',
-                'User adoption and engagement',
-                'Performance and reliability metrics'
-            ]):
+            if CREWAI_SECTION_MATCHER.matches(trimmed, 'boilerplate'):
                 continue
             
             # Clean up section headers
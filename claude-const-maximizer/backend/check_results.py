@@ -1,8 +1,7 @@
-import json
+from pipeline_status_store import get_status_store
 
 # Load the pipeline status
-with open('pipeline_status.json', 'r') as f:
-    data = json.load(f)
+data = get_status_store().get_all()
 
 print("=== PROJECTS WITH RESULTS ===")
 projects_with_results = 0
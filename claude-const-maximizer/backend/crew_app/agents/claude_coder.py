@@ -4,9 +4,8 @@ Responsible for Step 4 of Phase 3: Code generation using 5-prompt development pl
 """
 
 import asyncio
-from typing import Dict, Any, List
-from langchain_community.chat_models import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Awaitable, Callable, Tuple
 from langchain.schema import HumanMessage, SystemMessage
 import os
 from dotenv import load_dotenv
@@ -15,115 +14,74 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from templates.design_archetypes import generate_design_instructions
 from templates.backend_archetypes import generate_backend_instructions
+from crew_app.cancellation import CancellationToken, ensure_token
+from crew_app.providers import ProviderRegistry, get_provider_registry
+from crew_app.llm_cache import get_llm_cache
+from crew_app.llm_metrics import get_metrics_store, metrics_scope
+from crew_app.provider_health import get_provider_health, provider_name
+from crew_app.code_stream import CodeFenceParser, parse_files
+from crew_app.section_store import SectionStore, files_digest, section_input_hash, stable_brief
+from crew_app.api_contract import DEFAULT_CONTRACT_TOKENS, extract_api_contract, format_api_contract
 
 load_dotenv()
 
+@dataclass(frozen=True)
+class CodeSection:
+    """One prompt of the development plan; ``inputs`` are the sections whose files it reads"""
+    key: str
+    title: str
+    prompt: str
+    inputs: Tuple[str, ...] = ()
+
+
+# The 5-prompt development plan as a dependency graph, listed in a valid run order.
+# Each input reaches the prompt builder as a ``<key>_code`` keyword argument.
+CODE_SECTIONS = [
+    CodeSection("backend", "Backend Architecture", "_prompt1_backend_architecture"),
+    CodeSection("frontend", "Frontend Implementation", "_prompt2_frontend_implementation", inputs=("backend",)),
+    CodeSection("integration", "Integration & API", "_prompt3_integration_connections", inputs=("backend",)),
+    CodeSection("deployment", "Deployment & DevOps", "_prompt4_deployment_configuration"),
+    CodeSection("final", "Final Polish & Testing", "_prompt5_final_polish"),
+]
+DEBUG_SECTIONS = ("backend", "frontend")
+
+# on_file(section, path, content), called as each generated file completes
+FileCallback = Callable[[str, str, str], None]
+
+# Sections generated at the same time (CODEGEN_CONCURRENCY overrides)
+DEFAULT_CONCURRENCY = 3
+
+# Hedging (CODEGEN_HEDGE=on): start a backup LLM once an attempt is slower than the
+# section's running p90, or HEDGE_AFTER_SECONDS until enough calls have been recorded
+HEDGE_QUANTILE = 0.9
+HEDGE_MIN_SECONDS = 5.0
+DEFAULT_HEDGE_AFTER_SECONDS = 60.0
+
+
 class ClaudeCoder:
     """Claude Coder agent for generating complete application code"""
     
     # DEBUG MODE: Set to True for faster testing with minimal iterations
     DEBUG_MODE = True  # Set to False for full code generation
     
-    def __init__(self):
-        # Check for required API keys - try multiple options
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        google_api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY")
-        deep_ai_api_key = os.getenv("DEEP_AI_API_KEY")
-        mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        
-        # Initialize LLMs with proper error handling
-        self.primary_llm = None
-        self.backup_llms = []
-        
-        # Primary LLM (DeepSeek - more cost-effective for debugging)
-        if openai_api_key:
-            try:
-                self.primary_llm = ChatOpenAI(
-                    model="deepseek-chat",
-                    temperature=0.2,
-                    openai_api_key=openai_api_key,
-                    base_url="https://api.deepseek.com/v1"
-                )
-                print("  [OK] DeepSeek primary LLM configured for Claude Coder")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure DeepSeek: {e}")
-        else:
-            print("  [WARN] OPENAI_API_KEY not found - DeepSeek not available")
-        
-        # Add Gemini if API key is available
-        if google_api_key:
-            try:
-                gemini_llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-pro",  # Updated model name
-                    temperature=0.1,
-                    google_api_key=google_api_key
-                )
-                self.backup_llms.append(gemini_llm)
-                print("  [OK] Gemini Pro backup LLM configured")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Gemini Pro: {e}")
-        else:
-            print("  [WARN] GOOGLE_API_KEY/GEMINI_API_KEY not found - Gemini Pro not available")
-        
-        # Add Hugging Face if API key is available
-        if huggingface_api_key:
-            try:
-                from langchain_huggingface import ChatHuggingFace
-                huggingface_llm = ChatHuggingFace(
-                    model="mistralai/Mistral-7B-Instruct-v0.2",
-                    temperature=0.1,
-                    huggingfacehub_api_token=huggingface_api_key,
-                    task="text-generation"  # Added required field
-                )
-                self.backup_llms.append(huggingface_llm)
-                print("  [OK] Hugging Face LLM configured for Claude Coder")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Hugging Face: {e}")
-        else:
-            print("  [WARN] HUGGINGFACE_API_KEY not found - Hugging Face not available")
-        
-        # Add Mistral if API key is available
-        if mistral_api_key:
-            try:
-                from langchain_community.chat_models import ChatOpenAI
-                mistral_llm = ChatOpenAI(
-                    model="mistral-large-latest",
-                    temperature=0.1,
-                    openai_api_key=mistral_api_key,
-                    base_url="https://api.mistral.ai/v1"
-                )
-                self.backup_llms.append(mistral_llm)
-                print("  [OK] Mistral LLM configured for Claude Coder")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Mistral: {e}")
-        else:
-            print("  [WARN] MISTRAL_API_KEY not found - Mistral not available")
-        
-        # Add GPT-3.5 as backup if OpenAI key is available
-        if openai_api_key:
-            try:
-                gpt_llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,
-                    openai_api_key=openai_api_key
-                )
-                self.backup_llms.append(gpt_llm)
-                print("  [OK] GPT-3.5 Turbo backup LLM configured")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure GPT-3.5 Turbo: {e}")
-        
-        # Check if we have any working LLMs
-        if not self.primary_llm and not self.backup_llms:
-            print("  [ERROR] No LLMs available! Please set one of: OPENAI_API_KEY, GEMINI_API_KEY, HUGGINGFACE_API_KEY, MISTRAL_API_KEY")
-            raise ValueError("No LLMs available for Claude Coder")
-        
-        # Set primary LLM to first available backup if primary failed
-        if not self.primary_llm and self.backup_llms:
-            self.primary_llm = self.backup_llms[0]
-            self.backup_llms = self.backup_llms[1:]
-            print("  [OK] Using backup LLM as primary")
-        
+    def __init__(
+        self,
+        registry: Optional[ProviderRegistry] = None,
+        max_concurrency: Optional[int] = None,
+        hedge: Optional[bool] = None,
+        stream: Optional[bool] = None
+    ):
+        # Borrow shared clients from the process-wide registry instead of building our own
+        self.providers = registry or get_provider_registry()
+        self.primary_llm, self.backup_llms = self.providers.agent_llms("Claude Coder", 0.2, backup_temperature=0.1)
+        self.llm_cache = get_llm_cache()
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv("CODEGEN_CONCURRENCY", DEFAULT_CONCURRENCY)))
+        self.hedge = hedge if hedge is not None else os.getenv("CODEGEN_HEDGE", "off").lower() == "on"
+        self.hedge_after = float(os.getenv("CODEGEN_HEDGE_AFTER_SECONDS", DEFAULT_HEDGE_AFTER_SECONDS))
+        self.metrics = get_metrics_store()
+        self.health = get_provider_health()
+        self.stream = stream if stream is not None else os.getenv("CODEGEN_STREAM", "on").lower() != "off"
+        self.api_contract_tokens = int(os.getenv("CODEGEN_API_CONTRACT_TOKENS", DEFAULT_CONTRACT_TOKENS))
         print(f"  [OK] Claude Coder: {len(self.backup_llms) + 1} LLM(s) configured")
         
         self.current_llm_index = 0
@@ -133,119 +91,191 @@ class ClaudeCoder:
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
-        market_research: Dict[str, Any]
+        market_research: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None,
+        on_file: Optional[FileCallback] = None,
+        section_store: Optional[SectionStore] = None
     ) -> Dict[str, str]:
-        """Generate complete application code using 5-prompt development plan"""
+        """Generate complete application code using 5-prompt development plan.
+
+        Sections run as soon as their inputs are ready, at most
+        ``max_concurrency`` at a time: frontend and integration wait for the
+        backend (they are given its API contract), deployment and polish run
+        alongside that chain.
+
+        ``on_file(section, path, content)`` is called for every file as soon
+        as it is complete. Files from an attempt that later fails or loses a
+        hedge are reported too; the returned dict is the final set.
+
+        With a ``section_store``, a section whose input hash (brief, the
+        template and research fields in its prompt, upstream files) matches
+        the last run reuses its recorded files instead of calling an LLM.
+        """
         
         print(f"[LAUNCH] Starting code generation for {project_name}")
+        cancel_token = ensure_token(cancel_token)
         
         # In debug mode, use fewer prompts for faster testing
         if self.DEBUG_MODE:
             print("  [CONFIG] DEBUG_MODE: Using minimal prompts for faster testing")
-            prompts_to_run = [
-                ("Backend Architecture", self._prompt1_backend_architecture),
-                ("Frontend Implementation", self._prompt2_frontend_implementation)
-            ]
+            sections = [section for section in CODE_SECTIONS if section.key in DEBUG_SECTIONS]
         else:
-            print("  [PROCESS] Using full 5-prompt development plan")
-            prompts_to_run = [
-                ("Backend Architecture", self._prompt1_backend_architecture),
-                ("Frontend Implementation", self._prompt2_frontend_implementation),
-                ("Integration & API", self._prompt3_integration_connections),
-                ("Deployment & DevOps", self._prompt4_deployment_configuration),
-                ("Final Polish & Testing", self._prompt5_final_polish)
-            ]
-        
-        all_code = {}
+            print(f"  [PROCESS] Using full 5-prompt development plan ({self.max_concurrency} sections at a time)")
+            sections = CODE_SECTIONS
         
-        for section_name, prompt_func in prompts_to_run:
-            print(f"\n[WRITE] Generating {section_name}...")
+        async def generate(section: CodeSection, inputs: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+            build_prompt = getattr(self, section.prompt)
+            upstream_code = {f"{key}_code": files for key, files in inputs.items()}
             
-            # Handle different parameter requirements
-            if section_name == "Backend Architecture":
-                result = await self._generate_with_fallback(
-                    section_name, 
-                    lambda: prompt_func(project_name, project_brief, prompt_template, market_research)
+            if section_store is not None:
+                # Hash the prompt as rendered from a timestamp-free brief, so re-rendering the brief alone changes nothing
+                upstream = {key: files_digest(files) for key, files in inputs.items()}
+                input_hash = section_input_hash(
+                    section.key,
+                    build_prompt(project_name, stable_brief(project_brief), prompt_template, market_research, **upstream_code),
+                    upstream
                 )
-            elif section_name == "Frontend Implementation":
-                # Pass backend_code from previous step
-                backend_code = all_code.get("backend", {})
-                result = await self._generate_with_fallback(
-                    section_name, 
-                    lambda: prompt_func(project_name, project_brief, prompt_template, market_research, backend_code)
-                )
-            else:
-                result = await self._generate_with_fallback(
-                    section_name, 
-                    lambda: prompt_func(project_name, project_brief, prompt_template, market_research)
-                )
-            
-            all_code.update(result)
+                reused = section_store.reuse(section.key, input_hash, upstream)
+                if reused is not None:
+                    print(f"\n[SKIP] {section.title} unchanged, reusing {len(reused)} file(s)")
+                    return reused
             
-            # In debug mode, add a small delay between prompts
-            if self.DEBUG_MODE:
-                await asyncio.sleep(1)
+            print(f"\n[WRITE] Generating {section.title}...")
+            prompt = build_prompt(project_name, project_brief, prompt_template, market_research, **upstream_code)
+            files = await self._generate_with_fallback(
+                section.title,
+                lambda llm: self._generate_section_files(prompt, section.key, llm, on_file),
+                cancel_token
+            )
+            if section_store is not None and self._has_real_files(files):
+                section_store.save(section.key, input_hash, upstream, files)
+            return files
+        
+        results = await self._run_sections(sections, generate, cancel_token)
+        
+        # Merge in plan order so overlapping filenames resolve the same way every run
+        all_code = {}
+        for section in sections:
+            all_code.update(results[section.key])
         
         print(f"\n[OK] Code generation completed for {project_name}")
         return all_code
     
-    async def _generate_with_fallback(self, section_name: str, prompt_func) -> Dict[str, str]:
-        """Generate code with LLM fallback system"""
+    async def _run_sections(
+        self,
+        sections: List[CodeSection],
+        generate: Callable[[CodeSection, Dict[str, Dict[str, str]]], Awaitable[Dict[str, str]]],
+        cancel_token: CancellationToken
+    ) -> Dict[str, Dict[str, str]]:
+        """Run each section once all of its inputs are done, bounded by max_concurrency"""
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Future] = {}
+        
+        async def run(section: CodeSection) -> Dict[str, str]:
+            inputs = {key: await tasks[key] for key in section.inputs}
+            async with semaphore:
+                cancel_token.raise_if_cancelled(section.title)
+                return await generate(section, inputs)
+        
+        for section in sections:
+            missing = [key for key in section.inputs if key not in tasks]
+            if missing:
+                raise ValueError(f"Section '{section.key}' depends on {missing}, which must be listed before it")
+            tasks[section.key] = asyncio.ensure_future(run(section))
         
         try:
-            print(f"  [PROCESS] Generating with primary LLM for {section_name}...")
-            result = await prompt_func()
-            
-            # Check if we got actual files (not just fallback)
-            if self._has_real_files(result):
-                print(f"  [OK] Primary LLM succeeded for {section_name}")
-                return result
-            else:
-                print(f"  [WARN] Primary LLM created fallback for {section_name}, trying backup...")
-                
-        except Exception as e:
-            print(f"  [ERROR] Primary LLM failed for {section_name}: {e}")
+            await asyncio.gather(*tasks.values())
+        finally:
+            # One failed or cancelled section stops the rest
+            for task in tasks.values():
+                task.cancel()
+        return {key: task.result() for key, task in tasks.items()}
+    
+    async def _generate_with_fallback(
+        self,
+        section_name: str,
+        generate: Callable[[Any], Awaitable[Dict[str, str]]],
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Dict[str, str]:
+        """Generate code with LLM fallback system (``generate(llm)`` runs the section on one LLM).
+
+        Without hedging each backup starts only after the previous LLM failed
+        or produced no files. With hedging, a backup is also started once the
+        current attempt runs past the section's deadline; the first result with
+        real files wins and the other attempts are cancelled.
+        """
+        
+        cancel_token = ensure_token(cancel_token)
+        # Every LLM call below (primary and backups) is recorded against this section
+        with metrics_scope(agent="Claude Coder", section=section_name):
+            return await self._generate_section(section_name, generate, cancel_token)
+
+    def _hedge_deadline(self, section_name: str) -> Optional[float]:
+        """Seconds to wait for an attempt before hedging: the section's running p90, else HEDGE_AFTER_SECONDS"""
+        if not self.hedge:
+            return None
+        p90 = self.metrics.latency_quantile(section_name, HEDGE_QUANTILE)
+        return max(HEDGE_MIN_SECONDS, p90 / 1000) if p90 is not None else self.hedge_after
+    
+    async def _generate_section(
+        self,
+        section_name: str,
+        generate: Callable[[Any], Awaitable[Dict[str, str]]],
+        cancel_token: CancellationToken
+    ) -> Dict[str, str]:
+        # Healthiest provider first, open circuits skipped; in debug mode only one backup
+        chain = self.health.order([self.primary_llm] + self.backup_llms)
+        candidates = [
+            (f"{'primary' if i == 0 else f'backup {i}'} LLM ({provider_name(llm)})", llm)
+            for i, llm in enumerate(chain[:2] if self.DEBUG_MODE else chain)
+        ]
+        deadline = self._hedge_deadline(section_name)
+        running: Dict[asyncio.Future, str] = {}
+        result = None
         
-        # Try backup LLMs
-        backup_names = []
-        if len(self.backup_llms) >= 2:
-            backup_names = ["Gemini Pro", "GPT-3.5 Turbo"]
-        elif len(self.backup_llms) == 1:
-            backup_names = ["GPT-3.5 Turbo"]
+        def start_next():
+            label, llm = candidates.pop(0)
+            print(f"  [PROCESS] Generating with {label} for {section_name}...")
+            # The LLM is passed per call: sections (and hedges) overlap, so self.primary_llm is never swapped
+            running[asyncio.ensure_future(cancel_token.guard(generate(llm), f"{section_name}: {label}"))] = label
         
-        for i, backup_llm in enumerate(self.backup_llms):
-            try:
-                print(f"  [PROCESS] Trying backup LLM {i+1} ({backup_names[i]}) for {section_name}...")
-                
-                # Temporarily switch to backup LLM
-                original_llm = self.primary_llm
-                self.primary_llm = backup_llm
-                
-                result = await prompt_func()
-                
-                # Restore primary LLM
-                self.primary_llm = original_llm
-                
-                if self._has_real_files(result):
-                    print(f"  [OK] Backup LLM {i+1} ({backup_names[i]}) succeeded for {section_name}")
-                    return result
-                else:
-                    print(f"  [WARN] Backup LLM {i+1} ({backup_names[i]}) also created fallback for {section_name}")
-                    
-            except Exception as e:
-                print(f"  [ERROR] Backup LLM {i+1} ({backup_names[i]}) failed for {section_name}: {e}")
-                # Restore primary LLM if we switched it
-                if hasattr(self, 'original_llm'):
-                    self.primary_llm = self.original_llm
-            
-            # In debug mode, limit to first backup LLM only
-            if self.DEBUG_MODE:
-                print("  [CONFIG] DEBUG_MODE: Limiting to first backup LLM only")
-                break
+        start_next()
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    set(running),
+                    timeout=deadline if candidates else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    print(f"  [HEDGE] {section_name} exceeded {deadline:.1f}s, starting next LLM in parallel")
+                    start_next()
+                    continue
+                for task in done:
+                    label = running.pop(task)
+                    error = task.exception()
+                    if error is not None and not isinstance(error, Exception):
+                        raise error  # cancellation
+                    if error is not None:
+                        print(f"  [ERROR] {label} failed for {section_name}: {error}")
+                    elif self._has_real_files(task.result()):
+                        print(f"  [OK] {label} succeeded for {section_name}")
+                        return task.result()
+                    else:
+                        result = task.result()
+                        print(f"  [WARN] {label} created fallback for {section_name}")
+                # This attempt is over; fall back to the next LLM unless one is still in flight
+                if candidates and not running:
+                    start_next()
+        finally:
+            # Cancel the hedges that lost
+            for task in running:
+                task.cancel()
         
         # If all LLMs failed, return the last result (even if it's a fallback)
         print(f"  [EMOJI] All LLMs failed for {section_name}, using last result")
-        if 'result' in locals():
+        if result is not None:
             return result
         else:
             # Create a minimal fallback if no result was generated
@@ -263,13 +293,13 @@ class ClaudeCoder:
         
         return False
     
-    async def _prompt1_backend_architecture(
+    def _prompt1_backend_architecture(
         self, 
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
         market_research: Dict[str, Any]
-    ) -> Dict[str, str]:
+    ) -> str:
         """Prompt 1: Backend architecture and API design"""
         
         prompt = f"""
@@ -364,21 +394,20 @@ class ClaudeCoder:
         Focus on production-ready, scalable architecture.
         """
         
-        response = await self._generate_code_response(prompt)
-        return self._parse_code_files(response, "backend")
+        return prompt
     
-    async def _prompt2_frontend_implementation(
+    def _prompt2_frontend_implementation(
         self, 
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
         market_research: Dict[str, Any],
         backend_code: Dict[str, str]
-    ) -> Dict[str, str]:
+    ) -> str:
         """Prompt 2: Frontend UI/UX implementation"""
         
-        # Extract backend API endpoints for frontend integration
-        api_endpoints = self._extract_api_endpoints(backend_code)
+        # Compact API contract of the backend instead of its source
+        api_contract = self._api_contract(backend_code)
         
         prompt = f"""
         You are a senior frontend developer. Create a complete frontend implementation for the following project:
@@ -389,8 +418,8 @@ class ClaudeCoder:
         TECH STACK: {prompt_template.get('tech_stack', '')}
         KEY FEATURES: {prompt_template.get('key_features', '')}
 
-        BACKEND API ENDPOINTS:
-        {api_endpoints}
+        BACKEND API CONTRACT:
+        {api_contract}
 
         MARKET RESEARCH CONTEXT:
         - Target Audience: {market_research.get('target_audience', '')}
@@ -645,20 +674,20 @@ class ClaudeCoder:
         Focus on modern, user-friendly interface design with functional components.
         """
         
-        response = await self._generate_code_response(prompt)
-        return self._parse_code_files(response, "frontend")
+        return prompt
     
-    async def _prompt3_integration_connections(
+    def _prompt3_integration_connections(
         self, 
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
         market_research: Dict[str, Any],
-        backend_code: Dict[str, str],
-        frontend_code: Dict[str, str]
-    ) -> Dict[str, str]:
+        backend_code: Dict[str, str]
+    ) -> str:
         """Prompt 3: Integration and API connections"""
         
+        api_contract = self._api_contract(backend_code)
+        
         prompt = f"""
         You are a full-stack integration specialist. Create integration code to connect the frontend and backend:
 
@@ -666,6 +695,9 @@ class ClaudeCoder:
         PROJECT BRIEF: {project_brief}
         APP TYPE: {prompt_template.get('app_type', 'CRUD')}
 
+        BACKEND API CONTRACT:
+        {api_contract}
+
         REQUIREMENTS:
         1. Create API client utilities for frontend
         2. Add proper error handling and retry logic
@@ -745,16 +777,15 @@ class ClaudeCoder:
         Ensure seamless frontend-backend integration.
         """
         
-        response = await self._generate_code_response(prompt)
-        return self._parse_code_files(response, "integration")
+        return prompt
     
-    async def _prompt4_deployment_configuration(
+    def _prompt4_deployment_configuration(
         self, 
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
         market_research: Dict[str, Any]
-    ) -> Dict[str, str]:
+    ) -> str:
         """Prompt 4: Deployment and configuration"""
         
         prompt = f"""
@@ -833,20 +864,15 @@ class ClaudeCoder:
         Focus on production-ready deployment setup.
         """
         
-        response = await self._generate_code_response(prompt)
-        return self._parse_code_files(response, "deployment")
+        return prompt
     
-    async def _prompt5_final_polish(
+    def _prompt5_final_polish(
         self, 
         project_name: str, 
         project_brief: str, 
         prompt_template: Dict[str, Any], 
-        market_research: Dict[str, Any],
-        backend_code: Dict[str, str],
-        frontend_code: Dict[str, str],
-        integration_code: Dict[str, str],
-        deployment_code: Dict[str, str]
-    ) -> Dict[str, str]:
+        market_research: Dict[str, Any]
+    ) -> str:
         """Prompt 5: Final polish and testing"""
         
         prompt = f"""
@@ -918,20 +944,74 @@ class ClaudeCoder:
         Focus on production quality and maintainability.
         """
         
-        response = await self._generate_code_response(prompt)
-        return self._parse_code_files(response, "final")
+        return prompt
     
-    async def _generate_code_response(self, prompt: str) -> str:
-        """Generate code response from Claude"""
+    async def _generate_section_files(
+        self,
+        prompt: str,
+        section: str,
+        llm: Any,
+        on_file: Optional[FileCallback] = None
+    ) -> Dict[str, str]:
+        """Run one section prompt on ``llm`` and split the answer into files"""
+        if self.stream:
+            return await self._stream_section_files(prompt, section, llm, on_file)
+        files = self._parse_code_files(await self._generate_code_response(prompt, llm), section)
+        if on_file is not None and self._has_real_files(files):
+            for file_path, content in files.items():
+                on_file(section, file_path, content)
+        return files
+    
+    async def _stream_section_files(
+        self,
+        prompt: str,
+        section: str,
+        llm: Any,
+        on_file: Optional[FileCallback] = None
+    ) -> Dict[str, str]:
+        """Streaming variant: each file is handed to ``on_file`` as soon as its closing fence arrives.
+
+        The parser only buffers the file being received (plus the answer up to
+        the first file, for the fallback). The response cache also keeps the
+        answer it is about to store, up to llm_cache.MAX_STREAM_CACHE_CHARS.
+        """
+        parser = CodeFenceParser()
+        files: Dict[str, str] = {}
+        
+        def completed(batch):
+            for file_path, content in batch:
+                files[file_path] = content
+                if on_file is not None:
+                    on_file(section, file_path, content)
         
-        messages = [
+        try:
+            async for chunk in self.llm_cache.stream(llm, self._code_messages(prompt), accept=lambda text: "```" in text):
+                completed(parser.feed(chunk))
+            completed(parser.close())
+        except Exception as e:
+            # A broken stream is a failed attempt, even if some files made it through
+            print(f"Code generation error: {e}")
+            return self._parse_code_files(f"Error generating code: {str(e)}", section)
+        
+        if not files:
+            print(f"Warning: No files parsed from {section} response. Creating fallback.")
+            files[f"{section}_fallback.txt"] = parser.raw_text or ""
+        return files
+    
+    def _code_messages(self, prompt: str) -> List[Any]:
+        return [
             SystemMessage(content="You are a senior software engineer. Generate complete, production-ready code files."),
             HumanMessage(content=prompt)
         ]
+    
+    async def _generate_code_response(self, prompt: str, llm: Optional[Any] = None) -> str:
+        """Generate code response from Claude (``llm`` defaults to the primary LLM)"""
+        
+        messages = self._code_messages(prompt)
         
         try:
-            response = await self.primary_llm.agenerate([messages])
-            return response.generations[0][0].text
+            # Only answers containing code blocks are cached; anything else gets retried next run
+            return await self.llm_cache.generate(llm or self.primary_llm, messages, accept=lambda text: "```" in text)
         except Exception as e:
             print(f"Code generation error: {e}")
             return f"Error generating code: {str(e)}"
@@ -939,61 +1019,7 @@ class ClaudeCoder:
     def _parse_code_files(self, response: str, section: str) -> Dict[str, str]:
         """Parse code files from Claude's response"""
         
-        files = {}
-        lines = response.split('\n')
-        current_file = None
-        current_content = []
-        in_code_block = False
-        
-        for line in lines:
-            # Check for code block markers
-            if line.strip().startswith('```'):
-                if in_code_block:
-                    # End of code block, save the file
-                    if current_file and current_content:
-                        files[current_file] = '\n'.join(current_content)
-                    current_file = None
-                    current_content = []
-                    in_code_block = False
-                else:
-                    # Start of code block, look for filename
-                    in_code_block = True
-                    # Check if there's a filename after ```
-                    code_block_line = line.strip()
-                    if ':' in code_block_line:
-                        # Extract filename from ```filename: or ```filename
-                        filename = code_block_line.replace('```', '').split(':')[0].strip()
-                        if filename and not filename.startswith('```'):
-                            current_file = filename
-                continue
-            
-            # Check for file path indicators
-            if not in_code_block and (line.startswith('**File:**') or line.startswith('File:') or 
-                                     line.startswith('**Filename:**') or line.startswith('Filename:') or
-                                     line.startswith('**Path:**') or line.startswith('Path:')):
-                # Save previous file
-                if current_file and current_content:
-                    files[current_file] = '\n'.join(current_content)
-                
-                # Extract file path
-                file_path = (line.replace('**File:**', '').replace('File:', '')
-                           .replace('**Filename:**', '').replace('Filename:', '')
-                           .replace('**Path:**', '').replace('Path:', '').strip())
-                if file_path:
-                    current_file = file_path
-                    current_content = []
-                continue
-            
-            # Add content to current file
-            if current_file and in_code_block:
-                current_content.append(line)
-            elif current_file and not in_code_block and line.strip():
-                # If we have a current file but not in code block, still collect content
-                current_content.append(line)
-        
-        # Save last file
-        if current_file and current_content:
-            files[current_file] = '\n'.join(current_content)
+        files, _ = parse_files(response)
         
         # If no files were parsed, create a fallback
         if not files:
@@ -1002,18 +1028,6 @@ class ClaudeCoder:
         
         return files
     
-    def _extract_api_endpoints(self, backend_code: Dict[str, str]) -> str:
-        """Extract API endpoints from backend code for frontend integration"""
-        
-        endpoints = []
-        
-        # Look for router files and main.py
-        for file_path, content in backend_code.items():
-            if 'router' in file_path.lower() or 'main.py' in file_path:
-                # Simple extraction of route patterns
-                lines = content.split('\n')
-                for line in lines:
-                    if '@app.' in line or '@router.' in line:
-                        endpoints.append(line.strip())
-        
-        return '\n'.join(endpoints[:10])  # Limit to first 10 endpoints
+    def _api_contract(self, backend_code: Dict[str, str]) -> str:
+        """Endpoints and request/response models of the backend, parsed from its AST and fit to the token budget"""
+        return format_api_contract(extract_api_contract(backend_code), self.api_contract_tokens)
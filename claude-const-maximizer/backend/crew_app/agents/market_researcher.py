@@ -4,14 +4,27 @@ Responsible for Step 1 of Phase 3: Comprehensive market research and analysis
 """
 
 import asyncio
-from typing import Dict, Any, List
-from langchain_community.chat_models import ChatOpenAI
+from typing import Dict, Any, List, Optional, Tuple
 from langchain.schema import HumanMessage, SystemMessage
-from langchain_community.tools import TavilySearchResults
 import os
 from dotenv import load_dotenv
 import json
 import re
+import time
+
+from crew_app.cancellation import CancellationToken, ensure_token
+from crew_app.providers import ProviderRegistry, get_provider_registry
+from crew_app.llm_cache import get_llm_cache
+from crew_app.llm_metrics import metrics_scope
+from crew_app.provider_health import get_provider_health, provider_name
+from crew_app.rate_limiter import get_search_rate_limiter
+from crew_app.search_cache import get_search_cache
+from crew_app.near_duplicates import DEFAULT_MAX_DISTANCE, DedupeReport, dedupe_results
+from crew_app.research_ranking import DEFAULT_CATEGORY_TOKENS, pack_research_summary, rank_results
+
+# Searches per research category outside debug mode (RESEARCH_QUERIES_PER_CATEGORY overrides)
+DEFAULT_QUERIES_PER_CATEGORY = 3
+DEFAULT_SEARCH_TIMEOUT_SECONDS = 20.0
 
 load_dotenv()
 
@@ -20,126 +33,33 @@ class MarketResearcher:
     
     # DEBUG MODE: Set to True for faster testing with minimal iterations
     DEBUG_MODE = True  # Set to False for full research
+
+    AGENT_NAME = "Market Researcher"
     
-    def __init__(self):
-        # Check for required API keys - try multiple options
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        google_api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY")
-        deep_ai_api_key = os.getenv("DEEP_AI_API_KEY")
-        mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        
-        # Initialize LLMs with proper error handling
-        self.primary_llm = None
-        self.backup_llms = []
-        
-        # Primary LLM (DeepSeek - cost-effective for research)
-        if openai_api_key:
-            try:
-                self.primary_llm = ChatOpenAI(
-                    model="deepseek-chat",
-                    temperature=0.2,  # Lower temperature for consistent research
-                    openai_api_key=openai_api_key,
-                    base_url="https://api.deepseek.com/v1"
-                )
-                print("  [OK] DeepSeek primary LLM configured for Market Researcher")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure DeepSeek: {e}")
-        else:
-            print("  [WARN] OPENAI_API_KEY not found - DeepSeek not available")
-        
-        # Add Gemini if API key is available
-        if google_api_key:
-            try:
-                from langchain_google_genai import ChatGoogleGenerativeAI
-                gemini_llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-pro",  # Updated model name
-                    temperature=0.2,
-                    google_api_key=google_api_key
-                )
-                self.backup_llms.append(gemini_llm)
-                print("  [OK] Gemini Pro backup LLM configured for Market Researcher")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Gemini Pro for Market Researcher: {e}")
-        else:
-            print("  [WARN] GOOGLE_API_KEY/GEMINI_API_KEY not found - Gemini Pro not available")
-        
-        # Add Hugging Face if API key is available
-        if huggingface_api_key:
-            try:
-                # Try to import HuggingFace - make it optional
-                try:
-                    from langchain_huggingface import ChatHuggingFace
-                except ImportError:
-                    print("  [WARN] langchain_huggingface not installed - skipping HuggingFace")
-                    raise ImportError("langchain_huggingface not available")
-                
-                huggingface_llm = ChatHuggingFace(
-                    model="mistralai/Mistral-7B-Instruct-v0.2",
-                    temperature=0.2,
-                    huggingfacehub_api_token=huggingface_api_key,
-                    task="text-generation"  # Added required field
-                )
-                self.backup_llms.append(huggingface_llm)
-                print("  [OK] Hugging Face LLM configured for Market Researcher")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Hugging Face: {e}")
-        else:
-            print("  [WARN] HUGGINGFACE_API_KEY not found - Hugging Face not available")
-        
-        # Add Mistral if API key is available
-        if mistral_api_key:
-            try:
-                mistral_llm = ChatOpenAI(
-                    model="mistral-large-latest",
-                    temperature=0.2,
-                    openai_api_key=mistral_api_key,
-                    base_url="https://api.mistral.ai/v1"
-                )
-                self.backup_llms.append(mistral_llm)
-                print("  [OK] Mistral LLM configured for Market Researcher")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Mistral: {e}")
-        else:
-            print("  [WARN] MISTRAL_API_KEY not found - Mistral not available")
-        
-        # Add GPT-3.5 as backup if OpenAI key is available
-        if openai_api_key:
-            try:
-                gpt_llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.2,
-                    openai_api_key=openai_api_key
-                )
-                self.backup_llms.append(gpt_llm)
-                print("  [OK] GPT-3.5 Turbo backup LLM configured for Market Researcher")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure GPT-3.5 Turbo: {e}")
-        
-        # Check if we have any working LLMs
-        if not self.primary_llm and not self.backup_llms:
-            print("  [ERROR] No LLMs available! Please set one of: OPENAI_API_KEY, GEMINI_API_KEY, HUGGINGFACE_API_KEY, MISTRAL_API_KEY")
-            raise ValueError("No LLMs available for Market Researcher")
-        
-        # Set primary LLM to first available backup if primary failed
-        if not self.primary_llm and self.backup_llms:
-            self.primary_llm = self.backup_llms[0]
-            self.backup_llms = self.backup_llms[1:]
-            print("  [OK] Using backup LLM as primary")
-        
+    def __init__(self, registry: Optional[ProviderRegistry] = None):
+        # Borrow shared clients from the process-wide registry instead of building our own
+        self.providers = registry or get_provider_registry()
+        self.primary_llm, self.backup_llms = self.providers.agent_llms("Market Researcher", 0.2)
+        self.llm_cache = get_llm_cache()
+        self.health = get_provider_health()
         print(f"  [OK] Market Researcher: {len(self.backup_llms) + 1} LLM(s) configured")
         
         # Enhanced search tool
-        if tavily_api_key:
-            self.search_tool = TavilySearchResults(
-                api_key=tavily_api_key,
-                max_results=8  # Increased for comprehensive research
-            )
+        self.search_tool = self.providers.tavily_search(max_results=8)  # Increased for comprehensive research
+        # All searches run concurrently, paced by the process-wide Tavily rate limit;
+        # results are cached on disk and shared with every other project
+        self.search_limiter = get_search_rate_limiter()
+        self.search_cache = get_search_cache()
+        self.queries_per_category = max(1, int(os.getenv("RESEARCH_QUERIES_PER_CATEGORY", DEFAULT_QUERIES_PER_CATEGORY)))
+        self.search_timeout = float(os.getenv("RESEARCH_SEARCH_TIMEOUT_SECONDS", DEFAULT_SEARCH_TIMEOUT_SECONDS))
+        # SimHash bits two results may differ in and still count as one article (-1: URL dedupe only)
+        self.dedupe_distance = int(os.getenv("RESEARCH_DEDUPE_DISTANCE", DEFAULT_MAX_DISTANCE))
+        # Token budget of each research category in the deep-analysis prompt
+        self.summary_category_tokens = int(os.getenv("RESEARCH_SUMMARY_TOKENS_PER_CATEGORY", DEFAULT_CATEGORY_TOKENS))
+        if self.search_tool:
             print("  [OK] Tavily search tool configured")
         else:
             print("  [WARN] TAVILY_API_KEY not found - search functionality limited")
-            self.search_tool = None
         
         # Research categories for comprehensive coverage
         self.research_categories = {
@@ -169,14 +89,15 @@ class MarketResearcher:
             ]
         }
     
-    async def research_project(self, project_name: str, description: str, tech_stack: str) -> Dict[str, Any]:
+    async def research_project(self, project_name: str, description: str, tech_stack: str, cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Conduct comprehensive market research for a project"""
         
         print(f"[RESEARCH] Starting comprehensive market research for: {project_name}")
+        cancel_token = ensure_token(cancel_token)
         
         # Phase 1: Initial Research
         print("  [PHASE1] Phase 1: Conducting initial market research...")
-        research_data = await self._conduct_comprehensive_research(project_name, description, tech_stack)
+        research_data, dedupe_report = await self._conduct_comprehensive_research(project_name, description, tech_stack, cancel_token)
         
         # In debug mode, skip deep analysis and validation for faster processing
         if self.DEBUG_MODE:
@@ -186,11 +107,11 @@ class MarketResearcher:
         else:
             # Phase 2: Deep Analysis
             print("  [PHASE2] Phase 2: Performing deep market analysis...")
-            analysis = await self._perform_deep_analysis(project_name, description, tech_stack, research_data)
+            analysis = await self._perform_deep_analysis(project_name, description, tech_stack, research_data, cancel_token)
             
             # Phase 3: Validation and Enhancement
             print("  [PHASE3] Phase 3: Validating and enhancing research...")
-            enhanced_analysis = await self._validate_and_enhance_analysis(project_name, description, analysis, research_data)
+            enhanced_analysis = await self._validate_and_enhance_analysis(project_name, description, analysis, research_data, cancel_token)
         
         # Compile final research report
         final_report = {
@@ -199,6 +120,7 @@ class MarketResearcher:
             "tech_stack": tech_stack,
             "research_date": asyncio.get_event_loop().time(),
             "research_data": research_data,
+            "deduplication": dedupe_report.to_dict(),
             "market_research": enhanced_analysis,
             "target_audience": enhanced_analysis.get("target_audience", ""),
             "competitors": enhanced_analysis.get("competitors", ""),
@@ -218,58 +140,75 @@ class MarketResearcher:
         print(f"  [GOAL] Research completed with quality score: {final_report['research_quality_score']}/100")
         return final_report
     
-    async def _conduct_comprehensive_research(self, project_name: str, description: str, tech_stack: str) -> List[Dict[str, Any]]:
-        """Conduct comprehensive web research across multiple categories"""
+    async def _conduct_comprehensive_research(self, project_name: str, description: str, tech_stack: str, cancel_token: Optional[CancellationToken] = None) -> Tuple[List[Dict[str, Any]], DedupeReport]:
+        """Conduct comprehensive web research across multiple categories.
+
+        Every category query is searched at the same time, paced by the
+        Tavily token bucket, so wall time follows the slowest search rather
+        than their sum. A failed or timed-out search only loses its own
+        results. Returns the deduplicated results and the dedupe report.
+        """
         
-        all_research_results = []
+        cancel_token = ensure_token(cancel_token)
         
         # Check if search tool is available
         if not self.search_tool:
             print("    [WARN] Search tool not available - using fallback research data")
-            return self._create_fallback_research_data(project_name, description, tech_stack)
+            return self._create_fallback_research_data(project_name, description, tech_stack), DedupeReport()
         
-        # Generate search queries for each research category
+        # Use only one query per category in debug mode
+        queries_per_category = 1 if self.DEBUG_MODE else self.queries_per_category
+        searches = []
         for category, keywords in self.research_categories.items():
-            print(f"    [SEARCH] Researching {category}...")
-            
             # Create category-specific search queries
             category_queries = self._generate_category_queries(project_name, description, tech_stack, category, keywords)
-            
-            # Use only one query in debug mode
-            if self.DEBUG_MODE:
-                query_to_use = category_queries[0] if category_queries else ""
-                print(f"    [DEBUG] DEBUG_MODE: Using single query for {category}: {query_to_use}")
-            else:
-                query_to_use = category_queries[0] if category_queries else ""
-                print(f"    [SEARCH] Researching {category} with multiple queries...")
-            
-            if not query_to_use:
+            if not category_queries:
                 print(f"    [WARN] No queries generated for {category} - skipping.")
                 continue
-
-            try:
-                results = await self.search_tool.ainvoke({"query": query_to_use})
-                
-                # Add category metadata to results
-                for result in results:
-                    result["research_category"] = category
-                    result["search_query"] = query_to_use
-                
-                all_research_results.extend(results)
-                
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                print(f"    [WARN] Search error for query '{query_to_use}': {e}")
-                continue
-        
-        # Remove duplicates and limit results
-        unique_results = self._deduplicate_results(all_research_results)
+            for query in category_queries[:queries_per_category]:
+                searches.append((category, query))
+        
+        print(f"    [SEARCH] Researching {len(self.research_categories)} categories with {len(searches)} concurrent queries...")
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(
+            self._search(category, query, cancel_token) for category, query in searches
+        ))
+        failed = sum(1 for results in outcomes if results is None)
+        print(f"    [SEARCH] {len(searches) - failed}/{len(searches)} searches succeeded in {time.perf_counter() - started:.1f}s")
+        
+        # Collect in category/query order so results are deterministic regardless of completion order
+        all_research_results = [result for results in outcomes if results for result in results]
+        
+        # Remove duplicates, then order each category by relevance to the project
+        unique_results, dedupe_report = self._deduplicate_results(all_research_results)
+        ranked_results = rank_results(unique_results, project_name, description, self.research_categories)
+        
+        # No fixed result cap: the analysis prompt takes the most relevant sources per category within its token budget
+        return ranked_results, dedupe_report
+    
+    async def _search(self, category: str, query: str, cancel_token: CancellationToken) -> Optional[List[Dict[str, Any]]]:
+        """One cached (else rate-limited) Tavily search with a timeout; None if it failed"""
+        try:
+            with metrics_scope(agent=self.AGENT_NAME, section=f"search: {category}"):
+                results = await cancel_token.guard(
+                    self.search_cache.search(self.search_tool, query, self.search_limiter, self.search_timeout),
+                    f"search: {category}"
+                )
+            if not isinstance(results, list):
+                # The Tavily tool reports API errors as a string instead of raising
+                raise RuntimeError(str(results)[:200])
+        except asyncio.TimeoutError:
+            print(f"    [WARN] Search timed out after {self.search_timeout:g}s for query '{query}'")
+            return None
+        except Exception as e:
+            print(f"    [WARN] Search error for query '{query}': {e}")
+            return None
         
-        # Use smaller limit in debug mode
-        max_results = 10 if self.DEBUG_MODE else 50
-        return unique_results[:max_results]  # Limit results
+        # Add category metadata to results
+        for result in results:
+            result["research_category"] = category
+            result["search_query"] = query
+        return results
     
     def _generate_category_queries(self, project_name: str, description: str, tech_stack: str, category: str, keywords: List[str]) -> List[str]:
         """Generate category-specific search queries"""
@@ -297,22 +236,15 @@ class MarketResearcher:
         # Add category-specific queries
         queries.extend(base_queries)
         
-        return list(set(queries))  # Remove duplicates
+        return list(dict.fromkeys(queries))  # Remove duplicates, keeping the order (the first queries are the ones searched)
     
-    def _deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate search results"""
-        seen_urls = set()
-        unique_results = []
-        
-        for result in results:
-            url = result.get("url", "")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_results.append(result)
-        
-        return unique_results
+    def _deduplicate_results(self, results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], DedupeReport]:
+        """Remove duplicate search results: same URL, or near-identical content (syndicated/mirrored articles)"""
+        unique_results, report = dedupe_results(results, self.dedupe_distance)
+        print(f"    [DEDUPE] {report.summary()}")
+        return unique_results, report
     
-    async def _perform_deep_analysis(self, project_name: str, description: str, tech_stack: str, research_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _perform_deep_analysis(self, project_name: str, description: str, tech_stack: str, research_data: List[Dict[str, Any]], cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Perform deep market analysis using LLM"""
         
         # Prepare comprehensive research summary
@@ -429,9 +361,10 @@ Return your analysis as a JSON object with the following structure:
 Ensure all sections are comprehensive, actionable, and based on the research data provided.
 """
         
-        return await self._generate_analysis_with_fallback(analysis_prompt)
+        with metrics_scope(agent=self.AGENT_NAME, section="deep_analysis"):
+            return await self._generate_analysis_with_fallback(analysis_prompt, cancel_token)
     
-    async def _validate_and_enhance_analysis(self, project_name: str, description: str, analysis: Dict[str, Any], research_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _validate_and_enhance_analysis(self, project_name: str, description: str, analysis: Dict[str, Any], research_data: List[Dict[str, Any]], cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Validate and enhance the analysis with additional insights"""
         
         validation_prompt = f"""
@@ -465,7 +398,8 @@ Return the enhanced analysis as a JSON object with the same structure as the inp
 Focus on making the analysis more comprehensive, accurate, and actionable for product development and go-to-market planning.
 """
         
-        enhanced_analysis = await self._generate_analysis_with_fallback(validation_prompt)
+        with metrics_scope(agent=self.AGENT_NAME, section="analysis_validation"):
+            enhanced_analysis = await self._generate_analysis_with_fallback(validation_prompt, cancel_token)
         
         # Merge with original analysis, preferring enhanced content
         final_analysis = analysis.copy()
@@ -475,39 +409,27 @@ Focus on making the analysis more comprehensive, accurate, and actionable for pr
         
         return final_analysis
     
-    async def _generate_analysis_with_fallback(self, prompt: str) -> Dict[str, Any]:
+    async def _generate_analysis_with_fallback(self, prompt: str, cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Generate analysis with multi-LLM fallback"""
         
+        cancel_token = ensure_token(cancel_token)
         messages = [
             SystemMessage(content="You are a senior market research analyst. Provide comprehensive, actionable market insights in JSON format."),
             HumanMessage(content=prompt)
         ]
         
-        # Try primary LLM first
-        try:
-            print(f"    [ANALYSIS] Generating analysis with DeepSeek...")
-            response = await self.primary_llm.agenerate([messages])
-            
-            if response.generations and response.generations[0]:
-                analysis_text = response.generations[0][0].text
-                analysis = self._parse_analysis_response(analysis_text)
-                if analysis and not self._is_fallback_response(analysis):
-                    print(f"    [OK] Analysis generated successfully with DeepSeek")
-                    return analysis
-            
-        except Exception as e:
-            print(f"    [WARN] DeepSeek analysis failed: {e}")
-        
-        # Try backup LLMs
-        for i, backup_llm in enumerate(self.backup_llms):
+        # Healthiest provider first; providers with an open circuit are skipped
+        for llm in self.health.order([self.primary_llm] + self.backup_llms):
+            llm_name = provider_name(llm)
             try:
-                llm_name = "Gemini Pro" if i == 0 else "GPT-3.5 Turbo"
-                print(f"    [ANALYSIS] Trying {llm_name} for analysis...")
+                print(f"    [ANALYSIS] Generating analysis with {llm_name}...")
                 
-                response = await backup_llm.agenerate([messages])
+                analysis_text = await cancel_token.guard(
+                    self.llm_cache.generate(llm, messages, accept=self._is_usable_analysis),
+                    f"analysis: {llm_name}"
+                )
                 
-                if response.generations and response.generations[0]:
-                    analysis_text = response.generations[0][0].text
+                if analysis_text:
                     analysis = self._parse_analysis_response(analysis_text)
                     if analysis and not self._is_fallback_response(analysis):
                         print(f"    [OK] Analysis generated successfully with {llm_name}")
@@ -520,6 +442,11 @@ Focus on making the analysis more comprehensive, accurate, and actionable for pr
         print(f"    [WARN] All LLMs failed, using fallback analysis")
         return self._create_fallback_analysis()
     
+    def _is_usable_analysis(self, analysis_text: str) -> bool:
+        """Whether an LLM answer parses into a real analysis (and may be cached)"""
+        analysis = self._parse_analysis_response(analysis_text)
+        return bool(analysis) and not self._is_fallback_response(analysis)
+    
     def _parse_analysis_response(self, analysis_text: str) -> Dict[str, Any]:
         """Parse analysis response, handling various formats"""
         
@@ -581,45 +508,10 @@ Focus on making the analysis more comprehensive, accurate, and actionable for pr
         return sections
     
     def _create_comprehensive_summary(self, research_data: List[Dict[str, Any]]) -> str:
-        """Create comprehensive summary of research data"""
-        summary_parts = []
-        
-        # Group by research category
-        by_category = {}
-        for result in research_data:
-            category = result.get("research_category", "general")
-            if category not in by_category:
-                by_category[category] = []
-            by_category[category].append(result)
-        
-        # Process results by category
-        summary_parts = []
-        for category, results in by_category.items():
-            print(f"    [PROCESS] Processing {len(results)} results for {category}...")
-            
-            # In debug mode, limit to fewer results
-            max_results = 2 if self.DEBUG_MODE else 5
-            results_to_process = results[:max_results]
-            
-            summary_parts.append(f"\n## {category.upper().replace('_', ' ')} RESEARCH")
-            
-            for i, result in enumerate(results_to_process, 1):
-                if self.DEBUG_MODE:
-                    print(f"      [DEBUG] DEBUG_MODE: Processing result {i}/{len(results_to_process)} for {category}")
-                else:
-                    print(f"      [PROCESS] Processing result {i}/{len(results)} for {category}")
-                
-                # Extract key information from result
-                title = result.get("title", "No title")
-                content = result.get("content", "No content")
-                url = result.get("url", "No URL")
-                
-                # Add to comprehensive summary
-                summary_parts.append(f"\n### Source {i}: {title}")
-                summary_parts.append(f"**URL:** {url}")
-                summary_parts.append(f"**Content:** {content[:300]}...")
-        
-        return "\n".join(summary_parts)
+        """Create comprehensive summary of research data: the most relevant sources of each category, within its token budget"""
+        summary, report = pack_research_summary(research_data, self.summary_category_tokens)
+        print(f"    [PROCESS] Research summary: {report.summary()} (budget {self.summary_category_tokens} per category)")
+        return summary
     
     def _is_fallback_response(self, analysis: Dict[str, Any]) -> bool:
         """Check if the analysis is a fallback/error response"""
@@ -4,13 +4,16 @@ Responsible for Step 2 of Phase 3: Converting project brief into Claude-optimize
 """
 
 import asyncio
-from typing import Dict, Any, List
-from langchain_community.chat_models import ChatOpenAI
+from typing import Dict, Any, List, Optional
 from langchain.schema import HumanMessage, SystemMessage
 import os
 from dotenv import load_dotenv
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from crew_app.providers import ProviderRegistry, get_provider_registry
+from crew_app.llm_cache import get_llm_cache
+from crew_app.llm_metrics import metrics_scope
+from crew_app.provider_health import get_provider_health, provider_name
 from templates.prompt_engineering_system import (
     generate_claude_optimized_prompt,
     generate_research_to_brief_prompt,
@@ -29,107 +32,12 @@ class PromptEngineer:
     # DEBUG MODE: Set to True for faster testing with minimal iterations
     DEBUG_MODE = True  # Set to False for full prompt engineering
     
-    def __init__(self):
-        # Check for required API keys - try multiple options
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        google_api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY")
-        deep_ai_api_key = os.getenv("DEEP_AI_API_KEY")
-        mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        
-        # Initialize LLMs with proper error handling
-        self.primary_llm = None
-        self.backup_llms = []
-        
-        # Primary LLM (DeepSeek - cost-effective for prompt engineering)
-        if openai_api_key:
-            try:
-                self.primary_llm = ChatOpenAI(
-                    model="deepseek-chat",
-                    temperature=0.1,  # Lower temperature for consistent prompt engineering
-                    openai_api_key=openai_api_key,
-                    base_url="https://api.deepseek.com/v1"
-                )
-                print("  [OK] DeepSeek primary LLM configured for Prompt Engineer")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure DeepSeek: {e}")
-        else:
-            print("  [WARN] OPENAI_API_KEY not found - DeepSeek not available")
-        
-        # Add Gemini if API key is available
-        if google_api_key:
-            try:
-                from langchain_google_genai import ChatGoogleGenerativeAI
-                gemini_llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-pro",  # Updated model name
-                    temperature=0.1,
-                    google_api_key=google_api_key
-                )
-                self.backup_llms.append(gemini_llm)
-                print("  [OK] Gemini Pro backup LLM configured for Prompt Engineer")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Gemini Pro for Prompt Engineer: {e}")
-        else:
-            print("  [WARN] GOOGLE_API_KEY/GEMINI_API_KEY not found - Gemini Pro not available")
-        
-        # Add Hugging Face if API key is available
-        if huggingface_api_key:
-            try:
-                from langchain_huggingface import ChatHuggingFace
-                huggingface_llm = ChatHuggingFace(
-                    model="mistralai/Mistral-7B-Instruct-v0.2",
-                    temperature=0.1,
-                    huggingfacehub_api_token=huggingface_api_key,
-                    task="text-generation"  # Added required field
-                )
-                self.backup_llms.append(huggingface_llm)
-                print("  [OK] Hugging Face LLM configured for Prompt Engineer")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Hugging Face: {e}")
-        else:
-            print("  [WARN] HUGGINGFACE_API_KEY not found - Hugging Face not available")
-        
-        # Add Mistral if API key is available
-        if mistral_api_key:
-            try:
-                from langchain_community.chat_models import ChatOpenAI
-                mistral_llm = ChatOpenAI(
-                    model="mistral-large-latest",
-                    temperature=0.1,
-                    openai_api_key=mistral_api_key,
-                    base_url="https://api.mistral.ai/v1"
-                )
-                self.backup_llms.append(mistral_llm)
-                print("  [OK] Mistral LLM configured for Prompt Engineer")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure Mistral: {e}")
-        else:
-            print("  [WARN] MISTRAL_API_KEY not found - Mistral not available")
-        
-        # Add GPT-3.5 as backup if OpenAI key is available
-        if openai_api_key:
-            try:
-                gpt_llm = ChatOpenAI(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,
-                    openai_api_key=openai_api_key
-                )
-                self.backup_llms.append(gpt_llm)
-                print("  [OK] GPT-3.5 Turbo backup LLM configured for Prompt Engineer")
-            except Exception as e:
-                print(f"  [WARN] Failed to configure GPT-3.5 Turbo: {e}")
-        
-        # Check if we have any working LLMs
-        if not self.primary_llm and not self.backup_llms:
-            print("  [ERROR] No LLMs available! Please set one of: OPENAI_API_KEY, GEMINI_API_KEY, HUGGINGFACE_API_KEY, MISTRAL_API_KEY")
-            raise ValueError("No LLMs available for Prompt Engineer")
-        
-        # Set primary LLM to first available backup if primary failed
-        if not self.primary_llm and self.backup_llms:
-            self.primary_llm = self.backup_llms[0]
-            self.backup_llms = self.backup_llms[1:]
-            print("  [OK] Using backup LLM as primary")
-        
+    def __init__(self, registry: Optional[ProviderRegistry] = None):
+        # Borrow shared clients from the process-wide registry instead of building our own
+        self.providers = registry or get_provider_registry()
+        self.primary_llm, self.backup_llms = self.providers.agent_llms("Prompt Engineer", 0.1)
+        self.llm_cache = get_llm_cache()
+        self.health = get_provider_health()
         print(f"  [OK] Prompt Engineer: {len(self.backup_llms) + 1} LLM(s) configured")
         
         self.current_llm_index = 0
@@ -154,9 +62,10 @@ class PromptEngineer:
         )
         
         # Further enhance the prompt using LLM
-        enhanced_prompt = await self._enhance_prompt_with_llm(
-            optimized_prompt, project_name, prompt_type
-        )
+        with metrics_scope(agent="Prompt Engineer", section=f"prompt: {prompt_type}"):
+            enhanced_prompt = await self._enhance_prompt_with_llm(
+                optimized_prompt, project_name, prompt_type
+            )
         
         return enhanced_prompt
     
@@ -212,45 +121,26 @@ Return the enhanced prompt with all improvements integrated. Maintain the same s
 Remember: The goal is to create the most effective prompt possible for Claude, leveraging all known optimization techniques and Claude-specific best practices.
 """
         
-        try:
-            # Try primary LLM first
-            print(f"  [PROCESS] Enhancing prompt with DeepSeek...")
-            response = await self.primary_llm.agenerate([
-                [HumanMessage(content=enhancement_prompt)]
-            ])
-            
-            if response.generations and response.generations[0]:
-                enhanced_content = response.generations[0][0].text
-                if not self._is_fallback_response(enhanced_content):
-                    print(f"  [OK] Prompt enhanced successfully with DeepSeek")
-                    return enhanced_content
-            
-        except Exception as e:
-            print(f"  [WARN] DeepSeek enhancement failed: {e}")
-        
-        # Try backup LLMs
-        for i, backup_llm in enumerate(self.backup_llms):
+        # Healthiest provider first, open circuits skipped; in debug mode only one backup
+        chain = self.health.order([self.primary_llm] + self.backup_llms)
+        for llm in chain[:2] if self.DEBUG_MODE else chain:
+            llm_name = provider_name(llm)
             try:
-                llm_name = "Gemini Pro" if i == 0 else "GPT-3.5 Turbo"
-                print(f"  [PROCESS] Trying {llm_name} for prompt enhancement...")
+                print(f"  [PROCESS] Enhancing prompt with {llm_name}...")
                 
-                response = await backup_llm.agenerate([
-                    [HumanMessage(content=enhancement_prompt)]
-                ])
+                enhanced_content = await self.llm_cache.generate(
+                    llm,
+                    [HumanMessage(content=enhancement_prompt)],
+                    accept=lambda text: not self._is_fallback_response(text)
+                )
                 
-                if response.generations and response.generations[0]:
-                    enhanced_content = response.generations[0][0].text
+                if enhanced_content:
                     if not self._is_fallback_response(enhanced_content):
                         print(f"  [OK] Prompt enhanced successfully with {llm_name}")
                         return enhanced_content
                         
             except Exception as e:
                 print(f"  [WARN] {llm_name} enhancement failed: {e}")
-            
-            # In debug mode, limit to first backup LLM only
-            if self.DEBUG_MODE:
-                print("  [CONFIG] DEBUG_MODE: Limiting to first backup LLM only")
-                break
         
         # Return base prompt if all LLMs fail
         print(f"  [WARN] All LLMs failed, using base prompt")
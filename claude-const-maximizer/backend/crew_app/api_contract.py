@@ -0,0 +1,316 @@
+"""
+API Contract
+AST-based extraction of the endpoints and models of generated FastAPI code, packed into a token-budgeted prompt context
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional, Set, Tuple
+
+from .llm_metrics import estimate_tokens
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+MODEL_BASES = {"BaseModel", "SQLModel"}
+# Parameters FastAPI injects itself; they are not part of the contract
+INJECTED_TYPES = {"Request", "Response", "BackgroundTasks", "WebSocket", "Session", "AsyncSession", "HTTPConnection"}
+DEPENDENCY_CALLS = {"Depends", "Security"}
+BODY_CALLS = {"Body", "File", "Form"}
+
+DEFAULT_CONTRACT_TOKENS = 1500
+
+# Decorator lines of files that do not parse (the model may cut a file short)
+DECORATOR_PATTERN = re.compile(r"@(\w+)\.(" + "|".join(HTTP_METHODS) + r")\(\s*['\"]([^'\"]*)['\"]")
+
+
+@dataclass
+class ApiEndpoint:
+    method: str
+    path: str
+    function: str = ""
+    path_params: List[str] = field(default_factory=list)
+    query_params: List[str] = field(default_factory=list)
+    body: List[str] = field(default_factory=list)
+    response: Optional[str] = None
+
+    def line(self) -> str:
+        parts = [f"{self.method} {self.path}"]
+        if self.path_params:
+            parts.append(f"path({', '.join(self.path_params)})")
+        if self.query_params:
+            parts.append(f"query({', '.join(self.query_params)})")
+        if self.body:
+            parts.append(f"body({', '.join(self.body)})")
+        if self.response:
+            parts.append(f"-> {self.response}")
+        return " ".join(parts)
+
+
+@dataclass
+class ApiModel:
+    name: str
+    fields: List[str] = field(default_factory=list)
+
+    def line(self) -> str:
+        return f"{self.name} {{{', '.join(self.fields)}}}"
+
+
+@dataclass
+class ApiContract:
+    endpoints: List[ApiEndpoint] = field(default_factory=list)
+    models: Dict[str, ApiModel] = field(default_factory=dict)
+    unparsed_files: List[str] = field(default_factory=list)
+
+
+def _constant_str(node: Optional[ast.AST]) -> Optional[str]:
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.AST]:
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def _call_name(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Call):
+        func = node.func
+        return func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+    return None
+
+
+def _names(node: Optional[ast.AST]) -> Set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)} if node is not None else set()
+
+
+def _has_default(default: Optional[ast.AST]) -> bool:
+    """False for no default, ``...`` and ``Query(...)``/``File(...)``-style required markers"""
+    if isinstance(default, ast.Call):
+        default = default.args[0] if default.args else _keyword(default, "default")
+    return default is not None and not (isinstance(default, ast.Constant) and default.value is Ellipsis)
+
+
+def _is_optional(annotation: Optional[ast.AST], default: Optional[ast.AST]) -> bool:
+    if _has_default(default):
+        return True
+    text = ast.unparse(annotation) if annotation is not None else ""
+    return "Optional[" in text or "None" in text
+
+
+def _stem(file_path: str) -> str:
+    return PurePosixPath(file_path.replace("\\", "/")).stem
+
+
+class _FileScan:
+    """Routers, include_router prefixes, endpoints and models of one module"""
+
+    def __init__(self, file_path: str, tree: ast.Module):
+        self.stem = _stem(file_path)
+        self.router_prefixes: Dict[str, str] = {}
+        self.imports: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.includes: List[Tuple[Tuple[str, str], str]] = []
+        self.routes: List[Tuple[str, ast.AST, ast.Call, str]] = []
+        self.classes: List[ast.ClassDef] = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom):
+                module_stem = (node.module or "").split(".")[-1]
+                for alias in node.names:
+                    # "from routers import users" binds a module, "from routers.users import router" an attribute
+                    self.imports[alias.asname or alias.name] = (module_stem, alias.name)
+            elif isinstance(node, ast.Assign) and _call_name(node.value) == "APIRouter":
+                prefix = _constant_str(_keyword(node.value, "prefix")) or ""
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.router_prefixes[target.id] = prefix
+            elif isinstance(node, ast.Call) and _call_name(node) == "include_router" and node.args:
+                router = self._router_ref(node.args[0])
+                if router is not None:
+                    self.includes.append((router, _constant_str(_keyword(node, "prefix")) or ""))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for decorator in node.decorator_list:
+                    route = self._route(decorator)
+                    if route is not None:
+                        self.routes.append((route[0], node, decorator, route[1]))
+            elif isinstance(node, ast.ClassDef):
+                self.classes.append(node)
+
+    def _router_ref(self, node: ast.AST) -> Optional[Tuple[str, str]]:
+        """(module stem, variable) of the router passed to include_router"""
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            module = self.imports.get(node.value.id, (node.value.id, None))[1] or node.value.id
+            return module, node.attr
+        if isinstance(node, ast.Name):
+            if node.id in self.imports:
+                module_stem, attr = self.imports[node.id]
+                return module_stem, attr or node.id
+            return self.stem, node.id
+        return None
+
+    @staticmethod
+    def _route(decorator: ast.AST) -> Optional[Tuple[str, str]]:
+        """(router variable, METHOD) of a route decorator"""
+        if not isinstance(decorator, ast.Call) or not isinstance(decorator.func, ast.Attribute):
+            return None
+        target = decorator.func.value
+        if not isinstance(target, ast.Name):
+            return None
+        attr = decorator.func.attr
+        if attr in HTTP_METHODS:
+            return target.id, attr.upper()
+        if attr == "api_route":
+            methods = _keyword(decorator, "methods")
+            if isinstance(methods, (ast.List, ast.Tuple)):
+                names = [_constant_str(element) for element in methods.elts]
+                return target.id, "|".join(name.upper() for name in names if name)
+            return target.id, "GET"
+        return None
+
+
+def _model_fields(node: ast.ClassDef) -> List[str]:
+    fields = []
+    for statement in node.body:
+        if isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+            name = statement.target.id
+            annotation = ast.unparse(statement.annotation)
+            if name.startswith("_") or name == "model_config" or annotation.startswith("ClassVar"):
+                continue
+            marker = "?" if _is_optional(statement.annotation, statement.value) else ""
+            fields.append(f"{name}{marker}: {annotation}")
+    return fields
+
+
+def extract_api_contract(backend_code: Dict[str, str]) -> ApiContract:
+    """Endpoints (full path incl. router and include prefixes, params, body, response) and Pydantic models"""
+    contract = ApiContract()
+    scans: List[_FileScan] = []
+    for file_path, content in backend_code.items():
+        if not file_path.endswith(".py"):
+            continue
+        try:
+            scans.append(_FileScan(file_path, ast.parse(content)))
+        except (SyntaxError, ValueError):
+            contract.unparsed_files.append(file_path)
+            for _, method, path in DECORATOR_PATTERN.findall(content):
+                contract.endpoints.append(ApiEndpoint(method.upper(), path))
+
+    # Models: classes derived from BaseModel, directly or through another model
+    classes = [node for scan in scans for node in scan.classes]
+    model_names = set(MODEL_BASES)
+    grew = True
+    while grew:
+        grew = False
+        for node in classes:
+            if node.name not in model_names and set().union(*map(_names, node.bases)) & model_names:
+                model_names.add(node.name)
+                grew = True
+    by_name = {node.name: node for node in classes if node.name in model_names}
+
+    def fields_of(name: str, seen: Set[str]) -> List[str]:
+        # Inherited fields first, as Pydantic orders them
+        node = by_name.get(name)
+        if node is None or name in seen:
+            return []
+        seen.add(name)
+        inherited = [f for base in node.bases for base_name in _names(base) for f in fields_of(base_name, seen)]
+        own = _model_fields(node)
+        own_names = {f.split(":")[0].rstrip("?") for f in own}
+        return [f for f in inherited if f.split(":")[0].rstrip("?") not in own_names] + own
+
+    for name in by_name:
+        if name not in MODEL_BASES:
+            contract.models[name] = ApiModel(name, fields_of(name, set()))
+
+    includes: Dict[Tuple[str, str], List[str]] = {}
+    for scan in scans:
+        for router, prefix in scan.includes:
+            includes.setdefault(router, []).append(prefix)
+
+    for scan in scans:
+        for variable, function, decorator, method in scan.routes:
+            path = _constant_str(decorator.args[0] if decorator.args else _keyword(decorator, "path")) or ""
+            router_path = scan.router_prefixes.get(variable, "") + path
+            for include_prefix in includes.get((scan.stem, variable), [""]):
+                contract.endpoints.append(_endpoint(method, include_prefix + router_path, function, decorator, contract.models))
+    return contract
+
+
+def _endpoint(method: str, path: str, function: ast.AST, decorator: ast.Call, models: Dict[str, ApiModel]) -> ApiEndpoint:
+    endpoint = ApiEndpoint(method, path or "/", function.name)
+    path_names = set(re.findall(r"{(\w+)(?::\w+)?}", path))
+    args = function.args
+    positional = args.posonlyargs + args.args
+    defaults: List[Optional[ast.AST]] = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for arg, default in list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults)):
+        if arg.arg in ("self", "cls") or _call_name(default) in DEPENDENCY_CALLS:
+            continue
+        annotation = ast.unparse(arg.annotation) if arg.annotation is not None else "Any"
+        if _names(arg.annotation) & INJECTED_TYPES:
+            continue
+        marker = "?" if _is_optional(arg.annotation, default) else ""
+        if arg.arg in path_names:
+            endpoint.path_params.append(f"{arg.arg}: {annotation}")
+        elif _names(arg.annotation) & set(models) or _call_name(default) in BODY_CALLS or "UploadFile" in annotation:
+            endpoint.body.append(f"{arg.arg}{marker}: {annotation}")
+        else:
+            endpoint.query_params.append(f"{arg.arg}{marker}: {annotation}")
+    response_model = _keyword(decorator, "response_model")
+    if response_model is not None:
+        endpoint.response = ast.unparse(response_model)
+    elif function.returns is not None:
+        endpoint.response = ast.unparse(function.returns)
+    return endpoint
+
+
+def format_api_contract(contract: ApiContract, max_tokens: int = DEFAULT_CONTRACT_TOKENS) -> str:
+    """Compact prompt context: every endpoint first, then the models they use, within ``max_tokens``.
+
+    Endpoints that do not fit are counted in an omission note; models are
+    added in order of first use (and the models their fields reference)
+    until the budget runs out.
+    """
+    if not contract.endpoints:
+        return "No API endpoints found in the backend code."
+
+    lines = [f"ENDPOINTS ({len(contract.endpoints)}):"]
+    used = estimate_tokens(lines[0])
+    for index, endpoint in enumerate(contract.endpoints):
+        line = endpoint.line()
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            lines.append(f"... {len(contract.endpoints) - index} more endpoint(s) omitted for length")
+            return "\n".join(lines)
+        lines.append(line)
+        used += cost
+
+    # Models referenced by the endpoints, then the models those reference
+    queue = [name for endpoint in contract.endpoints
+             for text in endpoint.body + [endpoint.response or ""]
+             for name in re.findall(r"\w+", text) if name in contract.models]
+    seen: Set[str] = set()
+    model_lines: List[str] = []
+    omitted: List[str] = []
+    while queue:
+        name = queue.pop(0)
+        if name in seen:
+            continue
+        seen.add(name)
+        model = contract.models[name]
+        line = model.line()
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            omitted.append(name)
+            continue
+        model_lines.append(line)
+        used += cost
+        queue.extend(ref for text in model.fields for ref in re.findall(r"\w+", text.split(":", 1)[-1]) if ref in contract.models)
+
+    if model_lines:
+        lines.append("MODELS:")
+        lines.extend(model_lines)
+    if omitted:
+        lines.append(f"Models omitted for length: {', '.join(omitted)}")
+    if contract.unparsed_files:
+        lines.append(f"(Routes of {', '.join(contract.unparsed_files)} read from decorators only: the files do not parse)")
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+"""
+Cooperative Cancellation
+Tokens checked at task and LLM-call boundaries so a single project run can be stopped cleanly
+"""
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class OperationCancelled(BaseException):
+    """Raised when a run is cancelled.
+
+    Derives from BaseException (like asyncio.CancelledError) so the broad
+    ``except Exception`` fallbacks in the agents and in CrewAI's own retry
+    loops do not swallow it.
+    """
+
+
+class CancellationToken:
+    """Cancellation flag for one project run.
+
+    ``cancel()`` trips it in-process. ``check`` is an optional callable polled
+    (at most every ``poll_interval`` seconds) for cancellation requested from
+    elsewhere, e.g. the ``interrupt_requested`` flag in the status store when
+    the run lives in a worker process.
+    """
+
+    def __init__(self, check: Optional[Callable[[], bool]] = None, poll_interval: float = 1.0, reason: str = "Cancelled"):
+        self._event = threading.Event()
+        self._check = check
+        self._poll_interval = poll_interval
+        self._last_poll = 0.0
+        self.reason = reason
+
+    def cancel(self, reason: Optional[str] = None):
+        if reason:
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._check is not None:
+            now = time.monotonic()
+            if now - self._last_poll >= self._poll_interval:
+                self._last_poll = now
+                try:
+                    if self._check():
+                        self._event.set()
+                except Exception as e:
+                    print(f"[WARN] Cancellation check failed: {e}")
+        return self._event.is_set()
+
+    def raise_if_cancelled(self, where: str = ""):
+        if self.cancelled:
+            raise OperationCancelled(f"{self.reason} ({where})" if where else self.reason)
+
+    async def guard(self, awaitable: Awaitable[T], where: str = "") -> T:
+        """Await an LLM/search call, abandoning it as soon as the token trips"""
+        if self.cancelled:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            self.raise_if_cancelled(where)
+        task = asyncio.ensure_future(awaitable)
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self._poll_interval)
+                if done:
+                    return task.result()
+                if self.cancelled:
+                    task.cancel()
+                    raise OperationCancelled(f"{self.reason} ({where})" if where else self.reason)
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+def ensure_token(token: Optional[CancellationToken]) -> CancellationToken:
+    """Callers may omit the token; give them one that is never cancelled"""
+    return token if token is not None else CancellationToken()
@@ -0,0 +1,249 @@
+"""
+Cassettes
+Record/replay of every agent LLM and Tavily call, for offline and deterministic pipeline runs
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .section_store import stable_brief
+
+# "record": pass calls through and save them, "replay": answer from the cassette only
+CASSETTE_MODES = ("off", "record", "replay")
+DEFAULT_CASSETTE_DIR = Path("cassettes/default")
+LLM_FILENAME = "llm.jsonl"
+SEARCH_FILENAME = "search.jsonl"
+STREAM_CHUNK_CHARS = 200
+
+# Registry provider names whose metrics provider differs (see llm_metrics.PROVIDER_HINTS)
+METRICS_PROVIDER = {"gpt-3.5": "openai"}
+
+
+class CassetteMiss(RuntimeError):
+    """A replayed request that was never recorded"""
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def llm_request_key(messages: List[Any]) -> str:
+    """sha256 over the (role, content) messages, brief timestamps removed.
+
+    The model is left out on purpose: whichever provider answered while
+    recording, the replayed answer is the same for every stand-in.
+    """
+    return _digest([[getattr(message, "type", type(message).__name__), stable_brief(str(message.content))] for message in messages])
+
+
+def search_request_key(query: str, max_results: Optional[int]) -> str:
+    from .search_cache import normalize_query
+    return _digest({"query": normalize_query(query), "max_results": max_results})
+
+
+class Cassette:
+    """Interactions of one recording: ``llm.jsonl`` and ``search.jsonl`` under ``root``.
+
+    Recording appends one JSON line per completed call (answer, latency,
+    token usage); errors are not recorded. Replay loads both files, later
+    lines winning, and serves them through ``ReplayChatModel`` and
+    ``ReplaySearchTool`` after ``latency``: ``None`` sleeps the recorded
+    latency, a number sleeps that many seconds per call.
+    """
+
+    def __init__(self, root: Path = DEFAULT_CASSETTE_DIR, mode: str = "off", latency: Optional[float] = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {', '.join(CASSETTE_MODES)}")
+        self.root = Path(root)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._llm: Optional[Dict[str, Dict[str, Any]]] = None
+        self._search: Optional[Dict[str, Dict[str, Any]]] = None
+        self.metrics = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _count(self, metric: str):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _append(self, filename: str, entry: Dict[str, Any]):
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / filename, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.metrics["recorded"] += 1
+
+    def _load(self, filename: str) -> Dict[str, Dict[str, Any]]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        path = self.root / filename
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["key"]] = entry
+        return entries
+
+    def _entries(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._llm is None:
+                self._llm = self._load(LLM_FILENAME)
+                self._search = self._load(SEARCH_FILENAME)
+            return self._llm if kind == "llm" else self._search
+
+    def record_llm(self, provider: str, model: str, messages: List[Any], text: str, latency_seconds: float, usage: Optional[Any] = None):
+        if self.recording:
+            self._append(LLM_FILENAME, {
+                "key": llm_request_key(messages),
+                "provider": provider,
+                "model": model,
+                "latencyMs": round(latency_seconds * 1000, 1),
+                "usage": list(usage) if usage else None,
+                "response": text,
+                "recordedAt": time.time(),
+            })
+
+    def record_search(self, query: str, max_results: Optional[int], results: Any, latency_seconds: float):
+        if self.recording and isinstance(results, list):
+            self._append(SEARCH_FILENAME, {
+                "key": search_request_key(query, max_results),
+                "query": query,
+                "latencyMs": round(latency_seconds * 1000, 1),
+                "results": results,
+                "recordedAt": time.time(),
+            })
+
+    def _replay(self, kind: str, key: str, what: str) -> Dict[str, Any]:
+        entry = self._entries(kind).get(key)
+        if entry is None:
+            self._count("misses")
+            raise CassetteMiss(f"No recorded {kind} call for {what} in {self.root}")
+        self._count("replayed")
+        return entry
+
+    def replay_llm(self, messages: List[Any]) -> Dict[str, Any]:
+        return self._replay("llm", llm_request_key(messages), "this prompt")
+
+    def replay_search(self, query: str, max_results: Optional[int]) -> Dict[str, Any]:
+        return self._replay("search", search_request_key(query, max_results), f"query '{query}'")
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        return self.latency if self.latency is not None else entry.get("latencyMs", 0) / 1000
+
+    def recorded_models(self) -> Dict[str, str]:
+        """Metrics provider -> model of every provider that answered while recording"""
+        return {entry["provider"]: entry["model"] for entry in self._entries("llm").values()}
+
+    def chat_model(self, provider: str, temperature: float) -> Optional["ReplayChatModel"]:
+        """Stand-in for ``provider``, or None if it never answered while recording (as with a missing API key)"""
+        recorded_provider = METRICS_PROVIDER.get(provider, provider)
+        model = self.recorded_models().get(recorded_provider)
+        return ReplayChatModel(self, recorded_provider, model, temperature) if model else None
+
+    def summary(self) -> str:
+        with self._lock:
+            metrics = dict(self.metrics)
+        return f"Cassette {self.root} ({self.mode}): {metrics['recorded']} recorded, {metrics['replayed']} replayed, {metrics['misses']} miss(es)"
+
+
+class ReplayChatModel:
+    """Answers ``agenerate`` / ``astream`` from a cassette, like a LangChain chat model.
+
+    ``base_url`` names the recorded provider, so metrics and provider health
+    attribute replayed calls to it.
+    """
+
+    def __init__(self, cassette: Cassette, provider: str, model_name: str, temperature: float):
+        self.cassette = cassette
+        self.base_url = f"cassette://{provider}"
+        self.model_name = model_name
+        self.temperature = temperature
+
+    async def agenerate(self, batches: List[List[Any]]) -> Any:
+        generations = []
+        usage = [0, 0]
+        for messages in batches:
+            entry = self.cassette.replay_llm(messages)
+            await asyncio.sleep(self.cassette.delay(entry))
+            generations.append([SimpleNamespace(text=entry["response"])])
+            for i, count in enumerate(entry.get("usage") or (0, 0)):
+                usage[i] += count
+        return SimpleNamespace(
+            generations=generations,
+            llm_output={"token_usage": {"prompt_tokens": usage[0], "completion_tokens": usage[1]}}
+        )
+
+    async def astream(self, messages: List[Any]) -> AsyncIterator[Any]:
+        """Yields the recorded answer in STREAM_CHUNK_CHARS pieces, spreading the latency over them"""
+        entry = self.cassette.replay_llm(messages)
+        text = entry["response"]
+        chunks = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+        pause = self.cassette.delay(entry) / len(chunks)
+        usage = entry.get("usage")
+        for index, chunk in enumerate(chunks):
+            await asyncio.sleep(pause)
+            last = index == len(chunks) - 1
+            metadata = {"input_tokens": usage[0], "output_tokens": usage[1]} if last and usage else None
+            yield SimpleNamespace(content=chunk, usage_metadata=metadata)
+
+
+class ReplaySearchTool:
+    """Answers ``ainvoke`` / ``invoke`` like the Tavily tool, from a cassette"""
+
+    name = "tavily_search_results_json"
+    description = "Replayed Tavily search results"
+
+    def __init__(self, cassette: Cassette, max_results: int):
+        self.cassette = cassette
+        self.max_results = max_results
+
+    async def ainvoke(self, tool_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        entry = self.cassette.replay_search(tool_input["query"], self.max_results)
+        await asyncio.sleep(self.cassette.delay(entry))
+        return json.loads(json.dumps(entry["results"]))
+
+    def invoke(self, tool_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        entry = self.cassette.replay_search(tool_input["query"], self.max_results)
+        time.sleep(self.cassette.delay(entry))
+        return json.loads(json.dumps(entry["results"]))
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Process-wide cassette from CASSETTE_MODE, CASSETTE_DIR and CASSETTE_LATENCY ("recorded" or seconds)"""
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            latency = os.getenv("CASSETTE_LATENCY", "recorded").lower()
+            _cassette = Cassette(
+                root=Path(os.getenv("CASSETTE_DIR", str(DEFAULT_CASSETTE_DIR))),
+                mode=os.getenv("CASSETTE_MODE", "off").lower(),
+                latency=None if latency == "recorded" else float(latency)
+            )
+        return _cassette
+
+
+def use_cassette(cassette: Cassette) -> Cassette:
+    """Make ``cassette`` the process-wide one (benchmarks; before any agent is built)"""
+    global _cassette
+    with _cassette_lock:
+        _cassette = cassette
+    return cassette
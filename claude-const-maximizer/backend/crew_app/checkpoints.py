@@ -0,0 +1,142 @@
+"""
+Crew Stage Checkpoints
+Per-project task outputs saved as each crew stage finishes, so a retry only reruns the stages that failed
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CHECKPOINT_DIR = Path("crew_checkpoints")
+
+
+def stage_fingerprint(project_name: str, description: str, expected_output: str, upstream: Iterable[str] = ()) -> str:
+    """Key for one stage's output: the project, the task definition and everything it depends on"""
+    digest = hashlib.sha256()
+    for part in (project_name, description, expected_output, *upstream):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class StageCheckpoints:
+    """Stage outputs for one project, stored as crew_checkpoints/<project>.json.
+
+    Each entry remembers the fingerprint it was produced for, so a changed task
+    prompt (or a changed upstream stage) never reuses a stale output.
+    """
+
+    def __init__(self, project_name: str, root: Path = DEFAULT_CHECKPOINT_DIR):
+        self.project_name = project_name
+        slug = re.sub(r"[^a-z0-9]+", "-", project_name.lower()).strip("-") or "project"
+        self.path = Path(root) / f"{slug}.json"
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = self._load()
+        self._mark: Optional[float] = None
+        # Entries reused by the most recent build_crew() call
+        self.reused: List[Dict[str, Any]] = []
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Ignoring unreadable checkpoint file {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._stages, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, stage: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint for a stage if it was produced for this fingerprint"""
+        entry = self._stages.get(stage)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return entry
+        return None
+
+    def start_timer(self):
+        """Mark the start of a crew run; each put() records the time since the previous stage"""
+        self._mark = time.perf_counter()
+
+    def put(self, stage: str, fingerprint: str, output: str):
+        now = time.perf_counter()
+        seconds = now - self._mark if self._mark is not None else 0.0
+        self._mark = now
+        with self._lock:
+            self._stages[stage] = {
+                "fingerprint": fingerprint,
+                "output": output,
+                "seconds": round(seconds, 3),
+                "savedAt": datetime.now().isoformat()
+            }
+            self._save()
+
+    def discard(self, *stages: str):
+        with self._lock:
+            for stage in stages:
+                self._stages.pop(stage, None)
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._stages = {}
+            if self.path.exists():
+                self.path.unlink()
+
+
+def apply_checkpoints(
+    stages: List[Tuple[str, Any]],
+    project_name: str,
+    checkpoints: StageCheckpoints
+) -> Tuple[List[Any], Dict[str, str], List[Dict[str, Any]]]:
+    """Decide which crew tasks still need to run.
+
+    ``stages`` is the ordered (stage name, Task) list. Tasks with a matching
+    checkpoint are dropped; tasks that depended on them get the cached output
+    inlined into their description instead of a context link.
+
+    Returns (tasks to run, fingerprint per stage name, reused checkpoint entries).
+    """
+    fingerprints: Dict[str, str] = {}
+    stage_by_task = {id(task): name for name, task in stages}
+    cached: Dict[str, Dict[str, Any]] = {}
+
+    for name, task in stages:
+        context = task.context if isinstance(task.context, list) else []
+        upstream = [fingerprints[stage_by_task[id(dep)]] for dep in context if id(dep) in stage_by_task]
+        fingerprints[name] = stage_fingerprint(project_name, task.description, task.expected_output, upstream)
+        entry = checkpoints.get(name, fingerprints[name])
+        # A stage is only reusable if everything it depends on was reused too
+        if entry and all(stage_by_task.get(id(dep)) in cached for dep in context):
+            cached[name] = entry
+
+    to_run = []
+    for name, task in stages:
+        if name in cached:
+            continue
+        context = task.context if isinstance(task.context, list) else []
+        reused_deps = [dep for dep in context if stage_by_task.get(id(dep)) in cached]
+        if reused_deps:
+            reused_ids = {id(dep) for dep in reused_deps}
+            task.context = [dep for dep in context if id(dep) not in reused_ids]
+            inlined = "\n\n".join(
+                f"OUTPUT FROM PREVIOUS STAGE ({stage_by_task[id(dep)]}):\n{cached[stage_by_task[id(dep)]]['output']}"
+                for dep in reused_deps
+            )
+            task.description = f"{task.description}\n\n{inlined}"
+        to_run.append(task)
+
+    reused = [{"stage": name, **entry} for name, entry in cached.items()]
+    return to_run, fingerprints, reused
@@ -0,0 +1,153 @@
+"""
+Code Stream
+Incremental fence/filename parser and file writer for streamed code-generation responses
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Lines outside a code block that name the file the next block belongs to
+FILE_HEADER_PREFIXES = ('**File:**', 'File:', '**Filename:**', 'Filename:', '**Path:**', 'Path:')
+
+
+class CodeFenceParser:
+    """Splits an LLM answer into files while it is still arriving.
+
+    ``feed()`` takes chunks of any size and returns the files completed by
+    them (closing fence, next file header); ``close()`` flushes the rest.
+    Only the line being received and the file being collected are buffered,
+    plus the raw text up to the first file - kept so an answer without any
+    file can still be returned as a fallback.
+
+    Line rules are those of ``ClaudeCoder._parse_code_files``, which is
+    implemented on top of this class.
+    """
+
+    def __init__(self):
+        self._partial: List[str] = []
+        self._current_file: Optional[str] = None
+        self._current_content: List[str] = []
+        self._in_code_block = False
+        self._raw: Optional[List[str]] = []
+        self.files_completed = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Files (path, content) completed by this chunk"""
+        if self._raw is not None:
+            self._raw.append(chunk)
+        if '\n' not in chunk:
+            self._partial.append(chunk)
+            return []
+        self._partial.append(chunk)
+        lines = ''.join(self._partial).split('\n')
+        self._partial = [lines.pop()]
+        completed: List[Tuple[str, str]] = []
+        for line in lines:
+            self._line(line, completed)
+        return completed
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Files completed by the end of the answer (the last line has no newline)"""
+        completed: List[Tuple[str, str]] = []
+        self._line(''.join(self._partial), completed)
+        self._partial = []
+        self._save(completed)
+        return completed
+
+    @property
+    def raw_text(self) -> Optional[str]:
+        """Full answer, as long as no file has been completed yet"""
+        return ''.join(self._raw) if self._raw is not None else None
+
+    def _save(self, completed: List[Tuple[str, str]]):
+        if self._current_file and self._current_content:
+            completed.append((self._current_file, '\n'.join(self._current_content)))
+            self.files_completed += 1
+            self._raw = None
+
+    def _line(self, line: str, completed: List[Tuple[str, str]]):
+        # Check for code block markers
+        if line.strip().startswith('```'):
+            if self._in_code_block:
+                # End of code block, save the file
+                self._save(completed)
+                self._current_file = None
+                self._current_content = []
+                self._in_code_block = False
+            else:
+                # Start of code block; ```filename: names the file
+                self._in_code_block = True
+                code_block_line = line.strip()
+                if ':' in code_block_line:
+                    filename = code_block_line.replace('```', '').split(':')[0].strip()
+                    if filename and not filename.startswith('```'):
+                        self._current_file = filename
+            return
+
+        # Check for file path indicators
+        if not self._in_code_block and line.startswith(FILE_HEADER_PREFIXES):
+            self._save(completed)
+            file_path = line
+            for prefix in FILE_HEADER_PREFIXES:
+                file_path = file_path.replace(prefix, '')
+            file_path = file_path.strip()
+            if file_path:
+                self._current_file = file_path
+                self._current_content = []
+            return
+
+        # Add content to current file (outside a block only non-blank lines)
+        if self._current_file and (self._in_code_block or line.strip()):
+            self._current_content.append(line)
+
+
+class GeneratedCodeWriter:
+    """Writes generated files under one directory as they complete.
+
+    Paths from the model are confined to ``root``; each file is written to a
+    temporary name and renamed, so readers never see half a file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.written: Dict[str, Path] = {}
+
+    def _target(self, relative_path: str) -> Optional[Path]:
+        root = self.root.resolve()
+        target = (root / relative_path.strip().lstrip('/\\')).resolve()
+        return target if root in target.parents else None
+
+    def write(self, relative_path: str, content: str) -> Optional[Path]:
+        """Write one file; returns its path, or None if it would land outside root"""
+        target = self._target(relative_path)
+        if target is None:
+            print(f"[WARN] Skipping generated file outside {self.root}: {relative_path}")
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, target)
+        self.written[relative_path] = target
+        return target
+
+    def sync(self, files: Dict[str, str]):
+        """Make ``files`` the final set: rewrite them, drop streamed files that lost (failed or hedged attempts)"""
+        keep = set()
+        for relative_path, content in files.items():
+            target = self.write(relative_path, content)
+            if target is not None:
+                keep.add(target)
+        for target in list(self.written.values()):
+            if target not in keep and target.exists():
+                target.unlink()
+        self.written = {path: target for path, target in self.written.items() if target in keep}
+
+
+def parse_files(text: str) -> Tuple[Dict[str, str], CodeFenceParser]:
+    """Parse a complete answer in one go (later files with the same path win)"""
+    parser = CodeFenceParser()
+    files = dict(parser.feed(text))
+    files.update(parser.close())
+    return files, parser
@@ -1,14 +1,22 @@
 # crew_app/crew.py
 import os
 from pathlib import Path
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process
 from langchain.tools import Tool
-from langchain_community.tools import TavilySearchResults
-from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
 import re
 
+from .cancellation import CancellationToken, ensure_token
+from .checkpoints import StageCheckpoints, apply_checkpoints
+from .providers import get_provider_registry
+from .llm_cache import llm_identity
+from .llm_metrics import get_metrics_store, llm_provider
+from .rate_limiter import get_search_rate_limiter
+from .search_cache import get_search_cache
+from keyword_matcher import KeywordMatcher
+
 # Load environment variables
 load_dotenv()
 
@@ -59,6 +67,34 @@ Always provide:
 5. API documentation
 """
 
+# Project type and domain inferred from the agent output; the first kind with a keyword hit wins
+PROJECT_KIND_KEYWORDS = {
+    "content": ["content", "content creation"],
+    "video": ["video", "storyboard"],
+    "resume": ["resume"],
+    "medical": ["medical"],
+    "voice": ["voice"],
+}
+PROJECT_KINDS = {
+    "content": ('AI-powered content creation tool', 'content creation and marketing'),
+    "video": ('AI-powered video creation tool', 'video production and content creation'),
+    "resume": ('AI-powered resume and cover letter tool', 'career development and recruitment'),
+    "medical": ('AI-powered medical assistant', 'healthcare and medical technology'),
+    "voice": ('AI-powered voice control system', 'smart home and IoT'),
+}
+PROJECT_KIND_MATCHER = KeywordMatcher(PROJECT_KIND_KEYWORDS)
+
+# Document quality markers checked by validate_document_structure()
+DOCUMENT_QUALITY_KEYWORDS = {
+    # Role establishment
+    "role": ["You are an expert", "leading authority", "years of experience", "Fortune 500"],
+    # Psychological warfare elements
+    "psychological": ["time-sensitive", "high-priority", "legendary", "masterpiece", "outperform", "300%"],
+    # Project specificity (not generic)
+    "generic": ["generic", "general", "basic", "simple"],
+}
+DOCUMENT_QUALITY_MATCHER = KeywordMatcher(DOCUMENT_QUALITY_KEYWORDS)
+
 def extract_project_info(raw_output: str) -> Dict[str, str]:
     """
     Extract project information from the raw agent output.
@@ -94,21 +130,9 @@ def extract_project_info(raw_output: str) -> Dict[str, str]:
             project_info['project_name'] = title
     
     # Determine project type and domain based on content
-    if 'content' in raw_output.lower() or 'content creation' in raw_output.lower():
-        project_info['project_type'] = 'AI-powered content creation tool'
-        project_info['domain'] = 'content creation and marketing'
-    elif 'video' in raw_output.lower() or 'storyboard' in raw_output.lower():
-        project_info['project_type'] = 'AI-powered video creation tool'
-        project_info['domain'] = 'video production and content creation'
-    elif 'resume' in raw_output.lower():
-        project_info['project_type'] = 'AI-powered resume and cover letter tool'
-        project_info['domain'] = 'career development and recruitment'
-    elif 'medical' in raw_output.lower():
-        project_info['project_type'] = 'AI-powered medical assistant'
-        project_info['domain'] = 'healthcare and medical technology'
-    elif 'voice' in raw_output.lower():
-        project_info['project_type'] = 'AI-powered voice control system'
-        project_info['domain'] = 'smart home and IoT'
+    project_kind = PROJECT_KIND_MATCHER.first(raw_output)
+    if project_kind:
+        project_info['project_type'], project_info['domain'] = PROJECT_KINDS[project_kind]
     
     # Extract sections using more flexible regex patterns
     sections = {
@@ -289,42 +313,10 @@ def validate_document_structure(output: str) -> bool:
     if not output or len(output.strip()) < 200:
         return False
     
-    # Check for role establishment
-    role_patterns = [
-        r"You are an expert",
-        r"leading authority",
-        r"years of experience",
-        r"Fortune 500"
-    ]
-    
-    # Check for psychological warfare elements
-    psychological_patterns = [
-        r"time-sensitive",
-        r"high-priority",
-        r"legendary",
-        r"masterpiece",
-        r"outperform",
-        r"300%"
-    ]
-    
-    # Check for project specificity (not generic)
-    generic_patterns = [
-        r"generic",
-        r"general",
-        r"basic",
-        r"simple"
-    ]
-    
-    # Must have role establishment
-    has_role = any(re.search(pattern, output, re.IGNORECASE) for pattern in role_patterns)
-    
-    # Must have psychological elements
-    has_psychological = any(re.search(pattern, output, re.IGNORECASE) for pattern in psychological_patterns)
+    hits = DOCUMENT_QUALITY_MATCHER.scan(output)
     
-    # Must NOT be generic
-    is_generic = any(re.search(pattern, output, re.IGNORECASE) for pattern in generic_patterns)
-    
-    return has_role and has_psychological and not is_generic
+    # Must have role establishment and psychological elements, and must NOT be generic
+    return "role" in hits and "psychological" in hits and "generic" not in hits
 
 def passes_rules(text: str) -> bool:
     """
@@ -342,73 +334,157 @@ def passes_rules(text: str) -> bool:
     
     return starts_ok and structure_ok
 
-def kickoff_with_retries(max_retries: int = 3, project_name: str = "AI Application") -> str:
+# Stages rerun after the coordinator output fails passes_rules(); upstream stages come from checkpoints
+RETRY_STAGES = ("coordination", "validation")
+
+# Status store labels and progress range of the crew stages (job_executor reports 20 before and 100 after)
+STAGE_LABELS = {
+    "market_research": "Market Research",
+    "frontend_design": "Frontend Design",
+    "backend_design": "Backend Design",
+    "coordination": "Delivery Coordination",
+    "validation": "Validation",
+}
+STAGE_PROGRESS_START = 20
+STAGE_PROGRESS_END = 95
+
+def kickoff_with_retries(
+    max_retries: int = 3,
+    project_name: str = "AI Application",
+    cancel_token: Optional[CancellationToken] = None,
+    resume: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    project_id: Optional[str] = None,
+    status_store: Optional[Any] = None
+) -> str:
     """
     Run the crew end-to-end and enforce Delivery Coordinator compliance.
     Uses the new expert profile system for guaranteed perfect formatting.
+    cancel_token is checked before each attempt and after every agent step and task;
+    a tripped token raises OperationCancelled.
+    Every finished task is checkpointed, so a retry only reruns the coordinator and
+    validator stages. resume=True also reuses checkpoints left by an earlier run.
+    If a stats dict is passed it is filled with retries, cache hits and time saved.
+    With project_id and status_store, every stage start and finish is reported as progress.
     """
     print(f"🎯 kickoff_with_retries called with project_name: {project_name}")
-    last_output = ""
-    for attempt in range(1, max_retries + 1):
-        print(f"\n=== Crew attempt {attempt}/{max_retries} ===")
-        crew = build_crew()            # build fresh (prevents cached context drift)
-        result = crew.kickoff()        # full sequential run per your Process.sequential
-
-        # CrewAI sometimes returns dict-like results; normalize to string
-        out = result.get("raw", result) if isinstance(result, dict) else str(result)
-        last_output = out
-        print(f"📝 Raw CrewAI output length: {len(out)}")
-
-        # NEW APPROACH: Use expert profile system for guaranteed perfect formatting
-        print(f"🔄 Using expert profile system for project: {project_name}")
-        try:
-            from .expert_profiles import create_perfect_one_page_document
-            processed_output = create_perfect_one_page_document(project_name, out)
-            print(f"✅ Expert profile system processed output (length: {len(processed_output)})")
-        except Exception as e:
-            print(f"❌ Expert profile system failed: {e}")
-            import traceback
-            traceback.print_exc()
-            processed_output = out
-        
-        if passes_rules(processed_output):
-            print(f"✅ Expert profile system generated perfect output on attempt {attempt}.")
-            return processed_output
+    cancel_token = ensure_token(cancel_token)
+    checkpoints = StageCheckpoints(project_name)
+    if not resume:
+        checkpoints.clear()
 
-        print("❌ Expert profile output failed checks. Will retry with a fresh crew...")
+    run_stats = stats if stats is not None else {}
+    run_stats.update({"attempts": 0, "retries": 0, "cacheHits": 0, "timeSavedSeconds": 0.0, "stagesRun": 0})
+    started = time.perf_counter()
+
+    last_output = ""
+    try:
+        for attempt in range(1, max_retries + 1):
+            cancel_token.raise_if_cancelled(f"before crew attempt {attempt}")
+            print(f"\n=== Crew attempt {attempt}/{max_retries} ===")
+            run_stats["attempts"] = attempt
+            run_stats["retries"] = attempt - 1
+
+            crew = build_crew(  # build fresh (prevents cached context drift)
+                cancel_token,
+                project_name=project_name,
+                checkpoints=checkpoints,
+                project_id=project_id,
+                status_store=status_store
+            )
+            reused = checkpoints.reused
+            run_stats["cacheHits"] += len(reused)
+            run_stats["timeSavedSeconds"] += sum(entry.get("seconds", 0.0) for entry in reused)
+            run_stats["stagesRun"] += len(crew.tasks)
+            if reused:
+                print(f"♻️ Reusing checkpointed stages: {', '.join(entry['stage'] for entry in reused)}")
+
+            checkpoints.start_timer()
+            provider, model = llm_provider(llm_identity(getattr(crew.agents[0], "llm", None)))
+            with get_metrics_store().track("crew", provider, model, agent="Crew", section=f"crew attempt {attempt}") as call:
+                result = crew.kickoff()        # sequential run of the stages that are not checkpointed
+                usage = getattr(crew, "usage_metrics", None)
+                if usage is not None:
+                    call.set_tokens(getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
+
+            # CrewAI sometimes returns dict-like results; normalize to string
+            out = result.get("raw", result) if isinstance(result, dict) else str(result)
+            last_output = out
+            print(f"📝 Raw CrewAI output length: {len(out)}")
+
+            # NEW APPROACH: Use expert profile system for guaranteed perfect formatting
+            print(f"🔄 Using expert profile system for project: {project_name}")
+            try:
+                from .expert_profiles import create_perfect_one_page_document
+                processed_output = create_perfect_one_page_document(project_name, out)
+                print(f"✅ Expert profile system processed output (length: {len(processed_output)})")
+            except Exception as e:
+                print(f"❌ Expert profile system failed: {e}")
+                import traceback
+                traceback.print_exc()
+                processed_output = out
+            
+            if passes_rules(processed_output):
+                print(f"✅ Expert profile system generated perfect output on attempt {attempt}.")
+                checkpoints.clear()
+                return processed_output
+
+            print(f"❌ Expert profile output failed checks. Will retry stages: {', '.join(RETRY_STAGES)}...")
+            checkpoints.discard(*RETRY_STAGES)
+    finally:
+        run_stats["timeSavedSeconds"] = round(run_stats["timeSavedSeconds"], 3)
+        run_stats["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+        print(
+            f"[METRICS] Crew run for {project_name}: {run_stats['retries']} retries, "
+            f"{run_stats['cacheHits']} checkpoint hits, ~{run_stats['timeSavedSeconds']:.1f}s saved, "
+            f"{run_stats['elapsedSeconds']:.1f}s elapsed"
+        )
 
     raise RuntimeError(
         "Coordinator failed to satisfy mandatory rules after retries and expert profile processing.\n"
         "Last output (truncated):\n" + (last_output[:800] + ("..." if len(last_output) > 800 else ""))
     )
 
-def build_crew():
+def cached_search_tool(search_tool: Any) -> Tool:
+    """Wrap the Tavily tool so CrewAI searches go through the shared on-disk search cache and rate limit"""
+    cache = get_search_cache()
+    limiter = get_search_rate_limiter()
+    return Tool(
+        name=search_tool.name,
+        description=search_tool.description,
+        func=lambda query: cache.search_sync(search_tool, query, limiter),
+        coroutine=lambda query: cache.search(search_tool, query, limiter)
+    )
+
+def build_crew(
+    cancel_token: Optional[CancellationToken] = None,
+    project_name: str = "AI Application",
+    checkpoints: Optional[StageCheckpoints] = None,
+    project_id: Optional[str] = None,
+    status_store: Optional[Any] = None
+):
     """
     Build the CrewAI crew with optimized agents and tasks for Claude optimization.
+    With checkpoints, stages that already have a matching saved output are left
+    out and each finished task is checkpointed as it completes.
+    With project_id and status_store, the running stage, its agent and the
+    overall progress are written to the status store as each stage starts.
     """
-    
-    # Initialize tools
-    search_tool = TavilySearchResults(max_results=5)
-    duckduckgo_tool = DuckDuckGoSearchAPIWrapper()
-    
-    # Configure Gemini LLM for Delivery Coordinator
-    delivery_coordinator_llm = None
-    google_api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-    
-    if google_api_key:
-        try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            delivery_coordinator_llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-pro",
-                temperature=0.1,  # Low creativity for obedience
-                google_api_key=google_api_key
-            )
-            print("🚀 Using Gemini Pro for Delivery Coordinator")
-        except Exception as e:
-            print(f"⚠️ Failed to configure Gemini for Delivery Coordinator: {e}")
-            delivery_coordinator_llm = None
+    cancel_token = ensure_token(cancel_token)
+    
+    # Borrow warm tools/clients from the process-wide registry (created once, reused by every crew)
+    providers = get_provider_registry()
+    search_tool = providers.tavily_search(max_results=5)
+    if search_tool:
+        search_tool = cached_search_tool(search_tool)
+    duckduckgo_tool = providers.duckduckgo_search()
+    
+    # Configure Gemini LLM for Delivery Coordinator (low creativity for obedience)
+    delivery_coordinator_llm = providers.chat_model("gemini", temperature=0.1)
+    if delivery_coordinator_llm:
+        print("🚀 Using Gemini Pro for Delivery Coordinator")
     else:
-        print("⚠️ GOOGLE_API_KEY/GEMINI_API_KEY not found - using default LLM for Delivery Coordinator")
+        print("⚠️ Gemini not available - using default LLM for Delivery Coordinator")
     
     # Agents with enhanced roles and backstories
     market_researcher = Agent(
@@ -421,7 +497,7 @@ def build_crew():
         directly translated into technical specifications and implementation plans. Your research 
         has been instrumental in launching successful AI applications that have generated millions 
         in revenue.""",
-        tools=[search_tool],
+        tools=[search_tool] if search_tool else [],
         verbose=True,
         allow_delegation=False,
         memory=True
@@ -634,15 +710,67 @@ def build_crew():
         async_execution=False
     )
     
-    # Create crew with optimized task order
     # CORRECT ORDER: Market Research → Frontend → Backend → Coordinator → Validator
+    stages = [
+        ("market_research", market_research_task),
+        ("frontend_design", frontend_design_task),
+        ("backend_design", backend_design_task),
+        ("coordination", coordination_task),
+        ("validation", validation_task),
+    ]
+    if checkpoints is not None:
+        tasks, fingerprints, reused = apply_checkpoints(stages, project_name, checkpoints)
+    else:
+        tasks, fingerprints, reused = [task for _, task in stages], {}, []
+    stage_names = {id(task): name for name, task in stages}
+    completed = []
+    metrics = get_metrics_store()
+    stage_clock = [time.perf_counter()]
+
+    def report_progress():
+        """Status of the next scheduled task (or of the finished crew); checkpointed stages count as done"""
+        if project_id is None or status_store is None:
+            return
+        done = len(stages) - len(tasks) + len(completed)
+        progress = STAGE_PROGRESS_START + (STAGE_PROGRESS_END - STAGE_PROGRESS_START) * done // len(stages)
+        if len(completed) < len(tasks):
+            task = tasks[len(completed)]
+            fields = {"currentTask": STAGE_LABELS[stage_names[id(task)]], "activeAgents": [task.agent.role]}
+        else:
+            fields = {"currentTask": "Finalizing document", "activeAgents": []}
+        try:
+            status_store.update(project_id, progress=progress, **fields)
+        except Exception as e:
+            print(f"⚠️ Could not report crew progress for {project_name}: {e}")
+
+    def on_task_complete(output):
+        # Tasks finish in order, so the n-th callback belongs to the n-th scheduled task
+        task = tasks[len(completed)]
+        completed.append(task)
+        name = stage_names[id(task)]
+        now = time.perf_counter()
+        provider, model = llm_provider(llm_identity(getattr(task.agent, "llm", None)))
+        metrics.log("crew_stage", (now - stage_clock[0]) * 1000, provider, model, agent=task.agent.role, section=name)
+        stage_clock[0] = now
+        if checkpoints is not None:
+            checkpoints.put(name, fingerprints[name], getattr(output, "raw", str(output)))
+        report_progress()
+        cancel_token.raise_if_cancelled("task boundary")
+    
+    # Create crew with optimized task order
     crew = Crew(
         agents=[market_researcher, frontend_engineer, backend_engineer, delivery_coordinator, rule_enforcer],
-        tasks=[market_research_task, frontend_design_task, backend_design_task, coordination_task, validation_task],
+        tasks=tasks,
         process=Process.sequential,  # Use sequential instead of hierarchical
-        verbose=True
+        verbose=True,
+        # Cancellation boundaries: after every agent step (LLM/tool call) and every task
+        step_callback=lambda step: cancel_token.raise_if_cancelled("agent step"),
+        task_callback=on_task_complete
         # Note: max_iter parameter removed as it's not available in this CrewAI version
     )
+    if checkpoints is not None:
+        checkpoints.reused = reused
+    report_progress()  # the first scheduled task starts with kickoff()
     
     return crew
 
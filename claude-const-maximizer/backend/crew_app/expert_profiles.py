@@ -7,6 +7,8 @@ Maps project names to ideal expert profiles for role establishment in the 1-page
 import re
 from typing import Dict, Tuple
 
+from keyword_matcher import KeywordMatcher
+
 # Expert profile mappings based on project categories
 EXPERT_PROFILES = {
     # Voice AI & Personal Assistant (01_voice_ai_personal_assistant) - 6 projects
@@ -194,54 +196,54 @@ ALL_60_PROJECTS = {
     ]
 }
 
-def detect_project_category(project_name: str) -> str:
-    """
-    Detect the project category based on the project name.
-    Returns the category key for expert profile mapping.
-    """
-    project_name_lower = project_name.lower()
-    
-    # First, try exact matches with the 60 project names
-    for category, projects in ALL_60_PROJECTS.items():
-        for project in projects:
-            if project.lower() in project_name_lower or project_name_lower in project.lower():
-                return category
-    
-    # Fallback to keyword-based detection
+# Keyword fallback for names outside the 60 projects; the first category with a hit wins
+CATEGORY_KEYWORDS = {
     # Voice AI & Personal Assistant
-    if any(keyword in project_name_lower for keyword in ["voice", "assistant", "calendar", "smart home", "meeting", "task manager", "health coach", "storybook"]):
-        return "voice"
-    
+    "voice": ["voice", "assistant", "calendar", "smart home", "meeting", "task manager", "health coach", "storybook"],
     # Multi-Agent CrewAI
-    if any(keyword in project_name_lower for keyword in ["crew", "agent", "multi-agent", "orchestration", "research", "cybersecurity", "market research", "content creation", "software development", "learning", "brain"]):
-        return "crewai"
-    
+    "crewai": ["crew", "agent", "multi-agent", "orchestration", "research", "cybersecurity", "market research", "content creation", "software development", "learning", "brain"],
     # RAG Document Processing
-    if any(keyword in project_name_lower for keyword in ["rag", "document", "knowledge", "retrieval", "search", "resume", "legal", "pdf", "classification", "vector"]):
-        return "rag"
-    
+    "rag": ["rag", "document", "knowledge", "retrieval", "search", "resume", "legal", "pdf", "classification", "vector"],
     # Creative AI Content Generation
-    if any(keyword in project_name_lower for keyword in ["content", "creative", "video", "image", "writing", "social media", "podcast", "marketing", "portfolio", "story"]):
-        return "content"
-    
+    "content": ["content", "creative", "video", "image", "writing", "social media", "podcast", "marketing", "portfolio", "story"],
     # Healthcare Medical AI
-    if any(keyword in project_name_lower for keyword in ["health", "medical", "clinical", "patient", "diagnosis", "treatment", "wellness", "monitoring"]):
-        return "healthcare"
-    
+    "healthcare": ["health", "medical", "clinical", "patient", "diagnosis", "treatment", "wellness", "monitoring"],
     # Business E-commerce
-    if any(keyword in project_name_lower for keyword in ["ecommerce", "business", "commerce", "shop", "store", "retail", "payment", "financial", "analytics", "crm", "supply chain", "inventory"]):
-        return "ecommerce"
-    
+    "ecommerce": ["ecommerce", "business", "commerce", "shop", "store", "retail", "payment", "financial", "analytics", "crm", "supply chain", "inventory"],
     # Developer Tools Code Analysis
-    if any(keyword in project_name_lower for keyword in ["developer", "code", "analysis", "tool", "debug", "testing", "review", "refactoring", "security", "contract", "productivity"]):
-        return "developer"
-    
+    "developer": ["developer", "code", "analysis", "tool", "debug", "testing", "review", "refactoring", "security", "contract", "productivity"],
     # Web API Integration
-    if any(keyword in project_name_lower for keyword in ["api", "integration", "web", "service", "microservice", "scraping", "data", "monitoring", "alerting"]):
-        return "api"
+    "api": ["api", "integration", "web", "service", "microservice", "scraping", "data", "monitoring", "alerting"],
+}
+
+_CATEGORY_ORDER = {category: index for index, category in enumerate(ALL_60_PROJECTS)}
+# Project names found inside the given name
+_PROJECT_NAME_MATCHER = KeywordMatcher(ALL_60_PROJECTS)
+# Given name found inside a project name: one substring search per category
+_PROJECT_NAMES_BY_CATEGORY = {
+    category: "\n".join(project.lower() for project in projects)
+    for category, projects in ALL_60_PROJECTS.items()
+}
+_CATEGORY_KEYWORD_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS)
+
+def detect_project_category(project_name: str) -> str:
+    """
+    Detect the project category based on the project name.
+    Returns the category key for expert profile mapping.
+    """
+    project_name_lower = project_name.lower()
+    
+    # First, try exact matches with the 60 project names (either name containing the other)
+    candidates = [
+        _PROJECT_NAME_MATCHER.first(project_name_lower),
+        next((category for category, names in _PROJECT_NAMES_BY_CATEGORY.items() if project_name_lower in names), None)
+    ]
+    candidates = [category for category in candidates if category]
+    if candidates:
+        return min(candidates, key=_CATEGORY_ORDER.get)
     
-    # Default to content generation if no specific category is detected
-    return "content"
+    # Fallback to keyword-based detection, defaulting to content generation
+    return _CATEGORY_KEYWORD_MATCHER.first(project_name_lower, default="content")
 
 def get_expert_profile(project_name: str) -> Dict[str, str]:
     """
@@ -0,0 +1,208 @@
+"""
+LLM Response Cache
+Content-addressed on-disk cache of chat completions shared by the Phase 3 agents
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .cassettes import get_cassette
+from .llm_metrics import CallRecord, estimate_tokens, get_metrics_store, llm_provider
+from .provider_health import get_provider_health
+from .rate_limiter import get_provider_concurrency
+from .ttl_cache import SQLiteTTLCache
+
+DEFAULT_CACHE_DIR = Path("llm_cache")
+CACHE_FILENAME = "responses.db"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+# Streamed answers longer than this are passed through but not cached, so streaming stays bounded
+MAX_STREAM_CACHE_CHARS = 256 * 1024
+
+
+def llm_identity(llm: Any) -> Dict[str, Any]:
+    """Settings that change what a chat model answers (class, endpoint, model, sampling)"""
+    return {
+        "class": type(llm).__name__,
+        "endpoint": getattr(llm, "openai_api_base", None) or getattr(llm, "base_url", None),
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None) or getattr(llm, "model_id", None),
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens": getattr(llm, "max_tokens", None) or getattr(llm, "max_output_tokens", None),
+    }
+
+
+def cache_key(llm: Any, messages: List[Any]) -> str:
+    """sha256 over the model settings and every (role, content) message"""
+    payload = {
+        "llm": llm_identity(llm),
+        "messages": [[getattr(message, "type", type(message).__name__), message.content] for message in messages],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(SQLiteTTLCache):
+    """Chat completions keyed by hash(model settings, system + human messages).
+
+    Stored in SQLite (llm_cache/responses.db) so every agent and worker process
+    shares it, with the expiry and LRU eviction of ``SQLiteTTLCache``.
+
+    Only answers passing the caller's ``accept`` check are stored, so error
+    strings and fallback responses never get replayed.
+    """
+
+    NAME = "LLM cache"
+    TABLE = "llm_responses"
+    LABEL_COLUMN = "model"
+    VALUE_COLUMN = "response"
+    EXTRA_METRICS = ("rejected", "oversized")
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        mode: str = "on"
+    ):
+        self.cache_dir = Path(cache_dir)
+        super().__init__(self.cache_dir / CACHE_FILENAME, max_bytes, ttl_seconds, mode)
+
+    async def generate(self, llm: Any, messages: List[Any], accept: Optional[Callable[[str], bool]] = None) -> str:
+        """Text of ``llm.agenerate([messages])``, served from the cache when possible.
+
+        LLM errors propagate to the caller (nothing is cached). A fresh answer
+        is stored only if it is non-empty and ``accept(text)`` is true.
+        Every call - cache hits included - is recorded in the LLM metrics store
+        and, when recording, the cassette.
+        """
+        identity = llm_identity(llm)
+        provider, model = llm_provider(identity)
+        with get_metrics_store().track("llm", provider, model) as call:
+            if self.mode == "off":
+                self._count("bypassed")
+                return await self._agenerate(llm, messages, call)
+
+            key = cache_key(llm, messages)
+            if self.mode == "on":
+                cached = self.get(key)
+                if cached is not None:
+                    call.outcome = "cache_hit"
+                    get_cassette().record_llm(provider, model, messages, cached, 0.0)
+                    return cached
+
+            text = await self._agenerate(llm, messages, call)
+            if text and (accept is None or accept(text)):
+                self.put(key, str(identity["model"]), text)
+            else:
+                self._count("rejected")
+                call.outcome = "rejected"
+            return text
+
+    @staticmethod
+    async def _agenerate(llm: Any, messages: List[Any], call: CallRecord) -> str:
+        health = get_provider_health()
+        health.before_call(call.provider)
+        async with get_provider_concurrency().hold_async(call.provider):
+            started = time.perf_counter()
+            try:
+                response = await llm.agenerate([messages])
+            except Exception:
+                health.record_failure(call.provider)
+                raise
+            elapsed = time.perf_counter() - started
+        health.record_success(call.provider, elapsed)
+        text = response.generations[0][0].text
+        call.tokens_from(response, "\n".join(str(message.content) for message in messages), text)
+        usage = None if call.tokens_estimated else (call.prompt_tokens, call.completion_tokens)
+        get_cassette().record_llm(call.provider, call.model, messages, text, elapsed, usage)
+        return text
+
+    async def stream(self, llm: Any, messages: List[Any], accept: Optional[Callable[[str], bool]] = None) -> AsyncIterator[str]:
+        """Text chunks of ``llm.astream(messages)``; a cached answer is replayed as a single chunk.
+
+        Chunks are only collected while the cache or cassette is in use, to
+        store the finished answer under the same rules as ``generate``. With
+        the cache alone that buffer is capped at MAX_STREAM_CACHE_CHARS: a
+        longer answer is dropped from memory and not cached. A recording
+        cassette needs the whole answer, so it buffers without a cap.
+        """
+        identity = llm_identity(llm)
+        provider, model = llm_provider(identity)
+        with get_metrics_store().track("llm", provider, model) as call:
+            key = None
+            if self.mode == "off":
+                self._count("bypassed")
+            else:
+                key = cache_key(llm, messages)
+                if self.mode == "on":
+                    cached = self.get(key)
+                    if cached is not None:
+                        call.outcome = "cache_hit"
+                        get_cassette().record_llm(provider, model, messages, cached, 0.0)
+                        yield cached
+                        return
+
+            cassette = get_cassette()
+            chunks: Optional[List[str]] = [] if key is not None or cassette.recording else None
+            received, usage = 0, None
+            health = get_provider_health()
+            health.before_call(provider)
+            async with get_provider_concurrency().hold_async(provider):
+                started = time.perf_counter()
+                try:
+                    async for chunk in llm.astream(messages):
+                        metadata = getattr(chunk, "usage_metadata", None)
+                        if metadata:
+                            usage = (int(metadata.get("input_tokens") or 0), int(metadata.get("output_tokens") or 0))
+                        text = chunk.content if isinstance(chunk.content, str) else str(chunk.content or "")
+                        if not text:
+                            continue
+                        received += len(text)
+                        if chunks is not None:
+                            chunks.append(text)
+                            if received > MAX_STREAM_CACHE_CHARS and not cassette.recording:
+                                chunks = None
+                                self._count("oversized")
+                        yield text
+                except Exception:
+                    health.record_failure(provider)
+                    raise
+                elapsed = time.perf_counter() - started
+            health.record_success(provider, elapsed)
+
+            if usage is not None:
+                call.set_tokens(*usage)
+            else:
+                prompt_text = "\n".join(str(message.content) for message in messages)
+                call.set_tokens(estimate_tokens(prompt_text), (received + 3) // 4, estimated=True)
+            if chunks is not None:
+                cassette.record_llm(provider, model, messages, "".join(chunks), elapsed, usage)
+            if key is not None and chunks is not None:
+                text = "".join(chunks)
+                if text and (accept is None or accept(text)):
+                    self.put(key, str(identity["model"]), text)
+                else:
+                    self._count("rejected")
+                    call.outcome = "rejected"
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache configured from LLM_CACHE_MODE, LLM_CACHE_MAX_MB and LLM_CACHE_TTL_HOURS"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                cache_dir=Path(os.getenv("LLM_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_SECONDS / 3600)) * 3600,
+                mode=os.getenv("LLM_CACHE_MODE", "on").lower()
+            )
+        return _cache
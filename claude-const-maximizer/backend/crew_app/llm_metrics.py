@@ -0,0 +1,388 @@
+"""
+LLM Call Metrics
+Per-call latency, token, cost and outcome records for every LLM, search and crew stage call
+"""
+
+import asyncio
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cancellation import OperationCancelled
+from .sqlite_utils import ThreadLocalConnections
+
+DEFAULT_DB_PATH = Path("llm_metrics.db")
+
+# Bounded call log: every PRUNE_EVERY inserts, rows past the newest max_rows or older than max_age are deleted
+DEFAULT_MAX_ROWS = 100000
+DEFAULT_RETENTION_DAYS = 30
+PRUNE_EVERY = 1000
+
+# USD per 1M (prompt, completion) tokens; the first model prefix that matches wins
+MODEL_PRICES: List[Tuple[str, Tuple[float, float]]] = [
+    ("deepseek", (0.27, 1.10)),
+    ("gpt-4o-mini", (0.15, 0.60)),
+    ("gpt-4o", (2.50, 10.00)),
+    ("gpt-4", (30.00, 60.00)),
+    ("gpt-3.5", (0.50, 1.50)),
+    ("gemini-1.5-flash", (0.075, 0.30)),
+    ("gemini", (1.25, 5.00)),
+    ("mistral-large", (2.00, 6.00)),
+    ("mistral", (0.25, 0.25)),
+]
+
+# Endpoint / model fragments identifying the provider behind an OpenAI-compatible client
+PROVIDER_HINTS = [
+    ("deepseek", "deepseek"),
+    ("gemini", "gemini"),
+    ("huggingface", "huggingface"),
+    ("mistral", "mistral"),
+    ("gpt", "openai"),
+    ("openai", "openai"),
+]
+
+OUTCOMES = ("ok", "error", "cancelled", "rejected", "cache_hit")
+
+# Who is calling: project, agent and pipeline section, set with metrics_scope()
+_scope: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("llm_metrics_scope", default={})
+
+
+@contextmanager
+def metrics_scope(**fields: Optional[str]) -> Iterator[Dict[str, str]]:
+    """Attribute every call recorded inside the block to project_id / agent / section.
+
+    Scopes nest (inner fields override outer ones) and follow asyncio tasks,
+    since tasks copy the context they were created in.
+    """
+    scope = {**_scope.get(), **{key: value for key, value in fields.items() if value is not None}}
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def current_scope() -> Dict[str, str]:
+    return dict(_scope.get())
+
+
+def model_price(model: Optional[str]) -> Tuple[float, float]:
+    model = (model or "").lower()
+    for prefix, price in MODEL_PRICES:
+        if prefix in model:
+            return price
+    return (0.0, 0.0)
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = model_price(model)
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def llm_provider(identity: Dict[str, Any]) -> Tuple[str, str]:
+    """(provider, model) for an ``llm_identity()`` dict, read from class, endpoint and model name"""
+    model = str(identity["model"] or "unknown")
+    haystack = f"{identity['class']} {identity['endpoint'] or ''} {model}".lower()
+    for hint, provider in PROVIDER_HINTS:
+        if hint in haystack:
+            return provider, model
+    return identity["class"].lower(), model
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for providers that report no usage"""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def token_usage(response: Any) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens reported by a LangChain LLMResult, if any"""
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage.get("prompt_tokens") is not None or usage.get("completion_tokens") is not None:
+        return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0)
+    try:
+        metadata = response.generations[0][0].message.usage_metadata or {}
+    except (AttributeError, IndexError, TypeError):
+        metadata = {}
+    if metadata:
+        return int(metadata.get("input_tokens") or 0), int(metadata.get("output_tokens") or 0)
+    return None
+
+
+class CallRecord:
+    """One tracked call; fill in tokens / outcome while the track() block runs"""
+
+    def __init__(self, kind: str, provider: str, model: str, scope: Dict[str, str]):
+        self.kind = kind
+        self.provider = provider
+        self.model = model
+        self.scope = scope
+        self.started_at = time.time()
+        self.latency_ms = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.tokens_estimated = False
+        self.outcome = "ok"
+        self.error: Optional[str] = None
+
+    def set_tokens(self, prompt_tokens: int, completion_tokens: int, estimated: bool = False):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.tokens_estimated = estimated
+
+    def tokens_from(self, response: Any, prompt_text: str, completion_text: str):
+        """Use the usage reported in ``response``, else estimate from the texts"""
+        usage = token_usage(response)
+        if usage is not None:
+            self.set_tokens(*usage)
+        else:
+            self.set_tokens(estimate_tokens(prompt_text), estimate_tokens(completion_text), estimated=True)
+
+    @property
+    def cost_usd(self) -> float:
+        if self.outcome == "cache_hit":
+            return 0.0
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+class MetricsStore:
+    """Call records in SQLite (llm_metrics.db), shared by the agents, crew workers and the API.
+
+    ``track()`` times a block and writes one row when it exits, so an
+    exception inside it is recorded as an error (or as cancelled) and then
+    re-raised. Recording never breaks the call being measured.
+
+    The table keeps at most ``max_rows`` calls from the last
+    ``max_age_seconds`` (0 disables either bound).
+    """
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        enabled: bool = True,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_age_seconds: float = DEFAULT_RETENTION_DAYS * 24 * 3600
+    ):
+        self.db_path = Path(db_path)
+        self.enabled = enabled
+        self.max_rows = max_rows
+        self.max_age_seconds = max_age_seconds
+        self._db = ThreadLocalConnections(self.db_path)
+        if enabled:
+            self._init_schema()
+
+    def _init_schema(self):
+        conn = self._db.connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_calls ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " project_id TEXT,"
+            " agent TEXT,"
+            " section TEXT,"
+            " kind TEXT NOT NULL,"
+            " provider TEXT,"
+            " model TEXT,"
+            " started_at REAL NOT NULL,"
+            " latency_ms REAL NOT NULL,"
+            " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+            " completion_tokens INTEGER NOT NULL DEFAULT 0,"
+            " tokens_estimated INTEGER NOT NULL DEFAULT 0,"
+            " cost_usd REAL NOT NULL DEFAULT 0,"
+            " outcome TEXT NOT NULL,"
+            " error TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_project ON llm_calls (project_id, started_at)")
+
+    @contextmanager
+    def track(self, kind: str, provider: str = "", model: str = "", **scope: Optional[str]) -> Iterator[CallRecord]:
+        """Time the block as one ``kind`` call ("llm", "search", "crew_stage", "crew")"""
+        with metrics_scope(**scope) as fields:
+            call = CallRecord(kind, provider, model, fields)
+        start = time.perf_counter()
+        try:
+            yield call
+        except (asyncio.CancelledError, OperationCancelled, GeneratorExit, Exception) as e:
+            call.outcome = "error" if isinstance(e, Exception) else "cancelled"
+            call.error = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            call.latency_ms = (time.perf_counter() - start) * 1000
+            self.record(call)
+
+    def log(self, kind: str, latency_ms: float, provider: str = "", model: str = "", outcome: str = "ok",
+            prompt_tokens: int = 0, completion_tokens: int = 0, **scope: Optional[str]):
+        """Record a call that was timed elsewhere (e.g. in a CrewAI task callback)"""
+        with metrics_scope(**scope) as fields:
+            call = CallRecord(kind, provider, model, fields)
+        call.started_at -= latency_ms / 1000
+        call.latency_ms = latency_ms
+        call.outcome = outcome
+        call.set_tokens(prompt_tokens, completion_tokens)
+        self.record(call)
+
+    def record(self, call: CallRecord):
+        if not self.enabled:
+            return
+        try:
+            conn = self._db.connect()
+            cursor = conn.execute(
+                "INSERT INTO llm_calls (project_id, agent, section, kind, provider, model, started_at, latency_ms,"
+                " prompt_tokens, completion_tokens, tokens_estimated, cost_usd, outcome, error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    call.scope.get("project_id"), call.scope.get("agent"), call.scope.get("section"),
+                    call.kind, call.provider, call.model, call.started_at, round(call.latency_ms, 2),
+                    call.prompt_tokens, call.completion_tokens, int(call.tokens_estimated),
+                    round(call.cost_usd, 6), call.outcome, call.error
+                )
+            )
+            if cursor.lastrowid % PRUNE_EVERY == 0:
+                self._prune(conn, cursor.lastrowid)
+        except sqlite3.Error as e:
+            print(f"[WARN] Could not record LLM metrics: {e}")
+
+    def _prune(self, conn: sqlite3.Connection, last_id: int):
+        if self.max_rows > 0:
+            conn.execute("DELETE FROM llm_calls WHERE id <= ?", (last_id - self.max_rows,))
+        if self.max_age_seconds > 0:
+            conn.execute("DELETE FROM llm_calls WHERE started_at < ?", (time.time() - self.max_age_seconds,))
+
+    def recent(self, project_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Newest call records first"""
+        if not self.enabled:
+            return []
+        conn = self._db.connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            if project_id:
+                rows = conn.execute(
+                    "SELECT * FROM llm_calls WHERE project_id = ? ORDER BY id DESC LIMIT ?", (project_id, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM llm_calls ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            conn.row_factory = None
+        return [dict(row) for row in rows]
+
+    def latency_quantile(self, section: str, quantile: float = 0.9, kind: str = "llm",
+                         window: int = 100, min_samples: int = 5) -> Optional[float]:
+        """Latency (ms) at ``quantile`` over the last ``window`` successful calls of a section.
+
+        None until ``min_samples`` calls have been recorded.
+        """
+        if not self.enabled:
+            return None
+        rows = self._db.connect().execute(
+            "SELECT latency_ms FROM llm_calls WHERE section = ? AND kind = ? AND outcome = 'ok'"
+            " ORDER BY id DESC LIMIT ?",
+            (section, kind, window)
+        ).fetchall()
+        if len(rows) < min_samples:
+            return None
+        latencies = sorted(row[0] for row in rows)
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+    def summary(self, project_id: Optional[str] = None, since: Optional[float] = None, slowest: int = 5) -> Dict[str, Any]:
+        """Totals, then breakdowns by section, provider and outcome (one project or all, optionally since a time.time()).
+
+        Crew stage rows are spans inside a "crew" row, so they only show up in
+        bySection / byKind and are left out of the totals.
+        """
+        if not self.enabled:
+            return {"calls": 0}
+        conditions, params = [], ()
+        if project_id:
+            conditions.append("project_id = ?")
+            params += (project_id,)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params += (since,)
+        conn = self._db.connect()
+        aggregates = (
+            "COUNT(*), COALESCE(SUM(latency_ms), 0), COALESCE(MAX(latency_ms), 0),"
+            " COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0), COALESCE(SUM(cost_usd), 0)"
+        )
+
+        def where(*extra: str) -> str:
+            clauses = conditions + list(extra)
+            return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        def totals(row) -> Dict[str, Any]:
+            calls, latency, max_latency, prompt_tokens, completion_tokens, cost = row
+            return {
+                "calls": calls,
+                "totalLatencyMs": round(latency, 1),
+                "avgLatencyMs": round(latency / calls, 1) if calls else 0.0,
+                "maxLatencyMs": round(max_latency, 1),
+                "promptTokens": prompt_tokens,
+                "completionTokens": completion_tokens,
+                "costUsd": round(cost, 6),
+            }
+
+        def grouped(column: str, *extra: str) -> Dict[str, Dict[str, Any]]:
+            rows = conn.execute(
+                f"SELECT COALESCE({column}, 'unknown'), {aggregates} FROM llm_calls {where(*extra)}"
+                f" GROUP BY 1 ORDER BY SUM(latency_ms) DESC",
+                params
+            ).fetchall()
+            return {row[0]: totals(row[1:]) for row in rows}
+
+        calls = "kind != 'crew_stage'"
+        summary = totals(conn.execute(f"SELECT {aggregates} FROM llm_calls {where(calls)}", params).fetchone())
+        if project_id:
+            summary["projectId"] = project_id
+        summary["bySection"] = grouped("section", "kind != 'crew'")
+        summary["byProvider"] = grouped("provider", calls)
+        summary["byKind"] = grouped("kind")
+        summary["outcomes"] = dict(conn.execute(
+            f"SELECT outcome, COUNT(*) FROM llm_calls {where(calls)} GROUP BY outcome", params
+        ).fetchall())
+        summary["slowestCalls"] = [
+            {"agent": agent, "section": section, "kind": kind, "provider": provider, "model": model,
+             "latencyMs": round(latency, 1), "outcome": outcome}
+            for agent, section, kind, provider, model, latency, outcome in conn.execute(
+                f"SELECT agent, section, kind, provider, model, latency_ms, outcome FROM llm_calls {where(calls)}"
+                f" ORDER BY latency_ms DESC LIMIT ?",
+                (*params, slowest)
+            ).fetchall()
+        ]
+        return summary
+
+    def format_summary(self, project_id: Optional[str] = None, since: Optional[float] = None) -> str:
+        summary = self.summary(project_id, since=since)
+        if not summary["calls"]:
+            return "LLM metrics: no calls recorded"
+        return (
+            f"LLM metrics: {summary['calls']} call(s), {summary['totalLatencyMs'] / 1000:.1f}s total, "
+            f"{summary['promptTokens'] + summary['completionTokens']} tokens, ~${summary['costUsd']:.4f}"
+        )
+
+    def clear(self, project_id: Optional[str] = None):
+        if not self.enabled:
+            return
+        if project_id:
+            self._db.connect().execute("DELETE FROM llm_calls WHERE project_id = ?", (project_id,))
+        else:
+            self._db.connect().execute("DELETE FROM llm_calls")
+
+
+_store: Optional[MetricsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """Process-wide store at LLM_METRICS_DB, bounded by LLM_METRICS_MAX_ROWS / LLM_METRICS_RETENTION_DAYS (LLM_METRICS=off disables it)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetricsStore(
+                db_path=Path(os.getenv("LLM_METRICS_DB", str(DEFAULT_DB_PATH))),
+                enabled=os.getenv("LLM_METRICS", "on").lower() != "off",
+                max_rows=int(os.getenv("LLM_METRICS_MAX_ROWS", DEFAULT_MAX_ROWS)),
+                max_age_seconds=float(os.getenv("LLM_METRICS_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)) * 24 * 3600
+            )
+        return _store
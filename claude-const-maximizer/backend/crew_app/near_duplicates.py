@@ -0,0 +1,134 @@
+"""
+Near Duplicates
+SimHash clustering of search results, so syndicated and mirrored articles reach the analysis prompt once
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from .llm_metrics import estimate_tokens
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 2
+# Hamming distance at or below which two results count as the same article; copies with a
+# few words changed land around 5-10 bits apart, unrelated snippets rarely below 15
+DEFAULT_MAX_DISTANCE = 8
+
+
+def _shingles(text: str) -> List[str]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word bigrams (near-identical texts differ in few bits)"""
+    weights = [0] * SIMHASH_BITS
+    for shingle in _shingles(text):
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def result_text(result: Dict[str, Any]) -> str:
+    return f"{result.get('title', '')}\n{result.get('content', '')}"
+
+
+def result_tokens(result: Dict[str, Any]) -> int:
+    """Tokens a result adds to the research summary (title, URL and content)"""
+    return estimate_tokens(f"{result.get('title', '')}\n{result.get('url', '')}\n{result.get('content', '')}")
+
+
+@dataclass
+class DedupeReport:
+    results_in: int = 0
+    url_duplicates: int = 0
+    near_duplicates: int = 0
+    clusters: int = 0
+    tokens_saved: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "resultsIn": self.results_in,
+            "urlDuplicatesDropped": self.url_duplicates,
+            "nearDuplicatesDropped": self.near_duplicates,
+            "nearDuplicateClusters": self.clusters,
+            "promptTokensSaved": self.tokens_saved,
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.url_duplicates} same-URL and {self.near_duplicates} near-duplicate result(s) dropped "
+            f"of {self.results_in} ({self.clusters} cluster(s)); near-duplicates would have cost ~{self.tokens_saved} prompt tokens"
+        )
+
+
+def _rank(result: Dict[str, Any], index: int) -> Tuple[float, int, int]:
+    """Best representative first: search score, then longer content, then earlier arrival"""
+    return (-float(result.get("score") or 0.0), -len(result.get("content") or ""), index)
+
+
+def dedupe_results(results: List[Dict[str, Any]], max_distance: int = DEFAULT_MAX_DISTANCE) -> Tuple[List[Dict[str, Any]], DedupeReport]:
+    """Drop same-URL results, then cluster the rest by SimHash distance <= ``max_distance``.
+
+    Linear in the number of results: each hash is split into
+    ``max_distance + 1`` bands, and by the pigeonhole principle two hashes
+    within that distance agree exactly on at least one band, so only
+    results sharing a band bucket are compared. Each cluster keeps its
+    highest-scoring member (``near_duplicates`` counts the others); order
+    follows the first arrival of each kept result. ``max_distance < 0``
+    only removes same-URL results.
+    """
+    report = DedupeReport(results_in=len(results))
+    unique: List[Dict[str, Any]] = []
+    seen_urls = set()
+    for result in results:
+        url = result.get("url", "")
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            unique.append(result)
+        else:
+            report.url_duplicates += 1
+    if max_distance < 0 or len(unique) < 2:
+        return unique, report
+
+    bands = min(max_distance + 1, SIMHASH_BITS)
+    edges = [band * SIMHASH_BITS // bands for band in range(bands + 1)]
+    hashes = [simhash(result_text(result)) for result in unique]
+    parent = list(range(len(unique)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    for i, value in enumerate(hashes):
+        if not _shingles(result_text(unique[i])):
+            continue  # nothing to compare
+        for band in range(bands):
+            bits = value >> edges[band] & ((1 << (edges[band + 1] - edges[band])) - 1)
+            bucket = buckets.setdefault((band, bits), [])
+            for j in bucket:
+                if find(i) != find(j) and bin(hashes[i] ^ hashes[j]).count("1") <= max_distance:
+                    parent[find(i)] = find(j)
+            bucket.append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(unique)):
+        clusters.setdefault(find(i), []).append(i)
+    keep = set()
+    for members in clusters.values():
+        best = min(members, key=lambda i: _rank(unique[i], i))
+        keep.add(best)
+        if len(members) > 1:
+            report.clusters += 1
+            report.near_duplicates += len(members) - 1
+            report.tokens_saved += sum(result_tokens(unique[i]) for i in members if i != best)
+            unique[best]["near_duplicates"] = len(members) - 1
+    return [result for i, result in enumerate(unique) if i in keep], report
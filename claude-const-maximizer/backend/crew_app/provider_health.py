@@ -0,0 +1,191 @@
+"""
+Provider Health
+Per-provider circuit breakers and health scores that order the agents' LLM fallback chains
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+WINDOW_SIZE = 20                # rolling window of call outcomes per provider
+MIN_CALLS = 5                   # calls needed before the error rate can open the circuit
+ERROR_RATE_THRESHOLD = 0.5
+CONSECUTIVE_FAILURES = 3        # opens the circuit regardless of the window
+COOLDOWN_SECONDS = 30.0         # first wait before a half-open probe, doubled per failed probe
+MAX_COOLDOWN_SECONDS = 300.0
+LATENCY_ALPHA = 0.3             # EWMA weight of the newest latency sample
+LATENCY_BUDGET_SECONDS = 60.0   # EWMA latency at which half of the latency score is lost
+
+
+def provider_name(llm: Any) -> str:
+    """Provider key of a chat model ("deepseek", "gemini", ...), as used by the metrics store"""
+    from .llm_cache import llm_identity
+    from .llm_metrics import llm_provider
+    return llm_provider(llm_identity(llm))[0]
+
+
+class ProviderBreaker:
+    """Circuit state, rolling error rate and latency EWMA of one provider"""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=WINDOW_SIZE)
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.cooldown = COOLDOWN_SECONDS
+        self.retry_at = 0.0
+        self.opened = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def available(self, now: float) -> bool:
+        """Closed, or open/half-open with the cooldown elapsed (one probe per cooldown)"""
+        return self.state == CLOSED or now >= self.retry_at
+
+    def score(self) -> float:
+        """1.0 for a fast, error-free provider; lower with errors and latency"""
+        latency_penalty = 0.0
+        if self.latency_ewma is not None:
+            latency_penalty = 0.5 * self.latency_ewma / (self.latency_ewma + LATENCY_BUDGET_SECONDS)
+        return (1.0 - self.error_rate) * (1.0 - latency_penalty)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "score": round(self.score(), 3),
+            "errorRate": round(self.error_rate, 3),
+            "latencyEwmaSeconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "calls": len(self.outcomes),
+            "consecutiveFailures": self.consecutive_failures,
+            "retryInSeconds": round(max(0.0, self.retry_at - now), 1) if self.state != CLOSED else 0.0,
+            "timesOpened": self.opened,
+        }
+
+
+class ProviderHealth:
+    """Circuit breakers for every LLM provider, shared by all agents in the process.
+
+    A provider's circuit opens after CONSECUTIVE_FAILURES errors in a row or
+    an error rate of ERROR_RATE_THRESHOLD over the rolling window. While
+    open it is left out of every fallback chain; once the cooldown has
+    passed one call may probe it (half-open). A successful probe closes the
+    circuit, a failed one reopens it with twice the cooldown.
+
+    Only provider errors count - cancelled calls and cache hits are not
+    recorded.
+    """
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.time):
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, ProviderBreaker] = {}
+
+    def _breaker(self, provider: str) -> ProviderBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = self._breakers[provider] = ProviderBreaker(provider)
+        return breaker
+
+    def before_call(self, provider: str):
+        """Mark a probe of an open circuit, so concurrent sections do not all probe it"""
+        if not self.enabled:
+            return
+        with self._lock:
+            breaker = self._breaker(provider)
+            now = self._clock()
+            if breaker.state != CLOSED and now >= breaker.retry_at:
+                breaker.state = HALF_OPEN
+                breaker.retry_at = now + breaker.cooldown
+                print(f"  [HEALTH] Probing {provider} (circuit half-open)")
+
+    def record_success(self, provider: str, latency_seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            breaker = self._breaker(provider)
+            breaker.outcomes.append(True)
+            breaker.consecutive_failures = 0
+            if breaker.latency_ewma is None:
+                breaker.latency_ewma = latency_seconds
+            else:
+                breaker.latency_ewma += LATENCY_ALPHA * (latency_seconds - breaker.latency_ewma)
+            if breaker.state != CLOSED:
+                print(f"  [HEALTH] {provider} recovered, circuit closed")
+                # A recovered provider starts from a clean window
+                breaker.outcomes.clear()
+                breaker.outcomes.append(True)
+            breaker.state = CLOSED
+            breaker.cooldown = COOLDOWN_SECONDS
+
+    def record_failure(self, provider: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            breaker = self._breaker(provider)
+            breaker.outcomes.append(False)
+            breaker.consecutive_failures += 1
+            now = self._clock()
+            if breaker.state == HALF_OPEN:
+                breaker.cooldown = min(MAX_COOLDOWN_SECONDS, breaker.cooldown * 2)
+                self._open(breaker, now)
+            elif breaker.state == CLOSED and (
+                breaker.consecutive_failures >= CONSECUTIVE_FAILURES
+                or (len(breaker.outcomes) >= MIN_CALLS and breaker.error_rate >= ERROR_RATE_THRESHOLD)
+            ):
+                self._open(breaker, now)
+
+    def _open(self, breaker: ProviderBreaker, now: float):
+        breaker.state = OPEN
+        breaker.retry_at = now + breaker.cooldown
+        breaker.opened += 1
+        print(f"  [HEALTH] {breaker.provider} circuit open for {breaker.cooldown:.0f}s "
+              f"(error rate {breaker.error_rate:.0%}, {breaker.consecutive_failures} failures in a row)")
+
+    def order(self, llms: List[Any]) -> List[Any]:
+        """Fallback chain for ``llms`` (given in configured order).
+
+        Providers with an open circuit are skipped; the rest are sorted by
+        health score in 0.1 steps, so similarly healthy providers keep their
+        configured order. If every circuit is open the whole list is
+        returned, soonest retry first, rather than nothing.
+        """
+        if not self.enabled:
+            return list(llms)
+        with self._lock:
+            now = self._clock()
+            breakers = [(index, llm, self._breaker(provider_name(llm))) for index, llm in enumerate(llms)]
+            available = [entry for entry in breakers if entry[2].available(now)]
+            if available:
+                ranked = sorted(available, key=lambda entry: (-round(entry[2].score(), 1), entry[0]))
+            else:
+                ranked = sorted(breakers, key=lambda entry: (entry[2].retry_at, entry[0]))
+            skipped = [breaker.provider for _, _, breaker in breakers if not breaker.available(now)]
+        if skipped and available:
+            print(f"  [HEALTH] Skipping {', '.join(skipped)} (circuit open)")
+        return [llm for _, llm, _ in ranked]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            return {provider: breaker.snapshot(now) for provider, breaker in self._breakers.items()}
+
+
+_health: Optional[ProviderHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealth:
+    """Process-wide provider health (PROVIDER_HEALTH=off keeps every chain in its configured order)"""
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = ProviderHealth(enabled=os.getenv("PROVIDER_HEALTH", "on").lower() != "off")
+        return _health
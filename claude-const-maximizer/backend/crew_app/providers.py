@@ -0,0 +1,244 @@
+"""
+Provider Registry
+Process-wide pool of LLM clients and search tools shared by crews and agents
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .cassettes import ReplaySearchTool, get_cassette
+
+load_dotenv()
+
+# Fallback order used by every agent: the first available provider is primary
+DEFAULT_PROVIDER_ORDER = ["deepseek", "gemini", "huggingface", "mistral", "gpt-3.5"]
+
+PROVIDER_LABELS = {
+    "deepseek": "DeepSeek",
+    "gemini": "Gemini Pro",
+    "huggingface": "Hugging Face",
+    "mistral": "Mistral",
+    "gpt-3.5": "GPT-3.5 Turbo",
+}
+
+# Keep-alive pool shared by every OpenAI-compatible client (DeepSeek, Mistral, GPT-3.5)
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 20
+
+
+class LoopLocalAsyncCompletions:
+    """``chat.completions`` of an async OpenAI client, one client per running event loop.
+
+    httpx.AsyncClient connections are bound to the loop that opened them, so
+    one client reused by a later ``asyncio.run`` fails with "Event loop is
+    closed". Chat models hold this proxy instead; each loop gets its own
+    pooled client, dropped with the loop.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _completions(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            completions = self._by_loop.get(loop)
+            if completions is None:
+                # A pooled connection may reference its loop, so closed loops are dropped explicitly
+                for closed in [other for other in self._by_loop if other.is_closed()]:
+                    del self._by_loop[closed]
+                completions = self._by_loop[loop] = self._factory()
+            return completions
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._completions(), name)
+
+
+class ProviderRegistry:
+    """Creates each model/tool client once and hands the same instance to every borrower.
+
+    Chat models are keyed by (provider, temperature). All OpenAI-compatible
+    models talking to the same endpoint with the same key additionally share
+    one SDK client, i.e. one keep-alive HTTP connection pool (per event loop
+    for async calls), regardless of temperature.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances: Dict[Tuple, Any] = {}
+        self._unavailable: Dict[Tuple, str] = {}
+
+    def _get_or_create(self, key: Tuple, factory: Callable[[], Any]) -> Optional[Any]:
+        with self._lock:
+            if key in self._instances:
+                return self._instances[key]
+            if key in self._unavailable:
+                return None
+            try:
+                instance = factory()
+            except Exception as e:
+                self._unavailable[key] = str(e)
+                print(f"  [WARN] Failed to configure {key[1] if len(key) > 1 else key[0]}: {e}")
+                return None
+            # A missing API key is not cached, so a key added later is picked up
+            if instance is not None:
+                self._instances[key] = instance
+            return instance
+
+    def _openai_transport(self, api_key: str, base_url: Optional[str]) -> Tuple[Any, Any]:
+        """(sync, async) chat-completions clients with pooled HTTP connections.
+
+        The sync client is shared process-wide; the async one per event loop.
+        """
+        def create():
+            import httpx
+            import openai
+
+            limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+            sync_client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=httpx.Client(limits=limits))
+            async_completions = LoopLocalAsyncCompletions(
+                lambda: openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=httpx.AsyncClient(limits=limits)).chat.completions
+            )
+            return sync_client.chat.completions, async_completions
+
+        return self._get_or_create(("openai-transport", base_url or "openai", api_key), create)
+
+    def _openai_compatible(self, model: str, temperature: float, api_key: str, base_url: Optional[str]):
+        from langchain_community.chat_models import ChatOpenAI
+
+        client, async_client = self._openai_transport(api_key, base_url)
+        kwargs = {"base_url": base_url} if base_url else {}
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            openai_api_key=api_key,
+            client=client,
+            async_client=async_client,
+            **kwargs
+        )
+
+    def chat_model(self, provider: str, temperature: float) -> Optional[Any]:
+        """Shared chat model for a provider, or None if its API key is missing or setup failed.
+
+        With CASSETTE_MODE=replay, a stand-in answering from the cassette for
+        every provider that answered while recording.
+        """
+        cassette = get_cassette()
+        if cassette.replaying:
+            return self._get_or_create(("replay", provider, temperature), lambda: cassette.chat_model(provider, temperature))
+
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        google_api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+        huggingface_api_key = os.getenv("HUGGINGFACE_API_KEY")
+        mistral_api_key = os.getenv("MISTRAL_API_KEY")
+
+        def create():
+            if provider == "deepseek" and openai_api_key:
+                return self._openai_compatible("deepseek-chat", temperature, openai_api_key, "https://api.deepseek.com/v1")
+            if provider == "gpt-3.5" and openai_api_key:
+                return self._openai_compatible("gpt-3.5-turbo", temperature, openai_api_key, None)
+            if provider == "mistral" and mistral_api_key:
+                return self._openai_compatible("mistral-large-latest", temperature, mistral_api_key, "https://api.mistral.ai/v1")
+            if provider == "gemini" and google_api_key:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                return ChatGoogleGenerativeAI(
+                    model="gemini-1.5-pro",
+                    temperature=temperature,
+                    google_api_key=google_api_key
+                )
+            if provider == "huggingface" and huggingface_api_key:
+                from langchain_huggingface import ChatHuggingFace
+                return ChatHuggingFace(
+                    model="mistralai/Mistral-7B-Instruct-v0.2",
+                    temperature=temperature,
+                    huggingfacehub_api_token=huggingface_api_key,
+                    task="text-generation"
+                )
+            return None
+
+        def create_and_log():
+            llm = create()
+            if llm is not None:
+                print(f"  [OK] {PROVIDER_LABELS.get(provider, provider)} LLM client created (temperature {temperature})")
+            return llm
+
+        return self._get_or_create(("llm", provider, temperature), create_and_log)
+
+    def agent_llms(
+        self,
+        agent_name: str,
+        temperature: float,
+        backup_temperature: Optional[float] = None,
+        order: Optional[List[str]] = None
+    ) -> Tuple[Any, List[Any]]:
+        """(primary, backups) for an agent following the shared fallback order.
+
+        The first provider in ``order`` uses ``temperature``, the rest
+        ``backup_temperature`` (defaults to the same). If the first provider is
+        unavailable the first working backup is promoted to primary.
+        """
+        order = order or DEFAULT_PROVIDER_ORDER
+        if backup_temperature is None:
+            backup_temperature = temperature
+
+        available = []
+        for index, provider in enumerate(order):
+            llm = self.chat_model(provider, temperature if index == 0 else backup_temperature)
+            if llm is not None:
+                available.append(llm)
+            else:
+                print(f"  [WARN] {PROVIDER_LABELS.get(provider, provider)} not available for {agent_name}")
+
+        if not available:
+            print("  [ERROR] No LLMs available! Please set one of: OPENAI_API_KEY, GEMINI_API_KEY, HUGGINGFACE_API_KEY, MISTRAL_API_KEY")
+            raise ValueError(f"No LLMs available for {agent_name}")
+
+        return available[0], available[1:]
+
+    def tavily_search(self, max_results: int = 5) -> Optional[Any]:
+        """Shared Tavily search tool, or None without TAVILY_API_KEY (a cassette stand-in when replaying)"""
+        cassette = get_cassette()
+        if cassette.replaying:
+            return self._get_or_create(("replay", "tavily", max_results), lambda: ReplaySearchTool(cassette, max_results))
+        tavily_api_key = os.getenv("TAVILY_API_KEY")
+
+        def create():
+            if not tavily_api_key:
+                return None
+            from langchain_community.tools import TavilySearchResults
+            return TavilySearchResults(api_key=tavily_api_key, max_results=max_results)
+
+        return self._get_or_create(("tool", "tavily", max_results), create)
+
+    def duckduckgo_search(self) -> Optional[Any]:
+        def create():
+            from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+            return DuckDuckGoSearchAPIWrapper()
+
+        return self._get_or_create(("tool", "duckduckgo"), create)
+
+
+_registry: Optional[ProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Process-wide provider registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProviderRegistry()
+        return _registry
+
+
+def reset_provider_registry():
+    """Drop all pooled clients (benchmarks, or after rotating API keys)"""
+    global _registry
+    with _registry_lock:
+        _registry = None
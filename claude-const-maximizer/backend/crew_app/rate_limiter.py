@@ -0,0 +1,192 @@
+"""
+Rate Limiter
+Token buckets and per-provider concurrency caps shared by every caller of a rate-limited external API
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from .sqlite_utils import ThreadLocalConnections
+
+# Tavily's development plan allows 100 requests per minute
+DEFAULT_SEARCH_REQUESTS_PER_MINUTE = 100
+DEFAULT_SEARCH_BURST = 5
+DEFAULT_RATE_LIMIT_DB = Path("rate_limits.db")
+
+# Calls in flight per provider and process; <PROVIDER>_MAX_CONCURRENT overrides it per provider, 0 = no cap
+DEFAULT_MAX_CONCURRENT = 4
+CONCURRENCY_POLL_INTERVAL = 0.05
+
+
+class AsyncTokenBucket:
+    """Allows ``rate`` acquisitions per second on average and up to ``capacity`` at once.
+
+    ``acquire()`` reserves its tokens immediately (the balance may go
+    negative) and then sleeps until the reservation is covered, so waiters
+    are served in arrival order. The balance is guarded by a thread lock,
+    which lets one bucket pace coroutines on several event loops in one
+    process; ``SharedTokenBucket`` extends that to several processes.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` and return how long the caller must wait for them"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait for ``tokens``; returns the seconds spent waiting"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_sync(self, tokens: float = 1.0) -> float:
+        """Blocking ``acquire`` for callers without an event loop (CrewAI tools, threads)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(AsyncTokenBucket):
+    """Token bucket whose balance lives in SQLite, shared by every process using ``db_path``.
+
+    JobExecutor pool workers and run_all threads draw from one budget, so
+    together they stay within the provider's limit. Each reservation is one
+    short write transaction. The clock is wall time, because every process
+    must read the same clock.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, db_path: Path = DEFAULT_RATE_LIMIT_DB, clock: Callable[[], float] = time.time):
+        super().__init__(rate, capacity, clock)
+        self.name = name
+        self.db_path = Path(db_path)
+        self._db = ThreadLocalConnections(self.db_path)
+        self._db.connect().execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets ("
+            " name TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def _reserve(self, tokens: float) -> float:
+        with self._db.write_transaction() as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)).fetchone()
+            now = self._clock()
+            balance = self.capacity if row is None else min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+            balance -= tokens
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.name, balance, now)
+            )
+        return max(0.0, -balance / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait for ``tokens``; the reservation (a SQLite write that may wait on the lock) runs off the event loop"""
+        wait = await asyncio.to_thread(self._reserve, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class ProviderConcurrency:
+    """At most ``limit(provider)`` calls in flight per provider, from any thread or event loop.
+
+    One bounded semaphore per provider, created on first use. Blocking
+    callers wait in ``hold``; coroutines use ``hold_async``, which polls so
+    that neither a thread nor (on cancellation) a slot is left behind.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default: int = DEFAULT_MAX_CONCURRENT):
+        self.limits = dict(limits or {})
+        self.default = default
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, Optional[threading.BoundedSemaphore]] = {}
+
+    def limit(self, provider: str) -> int:
+        if provider not in self.limits:
+            self.limits[provider] = int(os.getenv(f"{provider.upper().replace('-', '_')}_MAX_CONCURRENT", self.default))
+        return self.limits[provider]
+
+    def _semaphore(self, provider: str) -> Optional[threading.BoundedSemaphore]:
+        with self._lock:
+            if provider not in self._semaphores:
+                limit = self.limit(provider)
+                self._semaphores[provider] = threading.BoundedSemaphore(limit) if limit > 0 else None
+            return self._semaphores[provider]
+
+    @contextmanager
+    def hold(self, provider: str) -> Iterator[None]:
+        semaphore = self._semaphore(provider)
+        if semaphore is None:
+            yield
+            return
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    @asynccontextmanager
+    async def hold_async(self, provider: str) -> AsyncIterator[None]:
+        semaphore = self._semaphore(provider)
+        if semaphore is None:
+            yield
+            return
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(CONCURRENCY_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+_search_limiter: Optional[AsyncTokenBucket] = None
+_search_limiter_lock = threading.Lock()
+
+
+def get_search_rate_limiter() -> AsyncTokenBucket:
+    """Tavily limiter sized by TAVILY_REQUESTS_PER_MINUTE and TAVILY_BURST, shared through RATE_LIMIT_DB by all processes"""
+    global _search_limiter
+    with _search_limiter_lock:
+        if _search_limiter is None:
+            per_minute = float(os.getenv("TAVILY_REQUESTS_PER_MINUTE", DEFAULT_SEARCH_REQUESTS_PER_MINUTE))
+            _search_limiter = SharedTokenBucket(
+                "tavily",
+                per_minute / 60.0,
+                float(os.getenv("TAVILY_BURST", DEFAULT_SEARCH_BURST)),
+                db_path=Path(os.getenv("RATE_LIMIT_DB", str(DEFAULT_RATE_LIMIT_DB)))
+            )
+        return _search_limiter
+
+
+_concurrency: Optional[ProviderConcurrency] = None
+_concurrency_lock = threading.Lock()
+
+
+def get_provider_concurrency() -> ProviderConcurrency:
+    """Process-wide caps from PROVIDER_MAX_CONCURRENT and <PROVIDER>_MAX_CONCURRENT (e.g. TAVILY_MAX_CONCURRENT)"""
+    global _concurrency
+    with _concurrency_lock:
+        if _concurrency is None:
+            _concurrency = ProviderConcurrency(default=int(os.getenv("PROVIDER_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)))
+        return _concurrency
@@ -0,0 +1,151 @@
+"""
+Research Ranking
+BM25 relevance ranking of search results and a token-budgeted research summary packer for the analysis prompt
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .llm_metrics import estimate_tokens
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+DEFAULT_CATEGORY_TOKENS = 400   # summary budget per research category
+MAX_RESULT_TOKENS = 75          # one source never takes more than this (~300 characters)
+MIN_RESULT_TOKENS = 30          # smaller leftovers are not worth a truncated source
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in re.findall(r"\w+", (text or "").lower()) if word not in STOPWORDS and len(word) > 1]
+
+
+class BM25:
+    """Okapi BM25 over a fixed set of documents"""
+
+    def __init__(self, documents: List[List[str]], k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if documents else 0.0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        total = len(documents)
+        self.idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    def scores(self, query: List[str]) -> List[float]:
+        terms = set(query)
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+
+def rank_results(
+    results: List[Dict[str, Any]],
+    project_name: str,
+    description: str,
+    category_keywords: Dict[str, List[str]]
+) -> List[Dict[str, Any]]:
+    """Sort results by category (in ``category_keywords`` order), then BM25 relevance.
+
+    Each result is scored against the project name, description and its own
+    category's keywords, with IDF taken over the whole result set; the score
+    is stored as ``relevance``. Ties keep arrival order.
+    """
+    bm25 = BM25([tokenize(f"{result.get('title', '')} {result.get('content', '')}") for result in results])
+    project_terms = tokenize(f"{project_name} {description}")
+    category_order = {category: index for index, category in enumerate(category_keywords)}
+    queries = {
+        category: project_terms + tokenize(f"{category.replace('_', ' ')} {' '.join(keywords)}")
+        for category, keywords in category_keywords.items()
+    }
+    scores_by_category = {category: bm25.scores(query) for category, query in queries.items()}
+    general_scores: Optional[List[float]] = None
+    for index, result in enumerate(results):
+        category_scores = scores_by_category.get(result.get("research_category"))
+        if category_scores is None:
+            general_scores = general_scores or bm25.scores(project_terms)
+            category_scores = general_scores
+        result["relevance"] = round(category_scores[index], 4)
+    order = sorted(
+        range(len(results)),
+        key=lambda i: (category_order.get(results[i].get("research_category"), len(category_order)), -results[i]["relevance"], i)
+    )
+    return [results[i] for i in order]
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return f"{cut}..."
+
+
+@dataclass
+class PackReport:
+    results_in: int = 0
+    results_packed: int = 0
+    truncated: int = 0
+    tokens: int = 0
+
+    def summary(self) -> str:
+        return f"{self.results_packed}/{self.results_in} sources packed ({self.truncated} truncated), ~{self.tokens} tokens"
+
+
+def pack_research_summary(
+    results: List[Dict[str, Any]],
+    category_tokens: int = DEFAULT_CATEGORY_TOKENS,
+    max_result_tokens: int = MAX_RESULT_TOKENS
+) -> Tuple[str, PackReport]:
+    """Research summary with each category's most relevant sources, within ``category_tokens`` each.
+
+    Results are taken per category in ``relevance`` order (as left by
+    ``rank_results``); a source's content is cut to ``max_result_tokens``
+    and, when the category budget is nearly spent, to what is left of it.
+    """
+    report = PackReport(results_in=len(results))
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        by_category.setdefault(result.get("research_category", "general"), []).append(result)
+
+    parts: List[str] = []
+    for category, category_results in by_category.items():
+        header = f"\n## {category.upper().replace('_', ' ')} RESEARCH"
+        remaining = category_tokens - estimate_tokens(header)
+        entries: List[str] = []
+        ranked = sorted(category_results, key=lambda result: -float(result.get("relevance") or 0.0))
+        for result in ranked:
+            heading = f"\n### Source {len(entries) + 1}: {result.get('title', 'No title')}\n**URL:** {result.get('url', 'No URL')}\n**Content:** "
+            content_budget = min(max_result_tokens, remaining - estimate_tokens(heading))
+            if content_budget < MIN_RESULT_TOKENS:
+                break
+            content = result.get("content", "No content")
+            packed = _truncate(content, content_budget)
+            if packed != content:
+                report.truncated += 1
+            entry = heading + packed
+            entries.append(entry)
+            remaining -= estimate_tokens(entry)
+        if entries:
+            parts.append(header)
+            parts.extend(entries)
+            report.results_packed += len(entries)
+
+    summary = "\n".join(parts)
+    report.tokens = estimate_tokens(summary)
+    return summary, report
@@ -0,0 +1,151 @@
+"""
+Search Result Cache
+On-disk TTL cache of Tavily search results shared by MarketResearcher and the CrewAI research agent
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .cassettes import get_cassette
+from .llm_metrics import get_metrics_store
+from .rate_limiter import AsyncTokenBucket, get_provider_concurrency
+from .ttl_cache import SQLiteTTLCache
+
+DEFAULT_CACHE_DIR = Path("search_cache")
+CACHE_FILENAME = "results.db"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3 * 24 * 3600
+
+
+def normalize_query(query: str) -> str:
+    """Case, Unicode form and whitespace folded, so trivially different queries share an entry"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", query)).strip().lower()
+
+
+def search_key(tool: Any, query: str) -> str:
+    """sha256 over the tool, its result count and the normalized query"""
+    payload = {
+        "tool": type(tool).__name__,
+        "max_results": getattr(tool, "max_results", None),
+        "query": normalize_query(query),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SearchResultCache(SQLiteTTLCache):
+    """Search results keyed by hash(tool settings, normalized query).
+
+    Stored as JSON in SQLite (search_cache/results.db) so every project, agent
+    and worker process shares it, with the expiry and LRU eviction of
+    ``SQLiteTTLCache``. Only non-empty result lists are stored - errors,
+    which the Tavily tool returns as a string, are never replayed.
+    """
+
+    NAME = "Search cache"
+    TABLE = "search_results"
+    LABEL_COLUMN = "query"
+    VALUE_COLUMN = "results"
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        mode: str = "on"
+    ):
+        self.cache_dir = Path(cache_dir)
+        super().__init__(self.cache_dir / CACHE_FILENAME, max_bytes, ttl_seconds, mode)
+
+    def _encode(self, value: List[Dict[str, Any]]) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def _decode(self, stored: str) -> List[Dict[str, Any]]:
+        return json.loads(stored)
+
+    def _lookup(self, tool: Any, query: str) -> Optional[str]:
+        """Cache key to store a fresh answer under (None when bypassed)"""
+        if self.mode == "off":
+            self._count("bypassed")
+            return None
+        return search_key(tool, query)
+
+    def _store(self, key: Optional[str], query: str, results: Any):
+        if key is not None and isinstance(results, list) and results:
+            self.put(key, normalize_query(query), results)
+
+    async def search(
+        self,
+        tool: Any,
+        query: str,
+        limiter: Optional[AsyncTokenBucket] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """``tool.ainvoke({"query": query})``, served from the cache when possible.
+
+        Only real searches wait for ``limiter`` and are bounded by ``timeout``.
+        Errors propagate to the caller; every search, cache hits included,
+        is recorded in the metrics store and, when recording, the cassette.
+        """
+        with get_metrics_store().track("search", "tavily", "tavily-search") as call:
+            start = time.perf_counter()
+            key = self._lookup(tool, query)
+            if key is not None and self.mode == "on":
+                cached = self.get(key)
+                if cached is not None:
+                    call.outcome = "cache_hit"
+                    get_cassette().record_search(query, getattr(tool, "max_results", None), cached, time.perf_counter() - start)
+                    return cached
+            if limiter is not None:
+                await limiter.acquire()
+            async with get_provider_concurrency().hold_async("tavily"):
+                start = time.perf_counter()
+                results = await asyncio.wait_for(tool.ainvoke({"query": query}), timeout)
+            get_cassette().record_search(query, getattr(tool, "max_results", None), results, time.perf_counter() - start)
+            self._store(key, query, results)
+            return results
+
+    def search_sync(self, tool: Any, query: str, limiter: Optional[AsyncTokenBucket] = None) -> Any:
+        """Blocking variant of ``search`` for tools run by CrewAI; real searches wait for ``limiter`` too"""
+        with get_metrics_store().track("search", "tavily", "tavily-search") as call:
+            start = time.perf_counter()
+            key = self._lookup(tool, query)
+            if key is not None and self.mode == "on":
+                cached = self.get(key)
+                if cached is not None:
+                    call.outcome = "cache_hit"
+                    get_cassette().record_search(query, getattr(tool, "max_results", None), cached, time.perf_counter() - start)
+                    return cached
+            if limiter is not None:
+                limiter.acquire_sync()
+            with get_provider_concurrency().hold("tavily"):
+                start = time.perf_counter()
+                results = tool.invoke({"query": query})
+            get_cassette().record_search(query, getattr(tool, "max_results", None), results, time.perf_counter() - start)
+            self._store(key, query, results)
+            return results
+
+
+_cache: Optional[SearchResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchResultCache:
+    """Process-wide cache configured from SEARCH_CACHE_MODE, SEARCH_CACHE_MAX_MB and SEARCH_CACHE_TTL_HOURS"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchResultCache(
+                cache_dir=Path(os.getenv("SEARCH_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+                max_bytes=int(float(os.getenv("SEARCH_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+                ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_HOURS", DEFAULT_TTL_SECONDS / 3600)) * 3600,
+                mode=os.getenv("SEARCH_CACHE_MODE", "on").lower()
+            )
+        return _cache
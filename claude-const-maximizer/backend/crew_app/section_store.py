@@ -0,0 +1,105 @@
+"""
+Section Store
+Per-section input hashes and files of ClaudeCoder runs, so unchanged sections are reused on a rerun
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Brief lines that change on every render without changing what the code should be
+VOLATILE_BRIEF_LINES = re.compile(r"^\*\*Research Date:\*\*.*$", re.MULTILINE)
+
+
+def stable_brief(project_brief: str) -> str:
+    """Project brief without its render timestamp"""
+    return VOLATILE_BRIEF_LINES.sub("", project_brief or "")
+
+
+def files_digest(files: Dict[str, str]) -> str:
+    """sha256 over a section's (path, content) pairs"""
+    payload = json.dumps(sorted(files.items()), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def section_input_hash(section: str, prompt: str, upstream: Dict[str, str]) -> str:
+    """sha256 over everything a section is generated from.
+
+    ``prompt`` is the section prompt rendered with ``stable_brief`` - it holds
+    the brief and exactly the template and research fields the section reads -
+    and ``upstream`` maps each input section to its ``files_digest``.
+    """
+    payload = {"section": section, "prompt": prompt, "upstream": upstream}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SectionStore:
+    """Input hash and files of every generated section of one project.
+
+    One JSON file per section under ``root`` (next to ``generated_code/``).
+    A section is only recorded when it produced real files, so failed
+    sections are always retried. ``skipped`` and ``regenerated`` collect
+    what happened during the current run for the summary.
+    """
+
+    def __init__(self, root: Path, force: bool = False):
+        self.root = Path(root)
+        self.force = force
+        self.skipped: List[str] = []
+        self.regenerated: List[Tuple[str, str]] = []
+
+    def _path(self, section: str) -> Path:
+        return self.root / f"{section}.json"
+
+    def load(self, section: str) -> Optional[Dict[str, Any]]:
+        path = self._path(section)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Ignoring unreadable section record {path}: {e}")
+            return None
+
+    def reuse(self, section: str, input_hash: str, upstream: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Files recorded for ``section`` if its inputs are unchanged, else None (with the reason noted)"""
+        record = None if self.force else self.load(section)
+        if self.force:
+            reason = "forced"
+        elif record is None:
+            reason = "not generated before"
+        elif record.get("inputHash") != input_hash:
+            changed = [key for key, digest in upstream.items() if record.get("upstream", {}).get(key) != digest]
+            reason = f"{', '.join(changed)} changed" if changed else "inputs changed"
+        else:
+            self.skipped.append(section)
+            return record["files"]
+        self.regenerated.append((section, reason))
+        return None
+
+    def save(self, section: str, input_hash: str, upstream: Dict[str, str], files: Dict[str, str]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(section)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "section": section,
+                "inputHash": input_hash,
+                "upstream": upstream,
+                "generatedAt": datetime.now().isoformat(),
+                "files": files
+            }, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        skipped = ", ".join(self.skipped) or "none"
+        regenerated = ", ".join(f"{section} ({reason})" for section, reason in self.regenerated) or "none"
+        return (
+            f"Code sections: {len(self.skipped)} skipped [{skipped}], "
+            f"{len(self.regenerated)} regenerated [{regenerated}]"
+        )
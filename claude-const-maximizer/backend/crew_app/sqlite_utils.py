@@ -0,0 +1,47 @@
+"""
+SQLite Utilities
+Thread-local WAL connections shared by every SQLite-backed store (status, caches, metrics, rate limits)
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class ThreadLocalConnections:
+    """One autocommit connection per thread to a SQLite file in WAL mode.
+
+    WAL lets readers run alongside the single writer, across threads and
+    processes. ``isolation_level=None`` leaves transactions to the caller,
+    who opens them explicitly (see ``write_transaction``).
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 30):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened (and the parent directory created) on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def write_transaction(self) -> Iterator[sqlite3.Connection]:
+        """``BEGIN IMMEDIATE`` ... ``COMMIT`` on this thread's connection, rolled back on error"""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,141 @@
+"""
+TTL Cache Store
+SQLite key/value store with expiry and LRU eviction behind the LLM response and search result caches
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .sqlite_utils import ThreadLocalConnections
+
+# "on": read and write, "refresh": skip reads but store fresh answers, "off": bypass entirely
+CACHE_MODES = ("on", "refresh", "off")
+
+
+class SQLiteTTLCache:
+    """Entries keyed by a hash, stored in one SQLite table shared by every process.
+
+    Entries expire after ``ttl_seconds``; once the table grows past
+    ``max_bytes`` the least recently used entries are evicted. Subclasses
+    name the table and its label/value columns, and may override
+    ``_encode``/``_decode`` to store something other than text.
+    """
+
+    NAME = "Cache"
+    TABLE = ""
+    LABEL_COLUMN = ""
+    VALUE_COLUMN = ""
+    EXTRA_METRICS: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: Path, max_bytes: int, ttl_seconds: float, mode: str = "on"):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.mode = "off"
+        self._db = ThreadLocalConnections(self.db_path)
+        self._metrics_lock = threading.Lock()
+        self.metrics = dict.fromkeys(("hits", "misses", "expired", "stored", "evicted", "bypassed") + self.EXTRA_METRICS, 0)
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str):
+        """Switch between "on", "refresh" and "off" (e.g. from a --llm-cache / --search-cache CLI flag)"""
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown {self.NAME} mode '{mode}', expected one of {', '.join(CACHE_MODES)}")
+        if self.mode == "off" and mode != "off":
+            self._init_schema()
+        self.mode = mode
+
+    def _init_schema(self):
+        conn = self._db.connect()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            " key TEXT PRIMARY KEY,"
+            f" {self.LABEL_COLUMN} TEXT NOT NULL,"
+            f" {self.VALUE_COLUMN} TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used_at REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_lru ON {self.TABLE} (last_used_at)")
+
+    def _count(self, metric: str, amount: int = 1):
+        with self._metrics_lock:
+            self.metrics[metric] += amount
+
+    def _encode(self, value: Any) -> str:
+        return value
+
+    def _decode(self, stored: str) -> Any:
+        return stored
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._db.connect()
+        row = conn.execute(f"SELECT {self.VALUE_COLUMN}, created_at FROM {self.TABLE} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        stored, created_at = row
+        now = time.time()
+        if now - created_at > self.ttl_seconds:
+            conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+            self._count("expired")
+            self._count("misses")
+            return None
+        conn.execute(f"UPDATE {self.TABLE} SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        self._count("hits")
+        return self._decode(stored)
+
+    def put(self, key: str, label: str, value: Any):
+        now = time.time()
+        stored = self._encode(value)
+        with self._db.write_transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} (key, {self.LABEL_COLUMN}, {self.VALUE_COLUMN}, size, created_at, last_used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, label, stored, len(stored.encode("utf-8")), now, now)
+            )
+            evicted = self._evict(conn, now)
+        self._count("stored")
+        self._count("evicted", evicted)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        evicted = conn.execute(f"DELETE FROM {self.TABLE} WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+        doomed, freed = [], 0
+        for key, size in conn.execute(f"SELECT key, size FROM {self.TABLE} ORDER BY last_used_at ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany(f"DELETE FROM {self.TABLE} WHERE key = ?", doomed)
+        return evicted + len(doomed)
+
+    def clear(self):
+        if self.mode != "off":
+            self._db.connect().execute(f"DELETE FROM {self.TABLE}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            stats: Dict[str, Any] = dict(self.metrics)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hitRate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["mode"] = self.mode
+        if self.mode != "off":
+            entries, total = self._db.connect().execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()
+            stats["entries"] = entries
+            stats["bytes"] = total
+        return stats
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (
+            f"{self.NAME} ({stats['mode']}): {stats['hits']} hit(s), {stats['misses']} miss(es), "
+            f"hit rate {stats['hitRate']:.0%}, {stats['stored']} stored, {stats['evicted']} evicted"
+        )
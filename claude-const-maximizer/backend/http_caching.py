@@ -0,0 +1,134 @@
+"""
+HTTP Caching
+ASGI middleware adding strong ETags, 304 revalidation and gzip/brotli compression to JSON responses
+"""
+
+import gzip
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+CACHEABLE_TYPES = ("application/json",)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _etag_matches(if_none_match: Optional[str], content_hash: str) -> bool:
+    """True if any tag in If-None-Match names this content, whatever its encoding suffix"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == content_hash:
+            return True
+    return False
+
+
+def _choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CachingCompressionMiddleware:
+    """Buffers GET responses with a cacheable content type and:
+
+    - tags them with a strong ETag (content hash of the uncompressed body,
+      suffixed per encoding so each representation has its own tag),
+    - answers If-None-Match with 304 and no body,
+    - compresses bodies of at least ``minimum_size`` bytes with brotli or gzip.
+
+    Streaming responses (SSE, file downloads, archives) and responses that
+    already carry an ETag or Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = scope["headers"]
+        if_none_match = _header(request_headers, b"if-none-match")
+        encoding = _choose_encoding(_header(request_headers, b"accept-encoding"))
+
+        state: Dict[str, object] = {"start": None, "buffering": False, "chunks": []}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                content_type = _header(headers, b"content-type") or ""
+                state["buffering"] = (
+                    message["status"] == 200
+                    and content_type.startswith(CACHEABLE_TYPES)
+                    and _header(headers, b"etag") is None
+                    and _header(headers, b"content-encoding") is None
+                )
+                if state["buffering"]:
+                    state["start"] = message
+                else:
+                    await send(message)
+                return
+
+            if not state["buffering"]:
+                await send(message)
+                return
+
+            state["chunks"].append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            await self._send_buffered(send, state["start"], b"".join(state["chunks"]), if_none_match, encoding)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_buffered(self, send, start, body: bytes, if_none_match: Optional[str], encoding: Optional[str]):
+        content_hash = hashlib.sha256(body).hexdigest()[:32]
+        headers = [
+            (key, value) for key, value in start.get("headers", [])
+            if key.lower() not in (b"content-length", b"etag")
+        ]
+        headers.append((b"vary", b"Accept-Encoding"))
+
+        if len(body) < self.minimum_size:
+            encoding = None
+        etag = f'"{content_hash}-{encoding}"' if encoding else f'"{content_hash}"'
+        headers.append((b"etag", etag.encode("latin-1")))
+
+        if _etag_matches(if_none_match, content_hash):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding:
+            body = compress(body, encoding)
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": start["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": body})
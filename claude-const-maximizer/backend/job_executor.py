@@ -0,0 +1,262 @@
+"""
+CrewAI Job Executor
+Runs CrewAI pipelines in a bounded process pool so the API event loop stays responsive
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pipeline_status_store import get_status_store
+
+DEFAULT_MAX_WORKERS = int(os.getenv("CREWAI_JOB_WORKERS", "2"))
+
+# Finished jobs kept per project for /api/jobs; older ones are dropped (results stay in the status store)
+DEFAULT_JOB_RETENTION = int(os.getenv("CREWAI_JOB_RETENTION", "5"))
+
+# How often a running job polls the status store for a stop request
+CANCEL_POLL_INTERVAL = 1.0
+
+
+def run_crewai_job(project_id: str, project_name: str, max_retries: int = 3) -> str:
+    """Worker entry point: run the retry-enforced CrewAI pipeline for one project.
+
+    Executes in a pool process, so it reports progress through the shared
+    status store rather than through in-memory state; the crew itself
+    reports each stage as it starts.
+    """
+    status_store = get_status_store()
+
+    # Import inside the worker: crew_app builds LLM clients at import time
+    from crew_app.cancellation import CancellationToken, OperationCancelled
+    from crew_app.crew import kickoff_with_retries
+    from crew_app.llm_metrics import metrics_scope
+
+    # A stop requested while the job was queued (run_crewai_project's upsert cleared older ones)
+    current = status_store.get(project_id) or {}
+    if current.get("interrupt_requested") or current.get("status") == "stopped":
+        print(f"🛑 CrewAI job stopped before it started: {project_name}")
+        status_store.update(project_id, activeAgents=[], status="stopped", currentTask="Stopped by user")
+        return f"Execution stopped for {project_name}"
+
+    print(f"🔄 Using retry-enforced CrewAI system for: {project_name}")
+    status_store.update(
+        project_id,
+        activeAgents=["Market Research Analyst"],
+        progress=20,
+        currentTask="Market Research",
+        status="running"
+    )
+
+    # /api/stop-project sets interrupt_requested; the token polls it at every task / agent step
+    cancel_token = CancellationToken(
+        check=lambda: (status_store.get(project_id) or {}).get("interrupt_requested", False),
+        poll_interval=CANCEL_POLL_INTERVAL,
+        reason=f"Stopped by user: {project_name}"
+    )
+
+    print(f"🚀 Starting CrewAI with retry enforcement for: {project_name}")
+    kickoff_stats = {}
+    try:
+        # Crew stage and kickoff metrics are recorded under this project's id
+        with metrics_scope(project_id=project_id):
+            result = kickoff_with_retries(
+                max_retries=max_retries,
+                project_name=project_name,
+                cancel_token=cancel_token,
+                stats=kickoff_stats,
+                project_id=project_id,
+                status_store=status_store
+            )
+    except OperationCancelled as e:
+        print(f"🛑 CrewAI run cancelled for: {project_name} ({e})")
+        status_store.update(project_id, activeAgents=[], status="stopped", currentTask="Stopped by user")
+        return f"Execution stopped for {project_name}"
+    print(f"✅ CrewAI retry-enforced execution completed for: {project_name}")
+
+    # Handle different result formats
+    if isinstance(result, dict) and 'raw' in result:
+        result_to_save = result['raw']
+    else:
+        result_to_save = str(result)
+
+    print(f"🔍 CrewAI result length: {len(result_to_save) if result_to_save else 0}")
+
+    # Save to direct pipeline (our workaround)
+    try:
+        direct_results_dir = Path("direct_results")
+        direct_results_dir.mkdir(exist_ok=True)
+
+        direct_result_file = direct_results_dir / f"{project_id}_result.json"
+        direct_data = {
+            "project_id": project_id,
+            "result": result_to_save,
+            "timestamp": datetime.now().isoformat(),
+            "status": "completed"
+        }
+        with open(direct_result_file, 'w', encoding='utf-8') as f:
+            json.dump(direct_data, f, indent=2)
+
+        print(f"✅ Direct pipeline result saved to: {direct_result_file}")
+    except Exception as direct_save_error:
+        print(f"❌ Error saving to direct pipeline: {direct_save_error}")
+
+    status_store.update(
+        project_id,
+        progress=100,
+        activeAgents=[],
+        currentTask="Completed",
+        status="completed",
+        result=result_to_save,
+        kickoffStats=kickoff_stats
+    )
+    return result_to_save
+
+
+@dataclass
+class Job:
+    job_id: str
+    project_id: str
+    project_name: str
+    submitted_at: str
+    future: Future = field(repr=False)
+    finished_at: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "completed"
+        return "running" if self.future.running() else "queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dictionary"""
+        state = self.state
+        return {
+            "jobId": self.job_id,
+            "projectId": self.project_id,
+            "projectName": self.project_name,
+            "state": state,
+            "submittedAt": self.submitted_at,
+            "finishedAt": self.finished_at,
+            "result": self.future.result() if state == "completed" else None,
+            "error": str(self.future.exception()) if state == "failed" else None
+        }
+
+
+class JobExecutor:
+    """Submits CrewAI runs to a bounded process pool and tracks their state.
+
+    Jobs are kept in submission order. Once a project has more than
+    ``retention`` finished jobs, the oldest are forgotten together with
+    their futures and result strings.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, retention: int = DEFAULT_JOB_RETENTION):
+        self.max_workers = max_workers
+        self.retention = max(retention, 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Job] = {}  # insertion (= submission) order
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created lazily so spawned workers re-importing the API module don't build pools of their own
+        with self._lock:
+            if self._pool is None:
+                # spawn: workers must not inherit the API process's SQLite connections or event loop
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                print(f"[OK] CrewAI job executor started with {self.max_workers} worker(s)")
+            return self._pool
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor):
+        """Drop a pool whose worker died and fail the projects it was still running or holding"""
+        with self._lock:
+            if self._pool is not broken:
+                return  # another submit already replaced it
+            self._pool = None
+            in_flight = [job for job in self._jobs.values() if not job.future.done()]
+        broken.shutdown(wait=False, cancel_futures=True)
+        print(f"[WARN] CrewAI worker process died; restarting the pool ({len(in_flight)} unfinished job(s) marked failed)")
+        status_store = get_status_store()
+        for job in in_flight:
+            status_store.update(job.project_id, status="failed", activeAgents=[], error="CrewAI worker process terminated abruptly")
+
+    def submit(self, project_id: str, project_name: str, max_retries: int = 3) -> Job:
+        """Queue a CrewAI run and return immediately.
+
+        If the pool is broken (a worker was killed), it is replaced and the
+        run is submitted once more to the new pool.
+        """
+        pool = self._get_pool()
+        try:
+            future = pool.submit(run_crewai_job, project_id, project_name, max_retries)
+        except BrokenProcessPool:
+            self._replace_broken_pool(pool)
+            future = self._get_pool().submit(run_crewai_job, project_id, project_name, max_retries)
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            project_id=project_id,
+            project_name=project_name,
+            submitted_at=datetime.now().isoformat(),
+            future=future
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+        future.add_done_callback(lambda f: self._on_done(job, f))
+        return job
+
+    def _on_done(self, job: Job, future: Future):
+        job.finished_at = datetime.now().isoformat()
+        self._evict_finished(job.project_id)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"CrewAI execution error: {error}")
+            get_status_store().update(job.project_id, status="failed", activeAgents=[], error=str(error))
+
+    def _evict_finished(self, project_id: str):
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.project_id == project_id and job.future.done()]
+            for job_id in finished[:-self.retention]:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, project_id: Optional[str] = None) -> List[Job]:
+        """Jobs newest first"""
+        with self._lock:
+            jobs = list(reversed(self._jobs.values()))
+        if project_id:
+            jobs = [job for job in jobs if job.project_id == project_id]
+        return jobs
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        job = self.get(job_id)
+        return job.future.cancel() if job else False
+
+    def cancel_project(self, project_id: Optional[str] = None) -> int:
+        """Drop queued jobs for one project (or all projects); returns how many were dropped.
+
+        Running jobs are stopped cooperatively through interrupt_requested in the status store.
+        """
+        return sum(1 for job in self.list(project_id) if job.future.cancel())
+
+    def shutdown(self, wait: bool = False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,131 @@
+"""
+Keyword Matcher
+Compiled multi-pattern substring matcher shared by project categorization and output validation
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; the compiled trie regex is always available
+    ahocorasick = None
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any of ``keywords``, factored on common prefixes.
+
+    Branches at each node start with different characters, and a keyword that
+    is a prefix of a longer one becomes a greedy optional group, so at any
+    position the regex matches the longest keyword starting there.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds every keyword of a rule set ``{category: [keywords]}`` in one pass.
+
+    Matching has the same semantics as ``keyword in text`` (plain substrings,
+    lowercased unless ``case_sensitive``), but instead of rescanning the text
+    for every keyword of every category, all keywords are compiled once into
+    an Aho-Corasick automaton (pyahocorasick) or, without it, a single
+    prefix-trie regex. The regex reports the longest keyword at each match
+    position; keywords hidden inside it (``"health"`` in ``"health coach"``)
+    are recovered from a precomputed containment table, so overlaps are never
+    lost.
+
+    Build one matcher per rule set at import time and reuse it.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.categories: List[str] = list(rules)
+        self._rank = {category: index for index, category in enumerate(self.categories)}
+        self._owners: Dict[str, List[str]] = {}
+        for category, keywords in rules.items():
+            for keyword in keywords:
+                keyword = self._normalize(keyword)
+                if keyword and category not in self._owners.setdefault(keyword, []):
+                    self._owners[keyword].append(category)
+
+        keywords = list(self._owners)
+        self._automaton = None
+        self._pattern = None
+        if not keywords:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._contained: Dict[str, List[str]] = {
+                keyword: [other for other in keywords if other in keyword] for keyword in keywords
+            }
+            self._pattern = re.compile(_trie_pattern(keywords))
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _iter_keywords(self, text: str) -> Iterator[str]:
+        """Keywords in order of appearance (possibly repeated)"""
+        if not text:
+            return
+        text = self._normalize(text)
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(text):
+                yield keyword
+        elif self._pattern is not None:
+            # search() from the next position rather than finditer(), so keywords
+            # starting inside a match but running past its end are not skipped
+            match = self._pattern.search(text)
+            while match:
+                yield from self._contained[match.group()]
+                match = self._pattern.search(text, match.start() + 1)
+
+    def keywords(self, text: str) -> Set[str]:
+        """Every keyword occurring in ``text``"""
+        return set(self._iter_keywords(text))
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Keywords hit per category, categories in rule order"""
+        hits: Dict[str, Set[str]] = {}
+        for keyword in self.keywords(text):
+            for category in self._owners[keyword]:
+                hits.setdefault(category, set()).add(keyword)
+        return {category: hits[category] for category in self.categories if category in hits}
+
+    def first(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """First category (in rule order) with any keyword in ``text`` - an if/elif chain in one pass"""
+        best = len(self.categories)
+        for keyword in self._iter_keywords(text):
+            best = min(best, self._rank[self._owners[keyword][0]])
+            if best == 0:
+                break
+        return self.categories[best] if best < len(self.categories) else default
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords hit per category (zero for categories with no hit)"""
+        hits = self.scan(text)
+        return {category: len(hits.get(category, ())) for category in self.categories}
+
+    def matches(self, text: str, category: Optional[str] = None) -> bool:
+        """True if ``text`` contains any keyword (of ``category``, if given)"""
+        for keyword in self._iter_keywords(text):
+            if category is None or category in self._owners[keyword]:
+                return True
+        return False
@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import asyncio
+import time
 
 from crew_app.agents.market_researcher import MarketResearcher
 from crew_app.agents.prompt_engineer import PromptEngineer
@@ -19,6 +20,15 @@ from templates.prompt_templates import PROMPT_TEMPLATES
 from validation.pre_code_validator import PreCodeValidator
 from validation.dependency_verifier import DependencyVerifier
 from pipeline_integration_manager import PipelineIntegrationManager
+from project_catalog import get_project_catalog
+from crew_app.cancellation import CancellationToken, OperationCancelled, ensure_token
+from crew_app.llm_cache import get_llm_cache
+from crew_app.llm_metrics import get_metrics_store, metrics_scope
+from crew_app.search_cache import get_search_cache
+from crew_app.code_stream import GeneratedCodeWriter
+from crew_app.section_store import SectionStore
+from crew_app.ttl_cache import CACHE_MODES
+from pipeline_status_store import get_status_store
 
 @dataclass
 class ProjectSpecification:
@@ -39,8 +49,10 @@ class Phase3Orchestrator:
     # DEBUG MODE: Set to True for faster testing with minimal iterations
     DEBUG_MODE = True  # Set to False for full processing
     
-    def __init__(self, projects_file: str = "../projects.json"):
+    def __init__(self, projects_file: str = "../projects.json", force_regenerate: bool = False):
         self.projects_file = Path(projects_file)
+        # Regenerate every code section even when its inputs are unchanged
+        self.force_regenerate = force_regenerate
         self.deliverables_dir = Path("../deliverables")
         self.deliverables_dir.mkdir(exist_ok=True)
         
@@ -57,11 +69,7 @@ class Phase3Orchestrator:
         
     def load_projects(self) -> List[Dict[str, Any]]:
         """Load projects from JSON file"""
-        if not self.projects_file.exists():
-            raise FileNotFoundError(f"Projects file not found: {self.projects_file}")
-        
-        with open(self.projects_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return get_project_catalog(self.projects_file).projects()
     
     def get_project_specification(self, project: Dict[str, Any]) -> ProjectSpecification:
         """Create project specification from project data"""
@@ -72,14 +80,15 @@ class Phase3Orchestrator:
             archetype=project.get("archetype", "CRUD")
         )
     
-    async def step1_market_research(self, spec: ProjectSpecification) -> ProjectSpecification:
+    async def step1_market_research(self, spec: ProjectSpecification, cancel_token: Optional[CancellationToken] = None) -> ProjectSpecification:
         """Step 1: Market research and analysis"""
         print(f"[INVESTIGATE] Step 1: Market Research for {spec.project_name}")
         
         research_result = await self.market_researcher.research_project(
             project_name=spec.project_name,
             description=spec.description,
-            tech_stack=spec.tech_stack
+            tech_stack=spec.tech_stack,
+            cancel_token=cancel_token
         )
         
         spec.market_research = research_result
@@ -173,53 +182,51 @@ class Phase3Orchestrator:
         print(f"[OK] Prompt template selected: {template_file}")
         return spec
     
-    async def step4_generate_code(self, spec: ProjectSpecification) -> ProjectSpecification:
+    async def step4_generate_code(self, spec: ProjectSpecification, cancel_token: Optional[CancellationToken] = None) -> ProjectSpecification:
         """Step 4: Generate code using Claude"""
         print(f"[CODE] Step 4: Generating Code for {spec.project_name}")
         
         if not spec.prompt_template:
             raise ValueError("Prompt template must be selected first")
         
+        # Files are written to generated_code/ and reported to the status stream as they complete
+        code_dir = self.deliverables_dir / f"{spec.project_name}/generated_code"
+        code_dir.mkdir(parents=True, exist_ok=True)
+        writer = GeneratedCodeWriter(code_dir)
+        # Input hash and files of each section, to skip sections whose inputs did not change
+        section_store = SectionStore(self.deliverables_dir / f"{spec.project_name}/code_sections", force=self.force_regenerate)
+        project_id = self.project_id_for(spec.project_name)
+        status_store = get_status_store()
+        
+        def on_file(section: str, file_path: str, content: str):
+            if writer.write(file_path, content) is not None:
+                status_store.update(
+                    project_id,
+                    create_if_missing=True,
+                    currentTask=f"Code Generation: {section}",
+                    lastGeneratedFile=file_path,
+                    generatedFiles=len(writer.written)
+                )
+        
         # Generate code using 5-prompt development plan
         generated_code = await self.claude_coder.generate_complete_application(
             project_name=spec.project_name,
             project_brief=spec.project_brief,
             prompt_template=spec.prompt_template,
-            market_research=spec.market_research
+            market_research=spec.market_research,
+            cancel_token=cancel_token,
+            on_file=on_file,
+            section_store=section_store
         )
         
         spec.generated_code = generated_code
         spec.status = "code_generated"
         
-        # Save generated code
-        code_dir = self.deliverables_dir / f"{spec.project_name}/generated_code"
-        code_dir.mkdir(exist_ok=True)
-        
-        # Save each component
-        for component, content in generated_code.items():
-            if component == "backend":
-                backend_dir = code_dir / "backend"
-                backend_dir.mkdir(exist_ok=True)
-                for file_path, file_content in content.items():
-                    full_path = backend_dir / file_path
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(full_path, 'w', encoding='utf-8') as f:
-                        f.write(file_content)
-            elif component == "frontend":
-                frontend_dir = code_dir / "frontend"
-                frontend_dir.mkdir(exist_ok=True)
-                for file_path, file_content in content.items():
-                    full_path = frontend_dir / file_path
-                    full_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(full_path, 'w', encoding='utf-8') as f:
-                        f.write(file_content)
-            else:
-                # Save other components as JSON
-                component_file = code_dir / f"{component}.json"
-                with open(component_file, 'w', encoding='utf-8') as f:
-                    json.dump(content, f, indent=2)
+        # Keep only the final files (drops files streamed by failed or out-hedged attempts)
+        writer.sync(generated_code)
         
         print(f"[OK] Code generation complete: {code_dir}")
+        print(f"[METRICS] {section_store.summary()}")
         return spec
     
     def step5_validate_and_verify(self, spec: ProjectSpecification) -> ProjectSpecification:
@@ -270,11 +277,16 @@ class Phase3Orchestrator:
         }
         return mapping.get(archetype.upper(), "CRUD")
     
-    async def process_project(self, project: Dict[str, Any]) -> ProjectSpecification:
-        """Process a single project through all pipeline steps"""
+    @staticmethod
+    def project_id_for(project_name: str) -> str:
+        return project_name.lower().replace(" ", "-").replace("&", "and")
+    
+    async def process_project(self, project: Dict[str, Any], cancel_token: Optional[CancellationToken] = None) -> ProjectSpecification:
+        """Process a single project through all pipeline steps (cancel_token is checked between steps and at every LLM/search call)"""
         
+        cancel_token = ensure_token(cancel_token)
         project_name = project['project_name']
-        project_id = project_name.lower().replace(" ", "-").replace("&", "and")
+        project_id = self.project_id_for(project_name)
         
         # Initialize to-do list for this project
         self.pipeline_integration.initialize_project_todos(project_name, project_id)
@@ -287,48 +299,62 @@ class Phase3Orchestrator:
             archetype=project.get('archetype', 'CRUD')
         )
         
-        try:
-            # Step 1: Market Research
-            self.pipeline_integration.start_agent_work(project_id, "market_research")
-            spec = await self.step1_market_research(spec)
-            self.pipeline_integration.complete_step(project_id, "market_research", True)
+        # Tag every LLM/search call made for this project in the metrics store
+        started_at = time.time()
+        with metrics_scope(project_id=project_id):
+            try:
+                # Step 1: Market Research
+                cancel_token.raise_if_cancelled("market_research")
+                self.pipeline_integration.start_agent_work(project_id, "market_research")
+                spec = await self.step1_market_research(spec, cancel_token)
+                self.pipeline_integration.complete_step(project_id, "market_research", True)
             
-            # Step 2: Create Project Brief
-            self.pipeline_integration.start_agent_work(project_id, "project_brief")
-            spec = await self.step2_create_project_brief(spec)
-            self.pipeline_integration.complete_step(project_id, "project_brief", True)
+                # Step 2: Create Project Brief
+                cancel_token.raise_if_cancelled("project_brief")
+                self.pipeline_integration.start_agent_work(project_id, "project_brief")
+                spec = self.step2_create_project_brief(spec)
+                self.pipeline_integration.complete_step(project_id, "project_brief", True)
             
-            # Step 3: Select Prompt Template
-            self.pipeline_integration.start_agent_work(project_id, "prompt_template")
-            spec = await self.step3_select_prompt_template(spec)
-            self.pipeline_integration.complete_step(project_id, "prompt_template", True)
+                # Step 3: Select Prompt Template
+                cancel_token.raise_if_cancelled("prompt_template")
+                self.pipeline_integration.start_agent_work(project_id, "prompt_template")
+                spec = self.step3_select_prompt_template(spec)
+                self.pipeline_integration.complete_step(project_id, "prompt_template", True)
             
-            # Step 4: Generate Code
-            self.pipeline_integration.start_agent_work(project_id, "backend_code")
-            spec = await self.step4_generate_code(spec)
-            self.pipeline_integration.complete_step(project_id, "backend_code", True)
+                # Step 4: Generate Code
+                cancel_token.raise_if_cancelled("backend_code")
+                self.pipeline_integration.start_agent_work(project_id, "backend_code")
+                spec = await self.step4_generate_code(spec, cancel_token)
+                self.pipeline_integration.complete_step(project_id, "backend_code", True)
             
-            # Step 5: Validation
-            self.pipeline_integration.start_agent_work(project_id, "validation")
-            spec = self.step5_validate_and_verify(spec)
-            self.pipeline_integration.complete_step(project_id, "validation", spec.status != "validation_failed")
+                # Step 5: Validation
+                cancel_token.raise_if_cancelled("validation")
+                self.pipeline_integration.start_agent_work(project_id, "validation")
+                spec = self.step5_validate_and_verify(spec)
+                self.pipeline_integration.complete_step(project_id, "validation", spec.status != "validation_failed")
             
-            # Update final project status
-            self.pipeline_integration.update_project_status(project_id, spec.status)
+                # Update final project status
+                self.pipeline_integration.update_project_status(project_id, spec.status)
             
-            print(f"\n[SUCCESS] Project Complete: {project_name}")
-            print(f"Status: {spec.status}")
+                print(f"\n[SUCCESS] Project Complete: {project_name}")
+                print(f"Status: {spec.status}")
+                print(f"[METRICS] {get_metrics_store().format_summary(project_id, since=started_at)}")
             
-        except Exception as e:
-            print(f"[ERROR] Error processing {project_name}: {e}")
-            # Mark current step as failed
-            self.pipeline_integration.complete_step(project_id, "current_step", False)
-            spec.status = "error"
+            except OperationCancelled as e:
+                print(f"[STOP] Processing cancelled for {project_name}: {e}")
+                self.pipeline_integration.update_project_status(project_id, "cancelled")
+                spec.status = "cancelled"
+            except Exception as e:
+                print(f"[ERROR] Error processing {project_name}: {e}")
+                # Mark current step as failed
+                self.pipeline_integration.complete_step(project_id, "current_step", False)
+                spec.status = "error"
         
         return spec
     
-    async def process_all_projects(self, start_index: int = 0, end_index: Optional[int] = None) -> List[ProjectSpecification]:
+    async def process_all_projects(self, start_index: int = 0, end_index: Optional[int] = None, cancel_token: Optional[CancellationToken] = None) -> List[ProjectSpecification]:
         """Process all projects through the pipeline"""
+        cancel_token = ensure_token(cancel_token)
         print(f"[LAUNCH] Starting Phase 3: Research → Prompt → Code")
         print(f"Total projects: {len(self.projects)}")
         
@@ -347,11 +373,15 @@ class Phase3Orchestrator:
                 print("  [CONFIG] DEBUG_MODE: Limiting to first project only")
                 break
             
+            if cancel_token.cancelled:
+                print("[STOP] Phase 3 cancelled, skipping remaining projects")
+                break
+            
             print(f"\n[LAUNCH] Processing Project: {project['project_name']}")
             print("=" * 60)
             
             try:
-                result = await self.process_project(project)
+                result = await self.process_project(project, cancel_token)
                 results.append(result)
                 
                 # In debug mode, add a small delay between projects
@@ -368,6 +398,8 @@ class Phase3Orchestrator:
         
         print(f"\n[SUCCESS] Phase 3 Complete!")
         print(f"Processed: {len(results)} projects")
+        print(f"[METRICS] {get_llm_cache().summary()}")
+        print(f"[METRICS] {get_search_cache().summary()}")
         
         return results
     
@@ -403,10 +435,18 @@ def main():
     parser.add_argument('--start', type=int, help='Start index for processing projects')
     parser.add_argument('--end', type=int, help='End index for processing projects')
     parser.add_argument('--step5-only', action='store_true', help='Run only Step 5 (validation) without LLM calls')
+    parser.add_argument('--llm-cache', choices=CACHE_MODES, help='LLM response cache: on (default), refresh (ignore cached answers) or off')
+    parser.add_argument('--search-cache', choices=CACHE_MODES, help='Tavily search cache: on (default), refresh (ignore cached results) or off')
+    parser.add_argument('--force', action='store_true', help='Regenerate every code section, even those whose inputs are unchanged')
     
     args = parser.parse_args()
     
-    orchestrator = Phase3Orchestrator()
+    if args.llm_cache:
+        get_llm_cache().set_mode(args.llm_cache)
+    if args.search_cache:
+        get_search_cache().set_mode(args.search_cache)
+    
+    orchestrator = Phase3Orchestrator(force_regenerate=args.force)
     
     if args.step5_only:
         # Test only Step 5 (validation) without expensive LLM calls
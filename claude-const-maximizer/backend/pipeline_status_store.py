@@ -0,0 +1,367 @@
+"""
+Pipeline Status Store
+Per-project status persistence for the Pipeline Status API (SQLite-WAL by default)
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from crew_app.sqlite_utils import ThreadLocalConnections
+
+DEFAULT_DB_PATH = Path("pipeline_status.db")
+LEGACY_JSON_PATH = Path("pipeline_status.json")
+
+# Large fields are left out of change events; clients fetch them on demand
+EVENT_EXCLUDED_FIELDS = {"result"}
+EVENT_RETENTION = 10000
+
+
+class PipelineStatusStore(ABC):
+    """Interface shared by all pipeline status backends.
+
+    Every method works on a single project record so callers never have to
+    read or rewrite the status of unrelated projects.
+    """
+
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Return the status record for one project, or None"""
+
+    @abstractmethod
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        """Return all status records keyed by project id"""
+
+    @abstractmethod
+    def upsert(self, project_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the full status record for one project"""
+
+    @abstractmethod
+    def update(self, project_id: str, create_if_missing: bool = False, **fields) -> Optional[Dict[str, Any]]:
+        """Merge fields into one project's record; returns None if it does not exist"""
+
+    @abstractmethod
+    def update_all(self, **fields) -> int:
+        """Merge fields into every project's record; returns the number updated"""
+
+    supports_events = False
+
+    def latest_event_id(self) -> int:
+        """Return the id of the newest change event (0 if none)"""
+        return 0
+
+    def oldest_event_id(self) -> int:
+        """Return the id of the oldest change event still retained (0 if none)"""
+        return 0
+
+    def events_since(self, last_event_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Return change events newer than last_event_id, oldest first"""
+        return []
+
+    @staticmethod
+    def _stamp(record: Dict[str, Any]) -> Dict[str, Any]:
+        record["lastUpdated"] = datetime.now().isoformat()
+        return record
+
+    @staticmethod
+    def _delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields of new that differ from old, minus large excluded fields"""
+        delta = {k: v for k, v in new.items() if k not in EVENT_EXCLUDED_FIELDS and old.get(k) != v}
+        if any(k in new and old.get(k) != new[k] for k in EVENT_EXCLUDED_FIELDS):
+            delta["resultAvailable"] = bool(new.get("result"))
+        return delta
+
+
+def _load_legacy_json(json_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the legacy pipeline_status.json, backing it up if it is corrupted"""
+    if not json_path.exists():
+        return {}
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except json.JSONDecodeError as e:
+        print(f"⚠️ Warning: Corrupted {json_path.name}: {e}")
+        try:
+            backup_name = f"{json_path.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            shutil.copy(json_path, json_path.with_name(backup_name))
+            print(f"📁 Corrupted file backed up as: {backup_name}")
+        except Exception:
+            pass
+        return {}
+
+
+class SQLitePipelineStatusStore(PipelineStatusStore):
+    """SQLite (WAL mode) backend with one row per project.
+
+    Writes are single-row upserts; read-modify-write merges run inside a
+    ``BEGIN IMMEDIATE`` transaction so concurrent writers cannot lose updates.
+    Each write also appends a per-project delta to ``status_events`` in the
+    same transaction, which backs the resumable progress stream.
+    """
+
+    supports_events = True
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, legacy_json_path: Optional[Path] = LEGACY_JSON_PATH):
+        self.db_path = Path(db_path)
+        self._db = ThreadLocalConnections(self.db_path)
+        self._init_schema()
+
+        if legacy_json_path is not None:
+            migrated = self.migrate_from_json(Path(legacy_json_path))
+            if migrated:
+                print(f"📦 Migrated {migrated} project(s) from {legacy_json_path} into {self.db_path}")
+
+    def _init_schema(self):
+        conn = self._db.connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS project_status ("
+            " project_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " last_updated TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS status_events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " project_id TEXT NOT NULL,"
+            " event_type TEXT NOT NULL,"
+            " delta TEXT NOT NULL,"
+            " created_at TEXT NOT NULL)"
+        )
+
+    def _write(self, conn: sqlite3.Connection, project_id: str, record: Dict[str, Any]):
+        conn.execute(
+            "INSERT INTO project_status (project_id, data, last_updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(project_id) DO UPDATE SET data = excluded.data, last_updated = excluded.last_updated",
+            (project_id, json.dumps(record, default=str), record.get("lastUpdated", "")),
+        )
+
+    def _append_event(self, conn: sqlite3.Connection, project_id: str, event_type: str, delta: Dict[str, Any]):
+        if not delta:
+            return
+        cursor = conn.execute(
+            "INSERT INTO status_events (project_id, event_type, delta, created_at) VALUES (?, ?, ?, ?)",
+            (project_id, event_type, json.dumps(delta, default=str), datetime.now().isoformat()),
+        )
+        # Bounded event log: trim old events every 1000 inserts
+        if cursor.lastrowid % 1000 == 0:
+            conn.execute("DELETE FROM status_events WHERE id <= ?", (cursor.lastrowid - EVENT_RETENTION,))
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        row = self._db.connect().execute(
+            "SELECT data FROM project_status WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        rows = self._db.connect().execute("SELECT project_id, data FROM project_status").fetchall()
+        return {project_id: json.loads(data) for project_id, data in rows}
+
+    def upsert(self, project_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        record = self._stamp(dict(record))
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write(conn, project_id, record)
+            self._append_event(conn, project_id, "replace", self._delta({}, record))
+            conn.execute("COMMIT")
+            return record
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update(self, project_id: str, create_if_missing: bool = False, **fields) -> Optional[Dict[str, Any]]:
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM project_status WHERE project_id = ?", (project_id,)).fetchone()
+            if row is None and not create_if_missing:
+                conn.execute("COMMIT")
+                return None
+            previous = json.loads(row[0]) if row else {"projectId": project_id}
+            record = dict(previous)
+            record.update(fields)
+            self._write(conn, project_id, self._stamp(record))
+            self._append_event(conn, project_id, "update" if row else "replace", self._delta(previous if row else {}, record))
+            conn.execute("COMMIT")
+            return record
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_all(self, **fields) -> int:
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT project_id, data FROM project_status").fetchall()
+            for project_id, data in rows:
+                previous = json.loads(data)
+                record = dict(previous)
+                record.update(fields)
+                self._write(conn, project_id, self._stamp(record))
+                self._append_event(conn, project_id, "update", self._delta(previous, record))
+            conn.execute("COMMIT")
+            return len(rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def latest_event_id(self) -> int:
+        row = self._db.connect().execute("SELECT MAX(id) FROM status_events").fetchone()
+        return row[0] or 0
+
+    def oldest_event_id(self) -> int:
+        row = self._db.connect().execute("SELECT MIN(id) FROM status_events").fetchone()
+        return row[0] or 0
+
+    def events_since(self, last_event_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+        rows = self._db.connect().execute(
+            "SELECT id, project_id, event_type, delta, created_at FROM status_events"
+            " WHERE id > ? ORDER BY id LIMIT ?",
+            (last_event_id, limit),
+        ).fetchall()
+        return [
+            {"id": event_id, "projectId": project_id, "type": event_type, "delta": json.loads(delta), "timestamp": created_at}
+            for event_id, project_id, event_type, delta, created_at in rows
+        ]
+
+    def migrate_from_json(self, json_path: Path = LEGACY_JSON_PATH, force: bool = False) -> int:
+        """Import the legacy pipeline_status.json once.
+
+        Rows already present in the database are kept, so re-running the
+        migration never overwrites newer status written through the store.
+        """
+        conn = self._db.connect()
+        marker = conn.execute("SELECT value FROM store_meta WHERE key = 'migrated_from_json'").fetchone()
+        if marker and not force:
+            return 0
+
+        legacy = _load_legacy_json(Path(json_path))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrated = 0
+            for project_id, record in legacy.items():
+                if not isinstance(record, dict):
+                    continue
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO project_status (project_id, data, last_updated) VALUES (?, ?, ?)",
+                    (project_id, json.dumps(record, default=str), record.get("lastUpdated", "")),
+                )
+                migrated += cursor.rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.now().isoformat(),),
+            )
+            conn.execute("COMMIT")
+            return migrated
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class JsonFilePipelineStatusStore(PipelineStatusStore):
+    """Legacy single-file backend, kept for tooling that still expects pipeline_status.json.
+
+    Writes are serialized with a lock and replaced atomically, but every write
+    still rewrites the whole file - prefer the SQLite backend.
+    """
+
+    def __init__(self, json_path: Path = LEGACY_JSON_PATH):
+        self.json_path = Path(json_path)
+        self._lock = threading.Lock()
+
+    def _save(self, status: Dict[str, Dict[str, Any]]):
+        tmp_path = self.json_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2, default=str)
+        os.replace(tmp_path, self.json_path)
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        return _load_legacy_json(self.json_path).get(project_id)
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        return _load_legacy_json(self.json_path)
+
+    def upsert(self, project_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            status = _load_legacy_json(self.json_path)
+            status[project_id] = self._stamp(dict(record))
+            self._save(status)
+            return status[project_id]
+
+    def update(self, project_id: str, create_if_missing: bool = False, **fields) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            status = _load_legacy_json(self.json_path)
+            if project_id not in status and not create_if_missing:
+                return None
+            record = status.setdefault(project_id, {"projectId": project_id})
+            record.update(fields)
+            self._stamp(record)
+            self._save(status)
+            return record
+
+    def update_all(self, **fields) -> int:
+        with self._lock:
+            status = _load_legacy_json(self.json_path)
+            for record in status.values():
+                if isinstance(record, dict):
+                    record.update(fields)
+                    self._stamp(record)
+            self._save(status)
+            return len(status)
+
+
+STORE_BACKENDS = {
+    "sqlite": lambda: SQLitePipelineStatusStore(Path(os.getenv("PIPELINE_STATUS_DB", str(DEFAULT_DB_PATH)))),
+    "json": lambda: JsonFilePipelineStatusStore(LEGACY_JSON_PATH),
+}
+
+_store: Optional[PipelineStatusStore] = None
+_store_lock = threading.Lock()
+
+
+def get_status_store() -> PipelineStatusStore:
+    """Return the process-wide status store selected by PIPELINE_STATUS_BACKEND (default: sqlite)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = os.getenv("PIPELINE_STATUS_BACKEND", "sqlite").lower()
+                if backend not in STORE_BACKENDS:
+                    raise ValueError(f"Unknown PIPELINE_STATUS_BACKEND: {backend} (expected one of {list(STORE_BACKENDS)})")
+                _store = STORE_BACKENDS[backend]()
+    return _store
+
+
+def main():
+    """Command line entry point for migrating or exporting pipeline status"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pipeline status store maintenance')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='SQLite database path')
+    parser.add_argument('--migrate', metavar='JSON', help='Import a legacy pipeline_status.json (existing rows are kept)')
+    parser.add_argument('--export', metavar='JSON', help='Export all project status to a JSON file')
+
+    args = parser.parse_args()
+    store = SQLitePipelineStatusStore(Path(args.db), legacy_json_path=None)
+
+    if args.migrate:
+        migrated = store.migrate_from_json(Path(args.migrate), force=True)
+        print(f"[OK] Migrated {migrated} project(s) from {args.migrate} into {args.db}")
+
+    if args.export:
+        status = store.get_all()
+        with open(args.export, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2, default=str)
+        print(f"[OK] Exported {len(status)} project(s) to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
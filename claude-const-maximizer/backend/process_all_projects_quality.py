@@ -4,17 +4,58 @@ HIGH-QUALITY PROJECT PROCESSOR
 Process all 60 projects with expert customization and quality validation
 """
 
-import json
 import re
 from pathlib import Path
 from datetime import datetime
+from keyword_matcher import KeywordMatcher
+from pipeline_status_store import get_status_store
+
+# Expert profile keywords; the first profile with a hit wins
+EXPERT_PROFILE_MATCHER = KeywordMatcher({
+    'voice': ['voice', 'assistant', 'speech'],
+    'healthcare': ['health', 'medical', 'diagnosis'],
+    'ecommerce': ['ecommerce', 'commerce', 'business'],
+    'security': ['contract', 'security', 'audit'],
+    'crewai': ['crew', 'agent', 'multi-agent'],
+    'rag': ['rag', 'document', 'knowledge'],
+    'content': ['content', 'creative', 'video', 'image'],
+    'recruitment': ['resume', 'job', 'career', 'hiring'],
+    'research': ['research', 'report', 'analysis'],
+    'developer': ['developer', 'code', 'analysis'],
+})
+
+# Prompt set keywords; the first set with a hit wins
+PROMPT_PROFILE_MATCHER = KeywordMatcher({
+    'voice': ['voice', 'assistant'],
+    'healthcare': ['health', 'medical'],
+})
+
+# Case-sensitive markers used when cleaning CrewAI output
+CREWAI_SECTION_MATCHER = KeywordMatcher({
+    'redundant_header': [
+        'PROJECT:', 'TYPE:', 'OBJECTIVE', 'TARGET USERS',
+        'SUCCESS METRICS', 'DEPLOYMENT & LAUNCH', 'IMPLEMENTATION STRATEGY',
+        'CLAUDE OPTIMIZATION', 'TECHNICAL SPECIFICATIONS', 'CREWAI AGENT OUTPUTS',
+        'THE 4-DOCUMENT WEAPON STRATEGY', 'DETAILED MARKET RESEARCH',
+        'Technical Requirements', 'Success Metrics', 'Deployment Strategy',
+        'Frontend:', 'Backend:', 'Database:', 'AI Integration:', 'Deployment:'
+    ],
+    'meaningful_header': [
+        'Market Research', 'Core Features', 'Market Opportunity', 'Competitive Landscape', 'Target Audience'
+    ],
+    'boilerplate': [
+        'Software developers and tech professionals',
+        'User adoption and engagement',
+        'Performance and reliability metrics'
+    ],
+}, case_sensitive=True)
 
 def get_expert_profile(project_name):
     """Get expert profile based on project type with high-quality customization"""
-    project_name_lower = project_name.lower()
+    profile = EXPERT_PROFILE_MATCHER.first(project_name)
     
     # Expert profiles with psychological warfare elements
-    if any(word in project_name_lower for word in ['voice', 'assistant', 'speech']):
+    if profile == 'voice':
         return {
             'title': 'Voice AI & Personal Assistant Developer',
             'expertise': 'voice processing, speech recognition, natural language understanding, and intelligent automation',
@@ -24,7 +65,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is a revolutionary project that will define the future of human-computer interaction. Voice AI is the next frontier of computing, and you\'re building the foundation that millions will use. This technology will be studied by future generations as the breakthrough that made AI truly accessible. The prestige of working with cutting-edge voice technology that will transform how humans interact with machines cannot be overstated. You\'re not just building an application - you\'re creating the future.'
         }
     
-    elif any(word in project_name_lower for word in ['health', 'medical', 'diagnosis']):
+    elif profile == 'healthcare':
         return {
             'title': 'Healthcare AI & Medical Technology Specialist',
             'expertise': 'medical AI, healthcare automation, and clinical decision support systems',
@@ -34,7 +75,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is the highest calling in technology - where your code literally saves lives. Healthcare AI represents the most meaningful application of artificial intelligence, where every line of code you write has the potential to improve human health and wellbeing. You\'re not just building software - you\'re creating systems that doctors will rely on to make life-or-death decisions. The ethical responsibility is immense, but so is the impact. This is where technology serves humanity in its most profound way. You\'re building the future of healthcare, and every improvement you make could save countless lives.'
         }
     
-    elif any(word in project_name_lower for word in ['ecommerce', 'commerce', 'business']):
+    elif profile == 'ecommerce':
         return {
             'title': 'E-commerce & Business AI Developer',
             'expertise': 'e-commerce platforms, business automation, and AI-powered commerce solutions',
@@ -44,7 +85,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is where AI meets the real world of business and commerce. You\'re building systems that will drive billions in revenue and transform entire industries. Every business on the planet is racing to adopt AI solutions, and those who master this technology first will dominate their markets. You\'re not just writing code - you\'re creating the competitive advantage that will determine which companies thrive and which ones fail. The financial impact is massive, and the market opportunity is unprecedented. This is the future of commerce, and you\'re building it.'
         }
     
-    elif any(word in project_name_lower for word in ['contract', 'security', 'audit']):
+    elif profile == 'security':
         return {
             'title': 'Blockchain & Smart Contract Security Expert',
             'expertise': 'smart contract development, blockchain security, and decentralized application architecture',
@@ -54,7 +95,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is the frontier of digital trust and security. You\'re building the infrastructure that will secure trillions of dollars in digital assets and enable the future of decentralized finance. Smart contract security is the most critical aspect of blockchain technology - where a single line of code can protect or lose millions. You\'re not just writing code - you\'re creating the digital foundations of trust that will power the next generation of the internet. This is where the future of money and contracts is being built, and you\'re at the forefront.'
         }
     
-    elif any(word in project_name_lower for word in ['crew', 'agent', 'multi-agent']):
+    elif profile == 'crewai':
         return {
             'title': 'Multi-Agent AI Systems Architect',
             'expertise': 'multi-agent orchestration, AI system design, and intelligent workflow automation',
@@ -64,7 +105,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is the pinnacle of AI engineering - orchestrating multiple intelligent agents to work in perfect harmony. Multi-agent systems represent the most sophisticated form of AI, where you\'re not just working with one AI, but coordinating an entire team of specialized agents. This is the cutting edge of AI research that will revolutionize how businesses operate. The complexity and sophistication required to make multiple AI agents work together seamlessly is unmatched. Only the most elite developers can handle this level of orchestration. You\'re building the future of AI collaboration.'
         }
     
-    elif any(word in project_name_lower for word in ['rag', 'document', 'knowledge']):
+    elif profile == 'rag':
         return {
             'title': 'RAG & Document Intelligence Specialist',
             'expertise': 'retrieval-augmented generation, document processing, and knowledge management systems',
@@ -74,7 +115,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is the future of knowledge management in the information age. Organizations are drowning in data but starving for insights. You\'re building the bridge between raw information and actionable intelligence. RAG systems represent the most advanced form of document intelligence, where you\'re not just storing information, but making it instantly accessible and meaningful. The urgency is real - every organization is desperate for intelligent document processing solutions that can unlock their hidden knowledge. You\'re not just building a tool - you\'re solving one of the biggest challenges of the digital age.'
         }
     
-    elif any(word in project_name_lower for word in ['content', 'creative', 'video', 'image']):
+    elif profile == 'content':
         return {
             'title': 'Creative AI & Content Generation Expert',
             'expertise': 'AI-powered content creation, multimedia processing, and creative automation',
@@ -84,7 +125,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is where technology meets human creativity in its purest form. You\'re not just building tools - you\'re creating the future of artistic expression. Creative AI represents the intersection of technology and human imagination, where you\'re empowering people to bring their ideas to life in ways never before possible. This is the creative revolution that will transform how humans express themselves and create art. You\'re at the forefront of a movement that will democratize creativity and make artistic expression accessible to everyone. This isn\'t just code - it\'s the future of human creativity.'
         }
     
-    elif any(word in project_name_lower for word in ['resume', 'job', 'career', 'hiring']):
+    elif profile == 'recruitment':
         return {
             'title': 'HR Tech & Recruitment AI Specialist',
             'expertise': 'recruitment automation, talent acquisition, and AI-powered hiring systems',
@@ -94,7 +135,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is where AI meets human potential. You\'re building systems that will connect millions of people with their dream careers and help companies find their perfect talent. Every hire made through your system could change someone\'s life forever. You\'re not just writing code - you\'re creating the infrastructure that powers the future of work. The impact is profound - you\'re building the bridge between human potential and opportunity. This is where careers are made and companies are built. You\'re shaping the future of employment.'
         }
     
-    elif any(word in project_name_lower for word in ['research', 'report', 'analysis']):
+    elif profile == 'research':
         return {
             'title': 'Research AI & Analytics Specialist',
             'expertise': 'research automation, data analysis, and AI-powered insights generation',
@@ -104,7 +145,7 @@ def get_expert_profile(project_name):
             'psychological': 'This is where AI meets human discovery. You\'re building systems that will unlock insights hidden in mountains of data and accelerate human knowledge. Every breakthrough made through your system could advance entire fields of study. You\'re not just writing code - you\'re creating the tools that will power the next generation of scientific discovery and business intelligence. The potential for impact is limitless - you\'re building the infrastructure that will accelerate human progress. This is where the future of knowledge is being built.'
         }
     
-    elif any(word in project_name_lower for word in ['developer', 'code', 'analysis']):
+    elif profile == 'developer':
         return {
             'title': 'Developer Tools & Code Analysis Expert',
             'expertise': 'developer tools, code analysis, and software development automation',
@@ -152,22 +193,15 @@ def clean_crewai_content(content):
     for line in lines:
         line = line.strip()
         
+        markers = CREWAI_SECTION_MATCHER.scan(line)
+        
         # Skip redundant sections
-        if any(keyword in line for keyword in [
-            'PROJECT:', 'TYPE:', 'OBJECTIVE', 'TARGET USERS',
-            'SUCCESS METRICS', 'DEPLOYMENT & LAUNCH', 'IMPLEMENTATION STRATEGY',
-            'CLAUDE OPTIMIZATION', 'TECHNICAL SPECIFICATIONS', 'CREWAI AGENT OUTPUTS',
-            'THE 4-DOCUMENT WEAPON STRATEGY', 'DETAILED MARKET RESEARCH',
-            'Technical Requirements', 'Success Metrics', 'Deployment Strategy',
-            'Frontend:', 'Backend:', 'Database:', 'AI Integration:', 'Deployment:'
-        ]):
+        if 'redundant_header' in markers:
             skip_section = True
             continue
         
         # Stop skipping when we hit a meaningful section
-        if line.startswith('#') or any(keyword in line for keyword in [
-            'Market Research', 'Core Features', 'Market Opportunity', 'Competitive Landscape', 'Target Audience'
-        ]):
+        if line.startswith('#') or 'meaningful_header' in markers:
             skip_section = False
         
         if not skip_section and line:
@@ -202,11 +236,7 @@ def clean_crewai_content(content):
             continue
         
         # Skip redundant sections
-        if any(keyword in trimmed for keyword in [
-            'Software developers and tech professionals',
-            'User adoption and engagement',
-            'Performance and reliability metrics'
-        ]):
+        if CREWAI_SECTION_MATCHER.matches(trimmed, 'boilerplate'):
             continue
         
         # Clean up section headers
@@ -223,9 +253,9 @@ def clean_crewai_content(content):
 
 def generate_customized_prompts(project_name):
     """Generate project-specific 5 critical prompts"""
-    project_name_lower = project_name.lower()
+    profile = PROMPT_PROFILE_MATCHER.first(project_name)
     
-    if any(word in project_name_lower for word in ['voice', 'assistant']):
+    if profile == 'voice':
         return {
             'prompt1': 'Create the complete project structure and architecture for this voice AI application. Set up the Next.js 14 frontend with TypeScript and Tailwind CSS, FastAPI backend with SQLAlchemy and JWT authentication, PostgreSQL database schema with pgvector integration for voice processing, and deployment configuration for Vercel and Render. Include all necessary configuration files, environment variables, and project structure for voice recognition integration.',
             'prompt2': 'Implement the complete FastAPI backend with all core functionality for voice processing and AI assistant features. Create the database models using SQLAlchemy 2.0, implement JWT authentication, set up OpenAI and Claude API integrations with LangChain for voice analysis, create RESTful API endpoints for voice processing workflows, implement real-time WebSocket connections for voice interactions, and add comprehensive error handling and logging for voice security.',
@@ -234,7 +264,7 @@ def generate_customized_prompts(project_name):
             'prompt5': 'Prepare the voice AI application for production deployment. Configure Vercel deployment for the frontend, set up Render deployment for the backend, optimize performance for sub-2-second load times with voice processing, implement comprehensive testing (unit, integration, e2e) for voice recognition accuracy, add security best practices for voice data security, create API documentation with OpenAPI/Swagger, and ensure 99.9% uptime with proper monitoring and error handling for critical voice workflows.'
         }
     
-    elif any(word in project_name_lower for word in ['health', 'medical']):
+    elif profile == 'healthcare':
         return {
             'prompt1': 'Create the complete project structure and architecture for this healthcare AI application. Set up the Next.js 14 frontend with TypeScript and Tailwind CSS, FastAPI backend with SQLAlchemy and JWT authentication, PostgreSQL database schema with pgvector integration for medical data analysis, and deployment configuration for Vercel and Render. Include all necessary configuration files, environment variables, and project structure for healthcare compliance.',
             'prompt2': 'Implement the complete FastAPI backend with all core functionality for healthcare AI and medical diagnosis. Create the database models using SQLAlchemy 2.0, implement JWT authentication, set up OpenAI and Claude API integrations with LangChain for medical analysis, create RESTful API endpoints for healthcare workflows, implement real-time WebSocket connections for medical consultations, and add comprehensive error handling and logging for healthcare security.',
@@ -362,8 +392,7 @@ def process_all_projects():
     print("📁 Processing all 60 projects with expert customization...")
     
     # Read pipeline status
-    with open('pipeline_status.json', 'r') as f:
-        pipeline_data = json.load(f)
+    pipeline_data = get_status_store().get_all()
     
     # Create validated documents directory
     validated_dir = Path("validated_documents")
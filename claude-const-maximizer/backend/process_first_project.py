@@ -4,9 +4,9 @@ MANUAL PROJECT PROCESSOR
 Process the first completed project through our 3-step optimization workflow
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
+from pipeline_status_store import get_status_store
 import re
 
 def generate_role_establishment(project_name):
@@ -230,8 +230,7 @@ def process_first_project():
     print("🎯 PROCESSING FIRST COMPLETED PROJECT")
     
     # Read pipeline status
-    with open('pipeline_status.json', 'r') as f:
-        pipeline_data = json.load(f)
+    pipeline_data = get_status_store().get_all()
     
     # Find the first completed project
     completed_project = None
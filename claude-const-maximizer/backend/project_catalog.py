@@ -0,0 +1,91 @@
+"""
+Project Catalog
+Shared, mtime-invalidated view of projects.json with a slug -> project index
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PROJECTS_PATH = Path(__file__).resolve().parent.parent / "projects.json"
+
+
+def project_slugs(project_name: str) -> List[str]:
+    """Every slug form the pipeline uses for a project name.
+
+    The status API keys projects by ``name.lower().replace(" ", "-")`` (with or
+    without "&" spelled out) and the tagger uses an alphanumeric-only slug; all
+    of them resolve to the same catalog entry.
+    """
+    lowered = project_name.lower()
+    slugs = [
+        lowered.replace(" ", "-"),
+        lowered.replace(" ", "-").replace("&", "and"),
+        "".join(ch if ch.isalnum() else "-" for ch in lowered).strip("-"),
+    ]
+    return list(dict.fromkeys(slugs))
+
+
+class ProjectCatalog:
+    """Parses projects.json once and re-reads it only when the file changes.
+
+    Returned project dicts are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PROJECTS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._projects: List[Dict[str, Any]] = []
+        self._by_slug: Dict[str, Dict[str, Any]] = {}
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Projects file not found: {self.path}")
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature == self._signature:
+                return
+            with open(self.path, 'r', encoding='utf-8') as f:
+                projects = json.load(f)
+
+            by_slug = {}
+            for project in projects:
+                for slug in project_slugs(project.get("project_name", "")):
+                    by_slug.setdefault(slug, project)
+
+            self._projects = projects
+            self._by_slug = by_slug
+            self._signature = signature
+
+    def projects(self) -> List[Dict[str, Any]]:
+        """All projects in file order"""
+        self._refresh()
+        return list(self._projects)
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Project for a slug (any form produced by project_slugs), or None"""
+        self._refresh()
+        return self._by_slug.get(slug.lower())
+
+
+_catalogs: Dict[Path, ProjectCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_project_catalog(path: Optional[Path] = None) -> ProjectCatalog:
+    """Process-wide catalog for a projects file (default: the repo's projects.json)"""
+    resolved = Path(path).resolve() if path else DEFAULT_PROJECTS_PATH
+    with _catalogs_lock:
+        if resolved not in _catalogs:
+            _catalogs[resolved] = ProjectCatalog(resolved)
+        return _catalogs[resolved]
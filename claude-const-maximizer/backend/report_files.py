@@ -0,0 +1,163 @@
+"""
+Report Files
+Lightweight manifests, single-file streaming and streaming zip archives for pipeline-complete reports
+"""
+
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+HASH_CACHE_SIZE = 4096
+
+# Where each report file source lives, relative to the backend directory
+FILE_SOURCES = {
+    "generated": lambda project_id: Path("project_data") / project_id / "generated_code",
+    "boilerplate": lambda project_id: Path("templates/boilerplates/backend") / project_id,
+}
+
+_hash_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_lock = threading.Lock()
+
+
+def source_root(source: str, project_id: str) -> Optional[Path]:
+    """Root directory of a file source for a project, or None for an unknown source"""
+    factory = FILE_SOURCES.get(source)
+    return factory(project_id) if factory else None
+
+
+def content_hash(file_path: Path) -> str:
+    """sha256 of a file, read in chunks and cached by (path, mtime, size)"""
+    stat = file_path.stat()
+    key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        if key in _hash_cache:
+            _hash_cache.move_to_end(key)
+            return _hash_cache[key]
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+
+    with _hash_lock:
+        _hash_cache[key] = value
+        if len(_hash_cache) > HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+    return value
+
+
+def build_manifest(root: Path, suffixes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Describe every file under root (name, path, size, type) from a directory walk and stat only"""
+    if not root.exists():
+        return []
+
+    manifest = []
+    for file_path in sorted(root.rglob("*")):
+        if not file_path.is_file():
+            continue
+        if suffixes is not None and file_path.suffix not in suffixes:
+            continue
+        try:
+            manifest.append({
+                "name": file_path.name,
+                "path": file_path.relative_to(root).as_posix(),
+                "size": file_path.stat().st_size,
+                "type": file_path.suffix
+            })
+        except OSError as e:
+            print(f"Could not index {file_path}: {e}")
+    return manifest
+
+
+def paginate(items: List[Dict[str, Any]], offset: int, limit: int) -> Dict[str, Any]:
+    """Slice a manifest and describe the page"""
+    offset = max(offset, 0)
+    page = items[offset:offset + limit]
+    next_offset = offset + len(page)
+    return {
+        "files": page,
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "nextOffset": next_offset if next_offset < len(items) else None
+    }
+
+
+def add_hashes(root: Path, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill in the content hash of manifest entries, e.g. only those on the page being returned"""
+    for entry in entries:
+        try:
+            entry["hash"] = content_hash(root / entry["path"])
+        except OSError as e:
+            print(f"Could not hash {entry['path']}: {e}")
+            entry["hash"] = None
+    return entries
+
+
+def resolve_file(root: Path, relative_path: str) -> Optional[Path]:
+    """Resolve a manifest path under root; None if missing or outside root"""
+    root = root.resolve()
+    candidate = (root / relative_path).resolve()
+    if root not in candidate.parents or not candidate.is_file():
+        return None
+    return candidate
+
+
+def iter_file(file_path: Path) -> Iterator[bytes]:
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            yield chunk
+
+
+class _ZipBuffer:
+    """Write-only sink that lets zipfile stream into a generator"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(root: Path, arc_prefix: str = "") -> Iterator[bytes]:
+    """Stream a directory tree as a zip archive, one chunk at a time"""
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_path in sorted(root.rglob("*")):
+            if not file_path.is_file():
+                continue
+            arcname = f"{arc_prefix}{file_path.relative_to(root).as_posix()}"
+            info = zipfile.ZipInfo.from_file(file_path, arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(file_path, 'rb') as src, archive.open(info, mode="w") as dest:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # Central directory is written on close
+    data = buffer.drain()
+    if data:
+        yield data
@@ -1,19 +1,22 @@
 # run_all.py
-import json
-import math
+import heapq
+import itertools
 import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from crew_app.crew import build_crew
+from project_catalog import get_project_catalog
 
 PROJECTS_FILE = Path("../projects.json")
-BATCH_SIZE = 5         # run N projects at a time (tune based on API limits & your machine)
-MAX_WORKERS = 5        # same as batch, one worker per project
-RETRY = 1              # simple retry count if a run fails
+MAX_WORKERS = 5        # projects running at once (tune to CPU and throughput), in one pool kept busy for the whole run
+RETRY = 1              # retries per project after a failed run
+RETRY_BACKOFF = 2.0    # seconds before the first retry, doubled for every further one
+RETRY_BACKOFF_MAX = 60.0
+STATS_INTERVAL = 30.0  # seconds between throughput lines while nothing finishes
 
 def load_projects():
-    data = json.loads(PROJECTS_FILE.read_text(encoding="utf-8"))
+    data = get_project_catalog(PROJECTS_FILE).projects()
     assert isinstance(data, list) and len(data) > 0, "projects.json should be a non-empty list"
     return data
 
@@ -27,28 +30,118 @@ def process_one(brief, attempt=1):
         return {"name": name, "ok": True, "dir": result["deliverables_dir"]}
     except Exception as e:
         print(f"[EMOJI] Failed: {name}: {e}")
-        if attempt <= RETRY:
-            time.sleep(2)
-            return process_one(brief, attempt=attempt + 1)
         return {"name": name, "ok": False, "error": str(e)}
 
-def run_batches(projects):
-    total = len(projects)
-    batches = math.ceil(total / BATCH_SIZE)
-    all_results = []
+def retry_delay(attempt):
+    """Backoff before running ``attempt`` (2, 3, ...) again"""
+    return min(RETRY_BACKOFF * 2 ** (attempt - 2), RETRY_BACKOFF_MAX)
 
-    for i in range(batches):
-        start = i * BATCH_SIZE
-        end = min(start + BATCH_SIZE, total)
-        batch = projects[start:end]
-        print(f"\n=== Batch {i+1}/{batches} | Projects {start+1}–{end} of {total} ===")
+class WorkQueue:
+    """Runs projects on one bounded pool, fed from a priority queue.
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-            futures = [pool.submit(process_one, brief) for brief in batch]
-            for f in as_completed(futures):
-                all_results.append(f.result())
+    Lower ``priority`` (a project's optional "priority" field, else its
+    position in projects.json) starts first. A failed run is put back on the
+    queue with exponential backoff and keeps its priority, so the worker it
+    held picks up the next project instead of sleeping. ``max_workers`` only
+    sizes the pool for CPU and throughput: calls to each LLM provider and to
+    Tavily are capped separately (``<PROVIDER>_MAX_CONCURRENT``, see
+    crew_app/rate_limiter.py), so extra workers queue on a busy provider.
+    """
 
-    return all_results
+    def __init__(self, max_workers=MAX_WORKERS):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self.ready = []     # (priority, seq, attempt, brief)
+        self.delayed = []   # (due_at, seq, priority, attempt, brief)
+        self.running = {}   # future -> (priority, attempt, brief, started_at)
+        self.seq = itertools.count()
+        self.results = []
+        self.retries = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+
+    def push(self, brief, priority, attempt=1, delay=0.0):
+        if delay > 0:
+            heapq.heappush(self.delayed, (time.monotonic() + delay, next(self.seq), priority, attempt, brief))
+        else:
+            heapq.heappush(self.ready, (priority, next(self.seq), attempt, brief))
+
+    def _promote_due(self, now):
+        while self.delayed and self.delayed[0][0] <= now:
+            _, seq, priority, attempt, brief = heapq.heappop(self.delayed)
+            heapq.heappush(self.ready, (priority, seq, attempt, brief))
+
+    def _start(self, pool):
+        while self.ready and len(self.running) < self.max_workers:
+            priority, _, attempt, brief = heapq.heappop(self.ready)
+            future = pool.submit(process_one, brief, attempt)
+            self.running[future] = (priority, attempt, brief, time.monotonic())
+
+    def _finish(self, future):
+        priority, attempt, brief, started = self.running.pop(future)
+        self.busy_seconds += time.monotonic() - started
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"name": brief.get("project_name", "unnamed"), "ok": False, "error": str(e)}
+        if not result["ok"] and attempt <= RETRY:
+            delay = retry_delay(attempt + 1)
+            print(f"[RETRY] {result['name']}: attempt {attempt + 1} in {delay:.0f}s")
+            self.retries += 1
+            self.push(brief, priority, attempt + 1, delay)
+        else:
+            self.results.append(result)
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        busy = self.busy_seconds + sum(time.monotonic() - started for *_, started in self.running.values())
+        return {
+            "done": len(self.results),
+            "inFlight": len(self.running),
+            "queued": len(self.ready) + len(self.delayed),
+            "retries": self.retries,
+            "projectsPerHour": len(self.results) / elapsed * 3600 if elapsed else 0.0,
+            "utilization": busy / (elapsed * self.max_workers) if elapsed else 0.0,
+        }
+
+    def report(self):
+        s = self.stats()
+        print(
+            f"[METRICS] {s['done']} done, {s['inFlight']} in flight, {s['queued']} queued, {s['retries']} retries | "
+            f"{s['projectsPerHour']:.1f} projects/hour, worker utilization {s['utilization']:.0%}"
+        )
+
+    def run(self):
+        self.started_at = time.monotonic()
+        last_report = self.started_at
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while self.ready or self.delayed or self.running:
+                now = time.monotonic()
+                self._promote_due(now)
+                self._start(pool)
+                # Wake up for the next finished project, due retry or stats line
+                timeout = STATS_INTERVAL - (now - last_report)
+                if self.delayed:
+                    timeout = min(timeout, self.delayed[0][0] - now)
+                if self.running:
+                    done, _ = wait(list(self.running), timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+                else:
+                    done = set()
+                    time.sleep(max(timeout, 0))
+                for future in done:
+                    self._finish(future)
+                if done or time.monotonic() - last_report >= STATS_INTERVAL:
+                    self.report()
+                    last_report = time.monotonic()
+        return self.results
+
+def run_queue(projects):
+    queue = WorkQueue()
+    for index, brief in enumerate(projects):
+        queue.push(brief, brief.get("priority", index))
+    print(f"\n=== {len(projects)} projects | {queue.max_workers} workers ===")
+    return queue.run()
 
 def summarize(results):
     success = [r for r in results if r["ok"]]
@@ -64,6 +157,5 @@ def summarize(results):
 
 if __name__ == "__main__":
     projects = load_projects()
-    results = run_batches(projects)
+    results = run_queue(projects)
     summarize(results)
-
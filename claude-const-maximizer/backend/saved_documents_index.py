@@ -0,0 +1,176 @@
+"""
+Saved Documents Index
+SQLite metadata index over saved_documents/*.json for paged listing and per-project lookup
+"""
+
+import base64
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from crew_app.sqlite_utils import ThreadLocalConnections
+
+DEFAULT_DOCUMENTS_DIR = Path("saved_documents")
+INDEX_FILENAME = "index.db"
+
+
+def _encode_cursor(saved_at: str, filename: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([saved_at, filename]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        saved_at, filename = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(saved_at), str(filename)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class SavedDocumentIndex:
+    """Metadata for every saved document, kept next to the documents themselves.
+
+    The JSON documents on disk stay the source of truth; the index only holds
+    what the list and lookup endpoints need and can be rebuilt from disk at
+    any time with ``rebuild()``.
+    """
+
+    def __init__(self, documents_dir: Path = DEFAULT_DOCUMENTS_DIR):
+        self.documents_dir = Path(documents_dir)
+        self.documents_dir.mkdir(exist_ok=True)
+        self.db_path = self.documents_dir / INDEX_FILENAME
+        self._db = ThreadLocalConnections(self.db_path)
+        created = not self.db_path.exists()
+        self._init_schema()
+
+        if created:
+            indexed = self.rebuild()
+            if indexed:
+                print(f"📦 Indexed {indexed} saved document(s) into {self.db_path}")
+
+    def _init_schema(self):
+        conn = self._db.connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS saved_documents ("
+            " filename TEXT PRIMARY KEY,"
+            " project_id TEXT NOT NULL,"
+            " project_name TEXT NOT NULL,"
+            " generated_at TEXT NOT NULL,"
+            " saved_at TEXT NOT NULL,"
+            " filepath TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_saved_documents_saved_at ON saved_documents (saved_at DESC, filename DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_saved_documents_project ON saved_documents (project_id, saved_at DESC)")
+
+    @staticmethod
+    def _row(filepath: Path, document: Dict[str, Any]) -> Tuple[str, str, str, str, str, str]:
+        return (
+            filepath.name,
+            document.get("projectId", "unknown"),
+            document.get("projectName", "Unknown"),
+            document.get("generatedAt", ""),
+            document.get("savedAt", ""),
+            str(filepath)
+        )
+
+    @staticmethod
+    def _to_dict(row: Tuple[str, ...]) -> Dict[str, Any]:
+        filename, project_id, project_name, generated_at, saved_at, filepath = row
+        return {
+            "filename": filename,
+            "projectName": project_name,
+            "projectId": project_id,
+            "generatedAt": generated_at,
+            "savedAt": saved_at,
+            "filepath": filepath
+        }
+
+    def record(self, filepath: Path, document: Dict[str, Any]):
+        """Index (or re-index) a document that has just been written"""
+        self._db.connect().execute(
+            "INSERT INTO saved_documents (filename, project_id, project_name, generated_at, saved_at, filepath)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(filename) DO UPDATE SET project_id = excluded.project_id,"
+            " project_name = excluded.project_name, generated_at = excluded.generated_at,"
+            " saved_at = excluded.saved_at, filepath = excluded.filepath",
+            self._row(Path(filepath), document)
+        )
+
+    def list(self, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """One page of documents, newest first; pass nextCursor back to continue"""
+        columns = "filename, project_id, project_name, generated_at, saved_at, filepath"
+        if cursor:
+            saved_at, filename = _decode_cursor(cursor)
+            rows = self._db.connect().execute(
+                f"SELECT {columns} FROM saved_documents"
+                " WHERE (saved_at, filename) < (?, ?)"
+                " ORDER BY saved_at DESC, filename DESC LIMIT ?",
+                (saved_at, filename, limit + 1)
+            ).fetchall()
+        else:
+            rows = self._db.connect().execute(
+                f"SELECT {columns} FROM saved_documents ORDER BY saved_at DESC, filename DESC LIMIT ?",
+                (limit + 1,)
+            ).fetchall()
+
+        documents = [self._to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = documents[-1]
+            next_cursor = _encode_cursor(last["savedAt"], last["filename"])
+        return {"documents": documents, "nextCursor": next_cursor}
+
+    def find(self, project_id: str) -> Optional[Path]:
+        """Path of the most recently saved document for a project"""
+        row = self._db.connect().execute(
+            "SELECT filepath FROM saved_documents WHERE project_id = ? ORDER BY saved_at DESC LIMIT 1",
+            (project_id,)
+        ).fetchone()
+        return Path(row[0]) if row else None
+
+    def remove(self, filepath: Path):
+        self._db.connect().execute("DELETE FROM saved_documents WHERE filename = ?", (Path(filepath).name,))
+
+    def rebuild(self) -> int:
+        """Recreate the index from the JSON documents on disk"""
+        rows = []
+        for filepath in self.documents_dir.glob("*.json"):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    rows.append(self._row(filepath, json.load(f)))
+            except Exception as e:
+                print(f"⚠️ Error reading document {filepath}: {e}")
+
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM saved_documents")
+            conn.executemany(
+                "INSERT INTO saved_documents (filename, project_id, project_name, generated_at, saved_at, filepath)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+
+def main():
+    """Command line entry point for rebuilding the saved documents index"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Saved documents index maintenance')
+    parser.add_argument('--dir', default=str(DEFAULT_DOCUMENTS_DIR), help='Saved documents directory')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from the JSON documents on disk')
+
+    args = parser.parse_args()
+    index = SavedDocumentIndex(Path(args.dir))
+
+    if args.rebuild:
+        indexed = index.rebuild()
+        print(f"[OK] Indexed {indexed} document(s) from {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# scripts/benchmark_http_caching.py
+"""
+Benchmark bytes on the wire and p95 latency for the Pipeline Status API with and
+without ETag revalidation + compression.
+Run from the backend directory: python scripts/benchmark_http_caching.py [project_id]
+
+"before" requests send no Accept-Encoding / If-None-Match (full identity payload
+every time, like the dashboard's plain fetch polling); "after" requests accept
+br/gzip and revalidate with the ETag from the previous response.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from fastapi.testclient import TestClient
+
+from api_routes import app, status_store
+
+REQUESTS = 200
+
+
+def wire_bytes(response) -> int:
+    # httpx decodes the body; Content-Length is what actually crossed the wire
+    return int(response.headers.get("content-length", len(response.content)))
+
+
+def p95(samples):
+    return statistics.quantiles(samples, n=20)[-1] * 1000
+
+
+def bench(client: TestClient, url: str, revalidate: bool):
+    headers = {"Accept-Encoding": "br, gzip"} if revalidate else {"Accept-Encoding": "identity"}
+    latencies, total_bytes, etag = [], 0, None
+    for _ in range(REQUESTS):
+        if revalidate and etag:
+            headers["If-None-Match"] = etag
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        total_bytes += wire_bytes(response) if response.status_code == 200 else 0
+        etag = response.headers.get("etag", etag)
+    return total_bytes / REQUESTS, p95(latencies)
+
+
+def main():
+    project_id = sys.argv[1] if len(sys.argv) > 1 else next(iter(status_store.get_all()), "ai-powered-code-review-and-refactoring-assistant")
+    urls = ["/api/pipeline-status", f"/api/pipeline-complete/{project_id}"]
+
+    print(f"[METRICS] {REQUESTS} sequential GETs per endpoint")
+    print(f"{'endpoint':<60} {'bytes/req before':>17} {'after':>9} {'p95 ms before':>14} {'after':>8}")
+    with TestClient(app) as client:
+        for url in urls:
+            before_bytes, before_p95 = bench(client, url, revalidate=False)
+            after_bytes, after_p95 = bench(client, url, revalidate=True)
+            print(f"{url:<60} {before_bytes:>17.0f} {after_bytes:>9.0f} {before_p95:>14.2f} {after_p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
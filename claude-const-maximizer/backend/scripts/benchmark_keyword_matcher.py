@@ -0,0 +1,119 @@
+# scripts/benchmark_keyword_matcher.py
+"""
+Benchmark the compiled KeywordMatcher against the per-keyword "keyword in text.lower()"
+scans it replaced, over the stored deliverables and direct_results corpus.
+Run from the backend directory: python scripts/benchmark_keyword_matcher.py [rounds]
+
+Workloads mirror the call sites: whole documents (output validation), single
+lines (CrewAI cleanup) and project names (categorization). Every rule set is
+checked for identical hits before timing. "scan" finds all category/keyword
+hits (archetype scoring); "first" stops at the first category with a hit (the
+if/elif chains).
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+from project_catalog import get_project_catalog
+from scripts.project_tagger import ARCHETYPE_RULES
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CORPUS_DIRS = [BACKEND_DIR.parent / "deliverables", BACKEND_DIR / "direct_results"]
+TEXT_SUFFIXES = {".md", ".json", ".txt"}
+ROUNDS = 5
+
+# Rule sets from the call sites, imported lazily so one missing dependency doesn't hide the rest
+RULE_SETS = [
+    ("crew_app.expert_profiles", "CATEGORY_KEYWORDS"),
+    ("crew_app.crew", "DOCUMENT_QUALITY_KEYWORDS"),
+    ("crew_app.crew", "PROJECT_KIND_KEYWORDS"),
+]
+
+
+def load_corpus():
+    documents = []
+    for root in CORPUS_DIRS:
+        if root.exists():
+            for path in sorted(root.rglob("*")):
+                if path.is_file() and path.suffix in TEXT_SUFFIXES:
+                    documents.append(path.read_text(encoding="utf-8", errors="replace"))
+    return documents
+
+
+def load_workloads():
+    documents = load_corpus()
+    lines = [line.strip() for document in documents for line in document.splitlines() if line.strip()]
+    names = [project.get("name", "") for project in get_project_catalog().projects()]
+    return {"documents": documents, "lines": lines, "project names": names}
+
+
+def load_rule_sets():
+    rule_sets = {"ARCHETYPE_RULES": ARCHETYPE_RULES}
+    for module_name, attribute in RULE_SETS:
+        try:
+            module = __import__(module_name, fromlist=[attribute])
+            rule_sets[attribute] = getattr(module, attribute)
+        except Exception as e:
+            print(f"[WARN] Skipping {module_name}.{attribute}: {e}")
+    return rule_sets
+
+
+def naive_scan(rules, text):
+    hits = {}
+    for category, keywords in rules.items():
+        matched = {keyword.lower() for keyword in keywords if keyword.lower() in text.lower()}
+        if matched:
+            hits[category] = matched
+    return hits
+
+
+def naive_first(rules, text):
+    for category, keywords in rules.items():
+        if any(keyword.lower() in text.lower() for keyword in keywords):
+            return category
+    return None
+
+
+def timed(func, texts, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS
+    workloads = load_workloads()
+    rule_sets = load_rule_sets()
+    documents = workloads["documents"]
+    total_bytes = sum(len(document) for document in documents)
+    engine = "aho-corasick" if keyword_matcher.ahocorasick is not None else "trie regex"
+    print(f"[METRICS] {len(documents)} documents, {total_bytes / 1024:.0f} KiB, {engine}, median of {rounds} rounds")
+    print(f"{'rule set':<28} {'workload':<14} {'mode':<6} {'naive ms':>9} {'matcher ms':>11} {'speedup':>8}")
+
+    for name, rules in rule_sets.items():
+        matcher = KeywordMatcher(rules)
+        for texts in workloads.values():
+            for text in texts:
+                assert matcher.scan(text) == naive_scan(rules, text), f"{name}: scan mismatch"
+                assert matcher.first(text) == naive_first(rules, text), f"{name}: first mismatch"
+
+        for workload, texts in workloads.items():
+            for mode, naive, compiled in (
+                ("scan", lambda text: naive_scan(rules, text), matcher.scan),
+                ("first", lambda text: naive_first(rules, text), matcher.first),
+            ):
+                naive_ms = timed(naive, texts, rounds)
+                matcher_ms = timed(compiled, texts, rounds)
+                print(f"{name:<28} {workload:<14} {mode:<6} {naive_ms:>9.1f} {matcher_ms:>11.1f} {naive_ms / matcher_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
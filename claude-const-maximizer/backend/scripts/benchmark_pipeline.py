@@ -0,0 +1,181 @@
+# scripts/benchmark_pipeline.py
+"""
+Benchmark the Phase 3 pipeline end to end, offline, by replaying a cassette of
+recorded Tavily and LLM calls (see crew_app/cassettes.py).
+Run from the backend directory: python scripts/benchmark_pipeline.py [--projects N] [--record] [--compare BASELINE.json]
+
+--record runs the first N projects against the live providers once and saves
+every search and LLM answer to the cassette; without it nothing leaves the
+machine and a request missing from the cassette fails the run (exit code 1,
+before --json or --compare). For every
+project steps 1-4 (research, brief, template, code) are timed separately:
+wall time, CPU time of the process and, with --memory, peak traced memory.
+Response/search caches are off and every code section is regenerated, so each
+run does the same work. Step 5 calls live APIs (key and package checks) and
+is only timed with --validation.
+
+--json writes the results; --compare fails (exit code 1) when a stage's median
+wall time regressed more than --threshold over a previous --json file.
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from crew_app.cassettes import DEFAULT_CASSETTE_DIR, Cassette, use_cassette
+from crew_app.llm_cache import get_llm_cache
+from crew_app.search_cache import get_search_cache
+
+STAGES = [
+    ("research", "step1_market_research"),
+    ("brief", "step2_create_project_brief"),
+    ("template", "step3_select_prompt_template"),
+    ("code", "step4_generate_code"),
+]
+VALIDATION_STAGE = ("validation", "step5_validate_and_verify")
+
+
+async def run_stage(step, spec):
+    result = step(spec)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def run_project(orchestrator, project, stages, memory):
+    """Timings of every stage of one project: {stage: {"wall": s, "cpu": s, "peakMB": MB}}"""
+    spec = orchestrator.get_project_specification(project)
+    timings = {}
+    for stage, method in stages:
+        if memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec = await run_stage(getattr(orchestrator, method), spec)
+        timings[stage] = {
+            "wall": time.perf_counter() - wall,
+            "cpu": time.process_time() - cpu,
+            "peakMB": tracemalloc.get_traced_memory()[1] / (1024 * 1024) if memory else None,
+        }
+    return timings
+
+
+def summarize(runs, stages):
+    """Median and total of every stage over all projects"""
+    summary = {}
+    for stage, _ in stages + [("total", None)]:
+        if stage == "total":
+            samples = [{metric: sum(run[s][metric] or 0 for s, _ in stages) for metric in ("wall", "cpu")} for run in runs]
+        else:
+            samples = [run[stage] for run in runs]
+        peaks = [sample.get("peakMB") for sample in samples if sample.get("peakMB") is not None]
+        summary[stage] = {
+            "wallMedian": statistics.median(sample["wall"] for sample in samples),
+            "wallTotal": sum(sample["wall"] for sample in samples),
+            "cpuMedian": statistics.median(sample["cpu"] for sample in samples),
+            "peakMB": max(peaks) if peaks else None,
+        }
+    return summary
+
+
+def compare(summary, baseline_path, threshold):
+    """Stages whose median wall time grew more than ``threshold`` over the baseline"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["stages"]
+    regressions = []
+    print(f"\n{'stage':<12} {'baseline s':>11} {'now s':>9} {'change':>8}")
+    for stage, now in summary.items():
+        before = baseline.get(stage)
+        if not before or not before["wallMedian"]:
+            continue
+        change = now["wallMedian"] / before["wallMedian"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{stage:<12} {before['wallMedian']:>11.3f} {now['wallMedian']:>9.3f} {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(stage)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Phase 3 pipeline benchmark over a recorded cassette")
+    parser.add_argument("--projects", type=int, default=3, help="Number of projects (the first N of projects.json)")
+    parser.add_argument("--cassette", default=str(DEFAULT_CASSETTE_DIR), help="Cassette directory")
+    parser.add_argument("--record", action="store_true", help="Call the live providers and record the cassette")
+    parser.add_argument("--latency", default="recorded", help="Replayed latency per call: 'recorded' or seconds (0 for CPU only)")
+    parser.add_argument("--memory", action="store_true", help="Trace peak memory per stage (slows every stage down)")
+    parser.add_argument("--validation", action="store_true", help="Also time step 5 (makes live API calls)")
+    parser.add_argument("--json", metavar="PATH", help="Write per-project timings and the stage summary as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="A previous --json file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed median wall time growth per stage (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    latency = None if args.latency == "recorded" else float(args.latency)
+    cassette = use_cassette(Cassette(Path(args.cassette), mode="record" if args.record else "replay", latency=latency))
+    get_llm_cache().set_mode("off")
+    get_search_cache().set_mode("off")
+
+    from phase3_research_prompt_code import Phase3Orchestrator
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = Phase3Orchestrator(force_regenerate=True)
+    stages = STAGES + ([VALIDATION_STAGE] if args.validation else [])
+    projects = orchestrator.projects[:args.projects]
+
+    if args.memory:
+        tracemalloc.start()
+    runs = []
+    with tempfile.TemporaryDirectory() as deliverables_dir:
+        orchestrator.deliverables_dir = Path(deliverables_dir)
+        print(f"[METRICS] {len(projects)} project(s), {'recording' if args.record else 'replaying'} {cassette.root}, latency {args.latency}")
+        print(f"{'project':<40} " + " ".join(f"{stage:>10}" for stage, _ in stages) + f" {'cpu s':>8} {'peak MB':>8}")
+        for project in projects:
+            timings = asyncio.run(run_project(orchestrator, project, stages, args.memory))
+            runs.append(timings)
+            peaks = [timing["peakMB"] for timing in timings.values() if timing["peakMB"] is not None]
+            print(
+                f"{project['project_name'][:40]:<40} "
+                + " ".join(f"{timings[stage]['wall']:>10.3f}" for stage, _ in stages)
+                + f" {sum(timing['cpu'] for timing in timings.values()):>8.3f} {(max(peaks) if peaks else 0):>8.1f}"
+            )
+    if args.memory:
+        tracemalloc.stop()
+
+    summary = summarize(runs, stages)
+    print(f"\n{'stage':<12} {'median s':>9} {'total s':>9} {'cpu med s':>10} {'peak MB':>8}")
+    for stage, stats in summary.items():
+        peak = f"{stats['peakMB']:>8.1f}" if stats["peakMB"] is not None else f"{'-':>8}"
+        print(f"{stage:<12} {stats['wallMedian']:>9.3f} {stats['wallTotal']:>9.3f} {stats['cpuMedian']:>10.3f} {peak}")
+    print(f"[METRICS] {cassette.summary()}")
+    if cassette.metrics["misses"] and cassette.replaying:
+        # The agents catch the miss and fall back, so the timings above measured the wrong work
+        print(f"[ERROR] {cassette.metrics['misses']} request(s) missing from the cassette; re-record it with --record")
+        sys.exit(1)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "projects": [project["project_name"] for project in projects],
+            "latency": args.latency,
+            "cpuCount": os.cpu_count(),
+            "runs": runs,
+            "stages": summary,
+        }, indent=2), encoding="utf-8")
+        print(f"[OK] Results written to {args.json}")
+
+    if args.compare:
+        regressions = compare(summary, args.compare, args.threshold)
+        if regressions:
+            print(f"[ERROR] Median wall time regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"[OK] No stage regressed more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# scripts/benchmark_provider_registry.py
+"""
+Benchmark startup time and per-project setup overhead of the Phase 3 agents and
+the CrewAI crew with and without the shared provider registry.
+Run from the backend directory: python scripts/benchmark_provider_registry.py [projects]
+
+"cold" resets the registry before every project, which is what the old code did
+(every agent and every build_crew() created its own clients); "warm" keeps the
+registry alive for the whole process, so only the first project pays for setup.
+No LLM calls are made - only client/tool construction is timed.
+"""
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from crew_app.agents.claude_coder import ClaudeCoder
+from crew_app.agents.market_researcher import MarketResearcher
+from crew_app.agents.prompt_engineer import PromptEngineer
+from crew_app.crew import build_crew
+from crew_app.providers import reset_provider_registry
+
+PROJECTS = 20
+
+
+def setup_project(project_index: int):
+    """Everything a single project run constructs before its first LLM call"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        MarketResearcher()
+        PromptEngineer()
+        ClaudeCoder()
+        build_crew(project_name=f"Benchmark Project {project_index}")
+
+
+def bench(projects: int, warm: bool):
+    reset_provider_registry()
+    timings = []
+    for index in range(projects):
+        if not warm:
+            reset_provider_registry()
+        start = time.perf_counter()
+        setup_project(index)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else PROJECTS
+
+    print(f"[METRICS] Agent + crew setup for {projects} projects in one process")
+    print(f"{'mode':<6} {'startup ms':>11} {'per-project median ms':>22} {'per-project p95 ms':>19} {'total s':>8}")
+    for mode, warm in (("cold", False), ("warm", True)):
+        timings = bench(projects, warm)
+        per_project = timings[1:] or timings
+        p95 = statistics.quantiles(per_project, n=20)[-1] if len(per_project) > 1 else per_project[0]
+        print(
+            f"{mode:<6} {timings[0] * 1000:>11.1f} {statistics.median(per_project) * 1000:>22.2f} "
+            f"{p95 * 1000:>19.2f} {sum(timings):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
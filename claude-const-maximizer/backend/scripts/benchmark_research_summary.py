@@ -0,0 +1,138 @@
+# scripts/benchmark_research_summary.py
+"""
+Benchmark the relevance-ranked, token-budgeted research summary against the old
+arrival-order summary (first 5 results per category, 300 characters each) over
+the research_data saved in deliverables/*/market_research.json.
+Run from the backend directory: python scripts/benchmark_research_summary.py [--llm ROUNDS] [--budget TOKENS]
+
+Without --llm only the summaries are compared: prompt tokens, sources included
+and the share of the total BM25 relevance they carry. With --llm each project's
+deep-analysis prompt is sent ROUNDS times per variant through the Market
+Researcher's primary LLM (response cache off) and the latencies are compared.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from crew_app.llm_metrics import estimate_tokens
+from crew_app.research_ranking import DEFAULT_CATEGORY_TOKENS, pack_research_summary, rank_results
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DELIVERABLES_DIR = BACKEND_DIR.parent / "deliverables"
+
+# MarketResearcher.research_categories keywords, so ranking runs without constructing the agent
+CATEGORY_KEYWORDS = {
+    "market_analysis": ["market size", "market trends", "market growth", "market opportunity"],
+    "competitive_analysis": ["competitors", "competitive landscape", "market leaders", "market positioning"],
+    "target_audience": ["target audience", "user personas", "demographics", "pain points"],
+    "technology_trends": ["technology trends", "AI trends", "tech stack", "emerging technologies"],
+    "business_model": ["business model", "revenue model", "pricing strategy", "go-to-market"],
+    "regulatory_compliance": ["regulations", "compliance", "data privacy", "security requirements"],
+}
+
+
+def load_projects():
+    projects = []
+    for path in sorted(DELIVERABLES_DIR.glob("*/market_research.json")):
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        if report.get("research_data"):
+            projects.append(report)
+    return projects
+
+
+def old_summary(research_data):
+    """The summary _create_comprehensive_summary built before ranking (non-debug mode)"""
+    by_category = {}
+    for result in research_data:
+        by_category.setdefault(result.get("research_category", "general"), []).append(result)
+    parts, included = [], []
+    for category, results in by_category.items():
+        parts.append(f"\n## {category.upper().replace('_', ' ')} RESEARCH")
+        for i, result in enumerate(results[:5], 1):
+            parts.append(f"\n### Source {i}: {result.get('title', 'No title')}")
+            parts.append(f"**URL:** {result.get('url', 'No URL')}")
+            parts.append(f"**Content:** {result.get('content', 'No content')[:300]}...")
+            included.append(result)
+    return "\n".join(parts), included
+
+
+def new_summary(research_data, budget):
+    summary, _ = pack_research_summary(research_data, budget)
+    included = [result for result in research_data if f"**URL:** {result.get('url', 'No URL')}" in summary]
+    return summary, included
+
+
+def relevance_share(included, ranked):
+    total = sum(result["relevance"] for result in ranked)
+    return sum(result["relevance"] for result in included) / total if total else 1.0
+
+
+async def time_analysis(researcher, report, summary, rounds):
+    researcher._create_comprehensive_summary = lambda research_data: summary
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await researcher._perform_deep_analysis(
+                report["project_name"], report.get("description", ""), report.get("tech_stack", ""), report["research_data"]
+            )
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research summary: arrival order vs BM25-ranked token budget")
+    parser.add_argument("--llm", type=int, default=0, metavar="ROUNDS", help="Also time the deep-analysis LLM call ROUNDS times per variant")
+    parser.add_argument("--budget", type=int, default=DEFAULT_CATEGORY_TOKENS, help="Summary tokens per research category")
+    args = parser.parse_args()
+
+    projects = load_projects()
+    if not projects:
+        print(f"[WARN] No market_research.json with research_data under {DELIVERABLES_DIR}")
+        return
+
+    researcher = None
+    if args.llm:
+        from crew_app.agents.market_researcher import MarketResearcher
+        with contextlib.redirect_stdout(io.StringIO()):
+            researcher = MarketResearcher()
+        researcher.llm_cache.set_mode("off")
+
+    print(f"[METRICS] {len(projects)} projects, budget {args.budget} tokens per category")
+    header = f"{'project':<40} {'old tok':>8} {'new tok':>8} {'old src':>8} {'new src':>8} {'old rel':>8} {'new rel':>8}"
+    if researcher:
+        header += f" {'old s':>7} {'new s':>7}"
+    print(header)
+    totals = {"old": 0, "new": 0}
+    for report in projects:
+        research_data = [dict(result) for result in report["research_data"]]
+        ranked = rank_results(research_data, report["project_name"], report.get("description", ""), CATEGORY_KEYWORDS)
+        old_text, old_included = old_summary(report["research_data"])
+        new_text, new_included = new_summary(ranked, args.budget)
+        old_relevance = relevance_share([r for r in ranked if any(r["url"] == o.get("url") for o in old_included)], ranked)
+        line = (
+            f"{report['project_name'][:40]:<40} {estimate_tokens(old_text):>8} {estimate_tokens(new_text):>8} "
+            f"{len(old_included):>8} {len(new_included):>8} {old_relevance:>7.0%} {relevance_share(new_included, ranked):>7.0%}"
+        )
+        totals["old"] += estimate_tokens(old_text)
+        totals["new"] += estimate_tokens(new_text)
+        if researcher:
+            old_seconds = asyncio.run(time_analysis(researcher, report, old_text, args.llm))
+            new_seconds = asyncio.run(time_analysis(researcher, report, new_text, args.llm))
+            line += f" {old_seconds:>7.2f} {new_seconds:>7.2f}"
+        print(line)
+    print(f"[METRICS] Summary tokens: {totals['old']} -> {totals['new']} ({1 - totals['new'] / max(totals['old'], 1):.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# scripts/benchmark_status_store.py
+"""
+Benchmark pipeline status updates: legacy whole-file JSON rewrite vs SQLite-WAL store.
+Run from the backend directory: python scripts/benchmark_status_store.py
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from pipeline_status_store import SQLitePipelineStatusStore
+
+PROJECT_COUNTS = [60, 1000]
+UPDATES = 500
+
+
+def make_record(project_id: str, progress: int) -> dict:
+    return {
+        "projectId": project_id,
+        "projectName": project_id.replace("-", " ").title(),
+        "progress": progress,
+        "activeAgents": ["Market Research Analyst"],
+        "currentTask": "Market Research",
+        "status": "running",
+        "error": None,
+        "result": "x" * 4000,  # completed projects carry their full result text
+    }
+
+
+def bench_legacy_json(workdir: Path, project_count: int) -> float:
+    """Replicates the old load_pipeline_status()/save_pipeline_status() cycle"""
+    path = workdir / "pipeline_status.json"
+    status = {f"project-{i}": make_record(f"project-{i}", 0) for i in range(project_count)}
+    path.write_text(json.dumps(status, indent=2), encoding="utf-8")
+
+    start = time.perf_counter()
+    for n in range(UPDATES):
+        with open(path, 'r') as f:
+            status = json.load(f)
+        project_id = f"project-{n % project_count}"
+        status[project_id] = make_record(project_id, n % 100)
+        with open(path, 'w') as f:
+            json.dump(status, f, indent=2, default=str)
+    return UPDATES / (time.perf_counter() - start)
+
+
+def bench_sqlite(workdir: Path, project_count: int) -> float:
+    store = SQLitePipelineStatusStore(workdir / "pipeline_status.db", legacy_json_path=None)
+    for i in range(project_count):
+        store.upsert(f"project-{i}", make_record(f"project-{i}", 0))
+
+    start = time.perf_counter()
+    for n in range(UPDATES):
+        store.update(f"project-{n % project_count}", progress=n % 100, currentTask="Backend Design")
+    return UPDATES / (time.perf_counter() - start)
+
+
+def main():
+    print(f"[METRICS] {UPDATES} single-project updates per run")
+    print(f"{'projects':>10} {'json rewrite/s':>16} {'sqlite-wal/s':>14} {'speedup':>9}")
+    for project_count in PROJECT_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = bench_legacy_json(Path(tmp), project_count)
+        with tempfile.TemporaryDirectory() as tmp:
+            sqlite = bench_sqlite(Path(tmp), project_count)
+        print(f"{project_count:>10} {legacy:>16.1f} {sqlite:>14.1f} {sqlite / legacy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 # scripts/project_tagger.py
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from keyword_matcher import KeywordMatcher
+from project_catalog import get_project_catalog
+
 # Archetype mapping rules
 ARCHETYPE_RULES = {
     "rag_kb": [
@@ -63,6 +68,8 @@ ARCHETYPE_RULES = {
     ]
 }
 
+ARCHETYPE_MATCHER = KeywordMatcher(ARCHETYPE_RULES)
+
 def load_archetypes() -> Dict:
     """Load archetype configurations."""
     archetypes_file = Path("../archetypes.json")
@@ -78,22 +85,15 @@ def load_projects() -> List[Dict]:
     if not projects_file.exists():
         raise FileNotFoundError("projects.json not found!")
     
-    with open(projects_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_project_catalog(projects_file).projects()
 
 def determine_archetype(project_name: str, app_type: str, core_features: List[str]) -> str:
     """Determine the best archetype for a project based on its description."""
     # Combine all text for matching
-    text = f"{project_name} {app_type} {' '.join(core_features)}".lower()
+    text = f"{project_name} {app_type} {' '.join(core_features)}"
     
-    # Score each archetype
-    scores = {}
-    for archetype, keywords in ARCHETYPE_RULES.items():
-        score = 0
-        for keyword in keywords:
-            if keyword.lower() in text:
-                score += 1
-        scores[archetype] = score
+    # Score each archetype by the number of its keywords found
+    scores = ARCHETYPE_MATCHER.scores(text)
     
     # Find the best match
     best_archetype = max(scores.items(), key=lambda x: x[1])
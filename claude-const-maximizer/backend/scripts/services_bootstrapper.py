@@ -2,11 +2,15 @@
 import json
 import os
 import argparse
+import sys
 import requests
 from pathlib import Path
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from project_catalog import get_project_catalog
+
 class VercelBootstrapper:
     def __init__(self, token: str, team_id: Optional[str] = None):
         self.token = token
@@ -134,8 +138,7 @@ def load_projects() -> List[Dict]:
     if not projects_file.exists():
         raise FileNotFoundError("projects.json not found!")
     
-    with open(projects_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_project_catalog(projects_file).projects()
 
 def load_envs() -> Dict:
     """Load environment variables from envs.json."""
@@ -0,0 +1,145 @@
+"""
+Pipeline Status Events
+Fans out per-project status deltas from the status store to SSE / WebSocket subscribers
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pipeline_status_store import PipelineStatusStore
+
+
+class StatusEventHub:
+    """Tails the store's event log once per process and wakes every subscriber.
+
+    Pipeline workers run in other processes, so the event log in the store is
+    the source of truth; the hub keeps a small in-memory buffer of recent
+    events so that any number of open dashboards cost a single poll query.
+    Subscribers that fall behind the buffer (or resume from an old event id)
+    are served straight from the store, or sent a fresh snapshot once the
+    events they missed were trimmed from it.
+    """
+
+    def __init__(self, store: PipelineStatusStore, poll_interval: float = 0.25, buffer_size: int = 1000, snapshot_interval: float = 2.0):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.snapshot_interval = snapshot_interval
+        self._recent: deque = deque(maxlen=buffer_size)
+        self._cursor: Optional[int] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._cursor = self.store.latest_event_id()
+            self._changed = asyncio.Condition()
+            self._task = asyncio.create_task(self._tail())
+
+    async def _tail(self):
+        loop = asyncio.get_running_loop()
+        batch_size = 500
+        while True:
+            try:
+                events = await loop.run_in_executor(None, self.store.events_since, self._cursor, batch_size)
+            except Exception as e:
+                print(f"[WARN] Status event poll failed: {e}")
+                events = []
+            if events:
+                async with self._changed:
+                    self._recent.extend(events)
+                    self._cursor = events[-1]["id"]
+                    self._changed.notify_all()
+            if len(events) < batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def _buffered_since(self, cursor: int) -> Optional[List[Dict[str, Any]]]:
+        """Events after cursor from the buffer; None if the buffer does not reach back that far"""
+        if cursor >= self._cursor:
+            return []
+        if self._recent and cursor >= self._recent[0]["id"] - 1:
+            return [event for event in self._recent if event["id"] > cursor]
+        return None
+
+    def _resumable(self, cursor: int) -> bool:
+        """Whether every event after cursor is still in the store's log (it is trimmed at EVENT_RETENTION)"""
+        if cursor > self.store.latest_event_id():
+            return False  # the log was reset, e.g. a new database
+        oldest = self.store.oldest_event_id()
+        return oldest == 0 or cursor >= oldest - 1
+
+    def _snapshot_event(self) -> Dict[str, Any]:
+        snapshot = self.snapshot()
+        return {"id": snapshot["id"], "type": "snapshot", "projects": snapshot["projects"]}
+
+    async def stream(self, last_event_id: Optional[int], heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield events after last_event_id forever; yields None as a keep-alive when idle.
+
+        A ``snapshot`` event comes first when there is no last_event_id or the
+        events after it were already trimmed, and again whenever a slow
+        subscriber falls behind the retained log. Stores without an event log
+        get a snapshot every time the status changes instead.
+        """
+        loop = asyncio.get_running_loop()
+        if not self.store.supports_events:
+            async for event in self._poll_snapshots(heartbeat):
+                yield event
+            return
+
+        self._ensure_started()
+        cursor = last_event_id
+        if cursor is None or not await loop.run_in_executor(None, self._resumable, cursor):
+            event = await loop.run_in_executor(None, self._snapshot_event)
+            cursor = event["id"]
+            yield event
+
+        while True:
+            async with self._changed:
+                events = self._buffered_since(cursor)
+                if events == []:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                    events = self._buffered_since(cursor)
+
+            if events is None:
+                if not await loop.run_in_executor(None, self._resumable, cursor):
+                    event = await loop.run_in_executor(None, self._snapshot_event)
+                    cursor = event["id"]
+                    yield event
+                    continue
+                events = await loop.run_in_executor(None, self.store.events_since, cursor, 500)
+
+            if not events:
+                yield None
+                continue
+
+            for event in events:
+                cursor = event["id"]
+                yield event
+
+    async def _poll_snapshots(self, heartbeat: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Snapshot whenever the status changed, checked every snapshot_interval (for stores without events)"""
+        loop = asyncio.get_running_loop()
+        previous, idle = None, 0.0
+        while True:
+            projects = (await loop.run_in_executor(None, self.snapshot))["projects"]
+            if projects != previous:
+                previous, idle = projects, 0.0
+                yield {"id": None, "type": "snapshot", "projects": projects}
+            elif idle >= heartbeat:
+                idle = 0.0
+                yield None
+            await asyncio.sleep(self.snapshot_interval)
+            idle += self.snapshot_interval
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current status of every project (without large fields) plus the event id it reflects"""
+        # Read the event id first: replaying events after it may repeat a delta, never skip one
+        event_id = self.store.latest_event_id()
+        projects = {
+            project_id: PipelineStatusStore._delta({}, record)
+            for project_id, record in self.store.get_all().items()
+        }
+        return {"id": event_id, "projects": projects}